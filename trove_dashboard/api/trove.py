@@ -12,37 +12,201 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import hashlib
 import logging
+import threading
+import uuid
 
 from django.conf import settings
+from django.core.cache import cache
+from keystoneclient.auth import token_endpoint
+from keystoneclient import session
+import six
+from troveclient import exceptions as trove_exceptions
 from troveclient.v1 import client
 
 from openstack_auth import utils as auth_utils
 from openstack_dashboard.api import base
 
 from horizon.utils import functions as utils
-from horizon.utils.memoized import memoized  # noqa
 
 LOG = logging.getLogger(__name__)
 
+# Catalog data (flavors, datastores, datastore versions and volume types)
+# changes rarely, so it is kept in the Django cache across requests, scoped
+# per project and region, for this many seconds.
+CATALOG_CACHE_TIMEOUT = getattr(settings, 'TROVE_CATALOG_CACHE_TIMEOUT', 300)
 
-@memoized
-def troveclient(request):
+# Status polls of building instances and clusters are answered from a
+# short-lived snapshot of the first page of instance_list/cluster_list, so a
+# poll cycle over many table rows costs a single list call.
+ROW_SNAPSHOT_TIMEOUT = getattr(settings, 'TROVE_ROW_SNAPSHOT_TIMEOUT', 2)
+
+# A lightweight index of every instance of the project (id, name, status and
+# datastore) is built from a full instance_list crawl and kept this long.
+INSTANCE_INDEX_TIMEOUT = getattr(settings, 'TROVE_INSTANCE_INDEX_TIMEOUT', 30)
+
+# The same kind of index is kept for backups (id, name, status, instance and
+# datastore), built from a full backup_list crawl.
+BACKUP_INDEX_TIMEOUT = getattr(settings, 'TROVE_BACKUP_INDEX_TIMEOUT', 30)
+
+# Line counts of published log parts never change, so they are kept for
+# this long to answer line window reads without looking at every part.
+LOG_INDEX_TIMEOUT = getattr(settings, 'TROVE_LOG_INDEX_TIMEOUT', 3600)
+
+# Log parts that carry no line count are read in chunks of this many bytes
+# to count their lines.
+LOG_CHUNK_SIZE = getattr(settings, 'TROVE_LOG_CHUNK_SIZE', 65536)
+
+# The root-enabled status of an instance is shared by the table actions,
+# the overview tab and the Manage Root view for this many seconds.
+ROOT_STATUS_TIMEOUT = getattr(settings, 'TROVE_ROOT_STATUS_TIMEOUT', 10)
+
+# Whether a datastore version supports an optional guest operation (such as
+# listing user access) is remembered this long, so an unsupported operation
+# is not attempted again for every user or every page view.
+OPERATION_SUPPORT_TIMEOUT = getattr(settings,
+                                    'TROVE_OPERATION_SUPPORT_TIMEOUT', 3600)
+
+# Clients are shared across requests made with the same token so that their
+# HTTP session, and the keep-alive connections it holds, is reused. At most
+# this many clients are kept, the least recently used ones are dropped.
+CLIENT_POOL_SIZE = getattr(settings, 'TROVE_CLIENT_POOL_SIZE', 100)
+
+_client_pool = collections.OrderedDict()
+_client_pool_lock = threading.Lock()
+
+
+def _create_client(request, trove_url):
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
-    trove_url = base.url_for(request, 'database')
+    if insecure:
+        verify = False
+    else:
+        verify = cacert or True
+    auth = token_endpoint.Token(trove_url, request.user.token.id)
     c = client.Client(request.user.username,
                       request.user.token.id,
                       project_id=request.user.project_id,
                       auth_url=trove_url,
                       insecure=insecure,
                       cacert=cacert,
-                      http_log_debug=settings.DEBUG)
+                      http_log_debug=settings.DEBUG,
+                      session=session.Session(auth=auth, verify=verify))
     c.client.auth_token = request.user.token.id
     c.client.management_url = trove_url
     return c
 
 
+def troveclient(request):
+    """Returns the Trove client for the token and region of a request.
+
+    Clients come from an LRU pool keyed by token, endpoint and region. A
+    pooled client is used by several request threads, and by the workers
+    of content.utils.call_parallel, at once. This is safe because a client
+    is fully set up before it is put in the pool and is never changed
+    afterwards: every call only reads the token and endpoint, and the
+    requests connection pool underneath hands each thread a connection of
+    its own. Only the pool itself is guarded by a lock.
+    """
+    trove_url = base.url_for(request, 'database')
+    key = (request.user.token.id, trove_url,
+           getattr(request.user, 'services_region', None))
+    with _client_pool_lock:
+        c = _client_pool.pop(key, None)
+        if c is not None:
+            _client_pool[key] = c
+            return c
+
+    c = _create_client(request, trove_url)
+    with _client_pool_lock:
+        _client_pool[key] = c
+        while len(_client_pool) > CLIENT_POOL_SIZE:
+            _client_pool.popitem(last=False)
+    return c
+
+
+def _cache_scope(request):
+    scope = '%s:%s' % (request.user.project_id,
+                       getattr(request.user, 'services_region', None))
+    return hashlib.md5(scope.encode('utf-8')).hexdigest()
+
+
+def _catalog_generation_key(request):
+    return 'trove-catalog-generation:%s' % _cache_scope(request)
+
+
+def _catalog_cache_key(request, *args):
+    generation = cache.get(_catalog_generation_key(request), '0')
+    key = ':'.join(six.text_type(arg) for arg in args)
+    key_hash = hashlib.md5(key.encode('utf-8')).hexdigest()
+    return 'trove-catalog:%s:%s:%s' % (_cache_scope(request), generation,
+                                       key_hash)
+
+
+def _cached_catalog(request, manager, fetch, *key):
+    """Returns catalog resources from the cache, or fetches and caches them.
+
+    Only the raw resource data is cached; resources are rebuilt against the
+    manager of the current request on a cache hit.
+    """
+    cache_key = _catalog_cache_key(request, *key)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        if isinstance(cached, list):
+            return [manager.resource_class(manager, info, loaded=True)
+                    for info in cached]
+        return manager.resource_class(manager, cached, loaded=True)
+
+    result = fetch()
+    if isinstance(result, list):
+        cached = [resource._info for resource in result]
+    else:
+        cached = result._info
+    cache.set(cache_key, cached, CATALOG_CACHE_TIMEOUT)
+    return result
+
+
+def catalog_cache_invalidate(request):
+    """Drops all cached catalog data for the project and region."""
+    cache.set(_catalog_generation_key(request), uuid.uuid4().hex, None)
+
+
+def _operation_support_key(request, datastore, operation):
+    key = '%s:%s:%s' % (datastore.get('type'), datastore.get('version'),
+                        operation)
+    return 'trove-operation:%s:%s' % (
+        _cache_scope(request), hashlib.md5(key.encode('utf-8')).hexdigest())
+
+
+def operation_support_get(request, datastore, operation):
+    """Returns whether a datastore version is known to support an operation.
+
+    The support is kept per project and region, as each region may run a
+    different Trove deployment. Returns None when the support of the
+    operation is not known yet.
+    """
+    return cache.get(_operation_support_key(request, datastore, operation))
+
+
+def operation_support_set(request, datastore, operation, supported):
+    cache.set(_operation_support_key(request, datastore, operation),
+              supported, OPERATION_SUPPORT_TIMEOUT)
+
+
+def _snapshot_get(request, name, manager, fetch, resource_id):
+    key = 'trove-snapshot:%s:%s' % (name, _cache_scope(request))
+    infos = cache.get(key)
+    if infos is None:
+        infos = dict((resource.id, resource._info) for resource in fetch())
+        cache.set(key, infos, ROW_SNAPSHOT_TIMEOUT)
+    info = infos.get(resource_id)
+    if info is None:
+        return None
+    return manager.resource_class(manager, info, loaded=True)
+
+
 def cluster_list(request, marker=None):
     page_size = utils.get_page_size(request)
     return troveclient(request).clusters.list(limit=page_size, marker=marker)
@@ -52,6 +216,20 @@ def cluster_get(request, cluster_id):
     return troveclient(request).clusters.get(cluster_id)
 
 
+def cluster_get_polled(request, cluster_id):
+    """Returns a cluster for a row status poll.
+
+    The cluster comes from a short-lived snapshot of cluster_list when it
+    is on it, otherwise it is fetched with cluster_get.
+    """
+    manager = troveclient(request).clusters
+    cluster = _snapshot_get(request, 'clusters', manager,
+                            lambda: cluster_list(request), cluster_id)
+    if cluster is None:
+        cluster = cluster_get(request, cluster_id)
+    return cluster
+
+
 def cluster_delete(request, cluster_id):
     return troveclient(request).clusters.delete(cluster_id)
 
@@ -127,8 +305,96 @@ def instance_get(request, instance_id):
     return troveclient(request).instances.get(instance_id)
 
 
+def instance_get_polled(request, instance_id):
+    """Returns an instance for a row status poll.
+
+    The instance comes from a short-lived snapshot of instance_list when it
+    is on it, otherwise it is fetched with instance_get.
+    """
+    manager = troveclient(request).instances
+    instance = _snapshot_get(request, 'instances', manager,
+                             lambda: instance_list(request), instance_id)
+    if instance is None:
+        instance = instance_get(request, instance_id)
+    return instance
+
+
 def instance_delete(request, instance_id):
-    return troveclient(request).instances.delete(instance_id)
+    result = troveclient(request).instances.delete(instance_id)
+    instance_index_invalidate(request)
+    return result
+
+
+class InstanceSummary(object):
+    def __init__(self, id, name, status, datastore, configuration=None):
+        self.id = id
+        self.name = name
+        self.status = status
+        self.datastore = datastore
+        self.configuration = configuration
+
+
+def _instance_index_key(request):
+    return 'trove-instance-index:%s' % _cache_scope(request)
+
+
+def instance_index(request):
+    """Returns an index of all instances of the project.
+
+    Maps each instance id to an InstanceSummary. The index is built from
+    every page of instance_list and cached across requests.
+    """
+    key = _instance_index_key(request)
+    summaries = cache.get(key)
+    if summaries is None:
+        summaries = []
+        marker = None
+        while True:
+            instances = instance_list(request, marker=marker)
+            for instance in instances:
+                configuration = getattr(instance, 'configuration', None)
+                summaries.append((instance.id,
+                                  instance.name,
+                                  instance.status,
+                                  getattr(instance, 'datastore', {}),
+                                  (configuration or {}).get('id')))
+            marker = instances.next
+            if not marker:
+                break
+        cache.set(key, summaries, INSTANCE_INDEX_TIMEOUT)
+    return collections.OrderedDict(
+        (summary[0], InstanceSummary(*summary)) for summary in summaries)
+
+
+def instance_index_invalidate(request):
+    cache.delete(_instance_index_key(request))
+
+
+def _instance_index_set_configuration(request, instance_id, configuration):
+    # Patch the cached index instead of dropping it, so that the next
+    # request does not have to crawl every instance again.
+    key = _instance_index_key(request)
+    summaries = cache.get(key)
+    if summaries is None:
+        return
+    for index, summary in enumerate(summaries):
+        if summary[0] == instance_id:
+            summaries[index] = tuple(summary[:4]) + (configuration,)
+            cache.set(key, summaries, INSTANCE_INDEX_TIMEOUT)
+            return
+
+
+def configuration_usage(request):
+    """Returns the ids of the instances using each configuration group.
+
+    The usage is taken from the instance index, so it costs no more than
+    one crawl of the instances for all the groups.
+    """
+    usage = collections.defaultdict(list)
+    for instance in instance_index(request).values():
+        if instance.configuration:
+            usage[instance.configuration].append(instance.id)
+    return usage
 
 
 def instance_create(request, name, volume, flavor, databases=None,
@@ -145,7 +411,7 @@ def instance_create(request, name, volume, flavor, databases=None,
             volume_params['type'] = volume_type
     else:
         volume_params = None
-    return troveclient(request).instances.create(
+    instance = troveclient(request).instances.create(
         name,
         flavor,
         volume=volume_params,
@@ -162,6 +428,8 @@ def instance_create(request, name, volume, flavor, databases=None,
         availability_zone=availability_zone,
         region_name=region_name
     )
+    instance_index_invalidate(request)
+    return instance
 
 
 def instance_resize_volume(request, instance_id, size):
@@ -200,8 +468,10 @@ def eject_replica_source(request, instance_id):
     return troveclient(request).instances.eject_replica_source(instance_id)
 
 
-def database_list(request, instance_id):
-    return troveclient(request).databases.list(instance_id)
+def database_list(request, instance_id, marker=None, paginate=False):
+    limit = utils.get_page_size(request) if paginate else None
+    return troveclient(request).databases.list(instance_id, limit=limit,
+                                               marker=marker)
 
 
 def database_create(request, instance_id, db_name, character_set=None,
@@ -218,26 +488,83 @@ def database_delete(request, instance_id, db_name):
     return troveclient(request).databases.delete(instance_id, db_name)
 
 
-def backup_list(request):
-    return troveclient(request).backups.list()
+def backup_list(request, marker=None, paginate=False, instance_id=None,
+                datastore=None):
+    limit = utils.get_page_size(request) if paginate else None
+    if instance_id:
+        return troveclient(request).instances.backups(instance_id,
+                                                      limit=limit,
+                                                      marker=marker)
+    return troveclient(request).backups.list(limit=limit, marker=marker,
+                                             datastore=datastore)
 
 
 def backup_get(request, backup_id):
     return troveclient(request).backups.get(backup_id)
 
 
+class BackupSummary(object):
+    def __init__(self, id, name, status, instance_id, datastore):
+        self.id = id
+        self.name = name
+        self.status = status
+        self.instance_id = instance_id
+        self.datastore = datastore
+
+
+def _backup_index_key(request):
+    return 'trove-backup-index:%s' % _cache_scope(request)
+
+
+def backup_index(request):
+    """Returns an index of all backups of the project.
+
+    Maps each backup id to a BackupSummary. The index is built from every
+    page of backup_list and cached across requests.
+    """
+    key = _backup_index_key(request)
+    summaries = cache.get(key)
+    if summaries is None:
+        summaries = []
+        marker = None
+        while True:
+            backups = backup_list(request, marker=marker, paginate=True)
+            for backup in backups:
+                summaries.append((backup.id,
+                                  backup.name,
+                                  backup.status,
+                                  backup.instance_id,
+                                  getattr(backup, 'datastore', {})))
+            marker = backups.next
+            if not marker:
+                break
+        cache.set(key, summaries, BACKUP_INDEX_TIMEOUT)
+    return collections.OrderedDict(
+        (summary[0], BackupSummary(*summary)) for summary in summaries)
+
+
+def backup_index_invalidate(request):
+    cache.delete(_backup_index_key(request))
+
+
 def backup_delete(request, backup_id):
-    return troveclient(request).backups.delete(backup_id)
+    try:
+        return troveclient(request).backups.delete(backup_id)
+    finally:
+        backup_index_invalidate(request)
 
 
 def backup_create(request, name, instance_id, description=None,
                   parent_id=None):
-    return troveclient(request).backups.create(name, instance_id,
-                                               description, parent_id)
+    backup = troveclient(request).backups.create(name, instance_id,
+                                                 description, parent_id)
+    backup_index_invalidate(request)
+    return backup
 
 
 def flavor_list(request):
-    flavors = troveclient(request).flavors.list()
+    manager = troveclient(request).flavors
+    flavors = _cached_catalog(request, manager, manager.list, 'flavor_list')
     for flavor in flavors:
         flavor.id = flavor.str_id
     return flavors
@@ -247,51 +574,83 @@ def datastore_flavors(request, datastore_name=None,
                       datastore_version=None):
     # if datastore info is available then get datastore specific flavors
     if datastore_name and datastore_version:
+        manager = troveclient(request).flavors
         try:
-            return troveclient(request).flavors.\
-                list_datastore_version_associated_flavors(datastore_name,
-                                                          datastore_version)
+            return _cached_catalog(
+                request, manager,
+                lambda: manager.list_datastore_version_associated_flavors(
+                    datastore_name, datastore_version),
+                'datastore_flavors', datastore_name, datastore_version)
         except Exception:
             LOG.warning("Failed to retrieve datastore specific flavors")
     return flavor_list(request)
 
 
 def flavor_get(request, flavor_id):
-    return troveclient(request).flavors.get(flavor_id)
+    manager = troveclient(request).flavors
+    return _cached_catalog(request, manager,
+                           lambda: manager.get(flavor_id),
+                           'flavor_get', flavor_id)
 
 
 def volume_type_list(request):
-    return troveclient(request).volume_types.list()
+    manager = troveclient(request).volume_types
+    return _cached_catalog(request, manager, manager.list,
+                           'volume_type_list')
 
 
 def datastore_volume_types(request, datastore_name=None,
                            datastore_version=None):
     # if datastore info is available then get datastore specific types
     if datastore_name and datastore_version:
+        manager = troveclient(request).volume_types
         try:
-            return troveclient(request).volume_types.\
-                list_datastore_version_associated_volume_types(
-                    datastore_name, datastore_version)
+            list_types = (manager.
+                          list_datastore_version_associated_volume_types)
+            return _cached_catalog(
+                request, manager,
+                lambda: list_types(datastore_name, datastore_version),
+                'datastore_volume_types', datastore_name, datastore_version)
         except Exception:
             LOG.warn("Failed to retrive datastore specific volume types")
     return volume_type_list(request)
 
 
+def _root_status_key(request, instance_id):
+    return 'trove-root-status:%s:%s' % (_cache_scope(request), instance_id)
+
+
 def root_enable(request, instance_ids):
-    username, password = troveclient(request).root.create(instance_ids[0])
+    try:
+        username, password = troveclient(request).root.create(
+            instance_ids[0])
+    finally:
+        cache.delete(_root_status_key(request, instance_ids[0]))
     return username, password
 
 
 def root_show(request, instance_id):
-    return troveclient(request).root.is_root_enabled(instance_id)
+    key = _root_status_key(request, instance_id)
+    manager = troveclient(request).root
+    info = cache.get(key)
+    if info is not None:
+        return manager.resource_class(manager, info, loaded=True)
+    root = manager.is_root_enabled(instance_id)
+    cache.set(key, root._info, ROOT_STATUS_TIMEOUT)
+    return root
 
 
 def root_disable(request, instance_id):
-    return troveclient(request).root.delete(instance_id)
+    try:
+        return troveclient(request).root.delete(instance_id)
+    finally:
+        cache.delete(_root_status_key(request, instance_id))
 
 
-def users_list(request, instance_id):
-    return troveclient(request).users.list(instance_id)
+def users_list(request, instance_id, marker=None, paginate=False):
+    limit = utils.get_page_size(request) if paginate else None
+    return troveclient(request).users.list(instance_id, limit=limit,
+                                           marker=marker)
 
 
 def user_create(request, instance_id, username, password,
@@ -341,24 +700,35 @@ def user_show_access(request, instance_id, username, host=None):
 
 
 def datastore_list(request):
-    return troveclient(request).datastores.list()
+    manager = troveclient(request).datastores
+    return _cached_catalog(request, manager, manager.list, 'datastore_list')
 
 
 def datastore_version_list(request, datastore):
-    return troveclient(request).datastore_versions.list(datastore)
+    manager = troveclient(request).datastore_versions
+    return _cached_catalog(request, manager,
+                           lambda: manager.list(datastore),
+                           'datastore_version_list', datastore)
 
 
 def datastore_get(request, datastore_id):
-    return troveclient(request).datastores.get(datastore_id)
+    manager = troveclient(request).datastores
+    return _cached_catalog(request, manager,
+                           lambda: manager.get(datastore_id),
+                           'datastore_get', datastore_id)
 
 
 def instance_attach_configuration(request, instance_id, configuration):
-    return troveclient(request).instances.modify(instance_id,
-                                                 configuration=configuration)
+    result = troveclient(request).instances.modify(
+        instance_id, configuration=configuration)
+    _instance_index_set_configuration(request, instance_id, configuration)
+    return result
 
 
 def instance_detach_configuration(request, instance_id):
-    return troveclient(request).instances.modify(instance_id)
+    result = troveclient(request).instances.modify(instance_id)
+    _instance_index_set_configuration(request, instance_id, None)
+    return result
 
 
 def configuration_list(request):
@@ -370,8 +740,11 @@ def configuration_get(request, group_id):
 
 
 def configuration_parameters_list(request, datastore, datastore_version):
-    return troveclient(request).configuration_parameters.parameters(
-        datastore, datastore_version)
+    manager = troveclient(request).configuration_parameters
+    return _cached_catalog(
+        request, manager,
+        lambda: manager.parameters(datastore, datastore_version),
+        'configuration_parameters', datastore, datastore_version)
 
 
 def configuration_create(request,
@@ -391,18 +764,52 @@ def configuration_delete(request, group_id):
     return troveclient(request).configurations.delete(group_id)
 
 
-def configuration_instances(request, group_id):
-    return troveclient(request).configurations.instances(group_id)
+def configuration_instances(request, group_id, marker=None):
+    return troveclient(request).configurations.instances(group_id,
+                                                         marker=marker)
 
 
 def configuration_update(request, group_id, values):
     return troveclient(request).configurations.update(group_id, values)
 
 
+def configuration_edit(request, group_id, values):
+    return troveclient(request).configurations.edit(group_id, values)
+
+
 def configuration_default(request, instance_id):
     return troveclient(request).instances.configuration(instance_id)
 
 
+def configuration_default_values(request, instance):
+    """Returns the default configuration of an instance, sorted by name.
+
+    The defaults only depend on the datastore version and the flavor of the
+    instance, so they are fetched once per such pair and kept with the
+    catalog data. Returns None, which is cached too, when Trove has no
+    configuration parser for the datastore.
+    """
+    key = _catalog_cache_key(request, 'configuration_default',
+                             instance.datastore['type'],
+                             instance.datastore['version'],
+                             instance.flavor['id'])
+    cached = cache.get(key)
+    if cached is not None:
+        return cached['values']
+
+    try:
+        defaults = configuration_default(request, instance.id)
+        values = sorted(defaults.configuration.items())
+    except trove_exceptions.BadRequest as e:
+        if "No configuration parser found" not in e.message:
+            raise
+        LOG.info("Configuration defaults are not available.  "
+                 "Reason: %s", e.message)
+        values = None
+    cache.set(key, {'values': values}, CATALOG_CACHE_TIMEOUT)
+    return values
+
+
 def log_list(request, instance_id):
     return troveclient(request).instances.log_list(instance_id)
 
@@ -423,6 +830,160 @@ def log_discard(request, instance_id, log_name):
     return troveclient(request).instances.log_discard(instance_id, log_name)
 
 
+def log_show(request, instance_id, log_name):
+    return troveclient(request).instances.log_show(instance_id, log_name)
+
+
+def _log_parts(swift, log):
+    headers, parts = swift.get_container(log.container, prefix=log.prefix,
+                                         full_listing=True)
+    return sorted(parts, key=lambda part: (part['last_modified'],
+                                           part['name']))
+
+
+def _read_log_bytes(swift, log, parts, start, end=None):
+    data = []
+    part_start = 0
+    for part in parts:
+        part_end = part_start + part['bytes']
+        if part_end > start and (end is None or part_start < end):
+            first = max(start - part_start, 0)
+            last = part['bytes'] - 1
+            if end is not None:
+                last = min(end - part_start, part['bytes']) - 1
+            headers = None
+            if first or last < part['bytes'] - 1:
+                headers = {'Range': 'bytes=%d-%d' % (first, last)}
+            part_headers, part_data = swift.get_object(log.container,
+                                                       part['name'],
+                                                       headers=headers)
+            if headers and 'content-range' not in part_headers:
+                # The Range was not honoured and the whole part was sent.
+                part_data = part_data[first:last + 1]
+            data.append(part_data)
+        part_start = part_end
+    return ''.join(data)
+
+
+def _count_log_line_breaks(swift, log, part):
+    """Returns the line breaks of a log part and whether it ends with one.
+
+    Trove writes whole lines to each part and counts them in the
+    x-object-meta-lines header. Parts without it are read in chunks of
+    LOG_CHUNK_SIZE bytes to count them, instead of being held in memory.
+    """
+    headers = swift.head_object(log.container, part['name'])
+    if 'x-object-meta-lines' in headers:
+        return int(headers['x-object-meta-lines']), True
+    headers, chunks = swift.get_object(log.container, part['name'],
+                                       resp_chunk_size=LOG_CHUNK_SIZE)
+    line_breaks = 0
+    last = '\n'
+    for chunk in chunks:
+        if chunk:
+            line_breaks += chunk.count('\n')
+            last = chunk[-1]
+    return line_breaks, last == '\n'
+
+
+def _log_line_index(swift, log, parts):
+    """Returns the line breaks in every part of a published log.
+
+    Returns a (line_breaks, total_lines) tuple. The counts are cached by
+    object hash, which changes with the content of a part, so each part is
+    only looked at once.
+    """
+    key = 'trove-log-line-breaks:%s' % hashlib.md5(
+        ('%s/%s' % (log.container, log.prefix)).encode('utf-8')).hexdigest()
+    counts = cache.get(key) or {}
+    line_breaks = []
+    ends_with_break = True
+    for part in parts:
+        count = counts.get(part['hash'])
+        if count is None:
+            count = _count_log_line_breaks(swift, log, part)
+            counts[part['hash']] = count
+        line_breaks.append(count[0])
+        if part['bytes']:
+            ends_with_break = count[1]
+    cache.set(key, counts, LOG_INDEX_TIMEOUT)
+    total_lines = sum(line_breaks)
+    if not ends_with_break:
+        total_lines += 1
+    return line_breaks, total_lines
+
+
+def log_follow(request, instance_id, log_name, swift, offset=None,
+               etag=None, publish=False):
+    """Returns the part of a published log that follows a byte offset.
+
+    Returns a (data, end_offset, etag) tuple. Without an offset, or when
+    etag still matches the published log, no log data is read. An offset
+    past the end of the log, e.g. after it was discarded, starts over.
+    """
+    if publish:
+        log = log_publish(request, instance_id, log_name)
+    else:
+        log = log_show(request, instance_id, log_name)
+    parts = _log_parts(swift, log)
+    end_offset = sum(part['bytes'] for part in parts)
+    current_etag = '"%s"' % hashlib.md5(
+        ''.join(part['hash'] for part in parts).encode('utf-8')).hexdigest()
+    if offset is None or etag == current_etag:
+        return '', end_offset, current_etag
+    if offset > end_offset:
+        offset = 0
+    return (_read_log_bytes(swift, log, parts, offset), end_offset,
+            current_etag)
+
+
+def log_bytes(request, instance_id, log_name, swift, start, length):
+    """Returns a (data, total_bytes) tuple for a byte range of a log.
+
+    Only the byte range is requested from the published log parts it
+    spans.
+    """
+    log = log_show(request, instance_id, log_name)
+    parts = _log_parts(swift, log)
+    total_bytes = sum(part['bytes'] for part in parts)
+    return (_read_log_bytes(swift, log, parts, start, start + length),
+            total_bytes)
+
+
+def log_lines(request, instance_id, log_name, swift, start, count):
+    """Returns a (lines, total_lines) tuple for a line window of a log.
+
+    Only the published log parts holding the window are downloaded.
+    """
+    log = log_show(request, instance_id, log_name)
+    parts = _log_parts(swift, log)
+    line_breaks, total_lines = _log_line_index(swift, log, parts)
+    end = min(start + count, total_lines)
+    if start >= end:
+        return [], total_lines
+
+    # Line n starts after the n-th line break of the log, so the parts from
+    # the one holding that break up to the one holding the break that ends
+    # the window are read. A line split across two parts is joined again.
+    first = last = None
+    first_line = seen = 0
+    for i, breaks in enumerate(line_breaks):
+        if first is None and (start == 0 or seen + breaks >= start):
+            first = i
+            first_line = seen
+        if seen + breaks >= end:
+            last = i
+            break
+        seen += breaks
+    if last is None:
+        last = len(parts) - 1
+
+    data = ''.join(swift.get_object(log.container, part['name'])[1]
+                   for part in parts[first:last + 1])
+    lines = data.split('\n')
+    return lines[start - first_line:end - first_line], total_lines
+
+
 def log_tail(request, instance_id, log_name, publish, lines, swift=None):
     return troveclient(request).instances.log_generator(instance_id,
                                                         log_name,
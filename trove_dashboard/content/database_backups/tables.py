@@ -115,14 +115,22 @@ class DeleteBackup(tables.DeleteAction):
         api.trove.backup_delete(request, obj_id)
 
 
+class BackupsFilterAction(tables.FilterAction):
+    filter_type = "server"
+    filter_choices = (('instance', _("Instance ID ="), True),
+                      ('datastore', _("Datastore ="), True),
+                      ('status', _("Status ="), True))
+
+
 class UpdateRow(tables.Row):
     ajax = True
 
     def get_data(self, request, backup_id):
         backup = api.trove.backup_get(request, backup_id)
         try:
-            backup.instance = api.trove.instance_get(request,
-                                                     backup.instance_id)
+            instances = api.trove.instance_index(request)
+            backup.instance = instances.get(backup.instance_id,
+                                            _('Not Found'))
         except Exception:
             pass
         return backup
@@ -186,5 +194,5 @@ class BackupsTable(tables.DataTable):
         verbose_name = _("Backups")
         status_columns = ["status"]
         row_class = UpdateRow
-        table_actions = (LaunchLink, DeleteBackup)
+        table_actions = (BackupsFilterAction, LaunchLink, DeleteBackup)
         row_actions = (RestoreLink, DownloadBackup, DeleteBackup)
@@ -13,6 +13,9 @@
 #    under the License.
 
 import binascii
+import collections
+import copy
+import json
 
 from django.core.urlresolvers import reverse
 from django import http
@@ -26,6 +29,7 @@ from troveclient import common
 
 from trove_dashboard import api
 from trove_dashboard.content.databases.workflows import create_instance
+from trove_dashboard.content import utils
 from trove_dashboard.test import helpers as test
 
 INDEX_URL = reverse('horizon:project:database_backups:index')
@@ -35,25 +39,107 @@ RESTORE_URL = reverse('horizon:project:databases:launch')
 
 
 class DatabasesBackupsTests(test.TestCase):
-    @test.create_stubs({api.trove: ('backup_list', 'instance_get')})
+    def _instance_index(self, instances):
+        return collections.OrderedDict(
+            (i.id, api.trove.InstanceSummary(i.id, i.name, i.status,
+                                             i.datastore))
+            for i in instances)
+
+    def _backup_index(self, backups):
+        return collections.OrderedDict(
+            (b.id, api.trove.BackupSummary(b.id, b.name, b.status,
+                                           b.instance_id, b.datastore))
+            for b in backups)
+
+    @test.create_stubs({api.trove: ('backup_list', 'instance_index')})
     def test_index(self):
-        api.trove.backup_list(IsA(http.HttpRequest))\
-            .AndReturn(self.database_backups.list())
+        api.trove.backup_list(IsA(http.HttpRequest), marker=None,
+                              paginate=True, instance_id=None,
+                              datastore=None)\
+            .AndReturn(common.Paginated(self.database_backups.list()))
 
-        api.trove.instance_get(IsA(http.HttpRequest),
-                               IsA(str))\
-            .MultipleTimes()\
-            .AndReturn(self.databases.first())
+        api.trove.instance_index(IsA(http.HttpRequest))\
+            .AndReturn(self._instance_index(self.databases.list()))
+
+        self.mox.ReplayAll()
+
+        res = self.client.get(INDEX_URL)
+
+        self.assertTemplateUsed(res, 'project/database_backups/index.html')
+        self.assertContains(res, self.databases.first().name)
+
+    @test.create_stubs({api.trove: ('backup_list', 'instance_index')})
+    def test_index_deleted_instance(self):
+        api.trove.backup_list(IsA(http.HttpRequest), marker=None,
+                              paginate=True, instance_id=None,
+                              datastore=None)\
+            .AndReturn(common.Paginated(self.database_backups.list()))
+
+        api.trove.instance_index(IsA(http.HttpRequest))\
+            .AndReturn(self._instance_index([]))
+
+        self.mox.ReplayAll()
+
+        res = self.client.get(INDEX_URL)
+
+        self.assertTemplateUsed(res, 'project/database_backups/index.html')
+        self.assertNotContains(res, self.databases.first().name)
+        self.assertContains(res, self.database_backups.first().instance_id)
+
+    @test.create_stubs({api.trove: ('backup_list', 'instance_index')})
+    def test_index_pagination(self):
+        backups = self.database_backups.list()
+        last_record = backups[-1]
+        api.trove.backup_list(IsA(http.HttpRequest), marker=None,
+                              paginate=True, instance_id=None,
+                              datastore=None)\
+            .AndReturn(common.Paginated(backups, next_marker="foo"))
+
+        api.trove.instance_index(IsA(http.HttpRequest))\
+            .AndReturn(self._instance_index(self.databases.list()))
 
         self.mox.ReplayAll()
 
         res = self.client.get(INDEX_URL)
 
         self.assertTemplateUsed(res, 'project/database_backups/index.html')
+        self.assertContains(res, 'marker=' + last_record.id)
+
+    @test.create_stubs({api.trove: ('backup_list', 'instance_index')})
+    def test_index_status_filter(self):
+        backups = self.database_backups.list()
+        new_backup = copy.deepcopy(backups[0])
+        new_backup.id = 'new-backup'
+        new_backup.status = 'NEW'
+        # the first page has no backup with the status
+        api.trove.backup_list(IsA(http.HttpRequest), marker=None,
+                              paginate=True, instance_id=None,
+                              datastore=None)\
+            .AndReturn(common.Paginated(backups, next_marker="foo"))
+        api.trove.backup_list(IsA(http.HttpRequest), marker="foo",
+                              paginate=True, instance_id=None,
+                              datastore=None)\
+            .AndReturn(common.Paginated([new_backup]))
+
+        api.trove.instance_index(IsA(http.HttpRequest))\
+            .AndReturn(self._instance_index(self.databases.list()))
+
+        self.mox.ReplayAll()
+
+        res = self.client.post(INDEX_URL,
+                               {'backups__filter__q_field': 'status',
+                                'backups__filter__q': 'new'})
+
+        self.assertTemplateUsed(res, 'project/database_backups/index.html')
+        self.assertEqual([new_backup.id],
+                         [backup.id for backup in res.context['table'].data])
+        self.assertNotContains(res, 'marker=')
 
     @test.create_stubs({api.trove: ('backup_list',)})
     def test_index_exception(self):
-        api.trove.backup_list(IsA(http.HttpRequest))\
+        api.trove.backup_list(IsA(http.HttpRequest), marker=None,
+                              paginate=True, instance_id=None,
+                              datastore=None)\
             .AndRaise(self.exceptions.trove)
 
         self.mox.ReplayAll()
@@ -65,19 +151,15 @@ class DatabasesBackupsTests(test.TestCase):
         self.assertEqual(res.status_code, 200)
         self.assertMessageCount(res, error=1)
 
-    @test.create_stubs({api.trove: ('instance_list',
-                                    'backup_list',
+    @test.create_stubs({api.trove: ('instance_index',
                                     'backup_create')})
     def test_launch_backup(self):
-        api.trove.instance_list(IsA(http.HttpRequest))\
-            .AndReturn(self.databases.list())
-        api.trove.backup_list(IsA(http.HttpRequest)) \
-            .AndReturn(self.database_backups.list())
-
         database = self.databases.first()
         backupName = "NewBackup"
         backupDesc = "Backup Description"
 
+        api.trove.instance_index(IsA(http.HttpRequest))\
+            .AndReturn(self._instance_index(self.databases.list()))
         api.trove.backup_create(
             IsA(http.HttpRequest),
             backupName,
@@ -98,34 +180,70 @@ class DatabasesBackupsTests(test.TestCase):
         self.assertNoFormErrors(res)
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
-    @test.create_stubs({api.trove: ('instance_list', 'backup_list')})
+    @test.create_stubs({api.trove: ('instance_index', 'instance_get',
+                                    'backup_create')})
+    def test_launch_backup_stale_index(self):
+        database = self.databases.first()
+        index = self._instance_index(self.databases.list())
+        index[database.id].status = 'BUILD'
+
+        # the instance is checked again before it is rejected
+        api.trove.instance_index(IsA(http.HttpRequest))\
+            .AndReturn(index)
+        api.trove.instance_get(IsA(http.HttpRequest), database.id)\
+            .AndReturn(database)
+        api.trove.backup_create(
+            IsA(http.HttpRequest),
+            "NewBackup",
+            database.id,
+            "",
+            "")
+
+        self.mox.ReplayAll()
+
+        post = {
+            'name': "NewBackup",
+            'instance': database.id,
+            'description': "",
+            'parent': ""
+        }
+        res = self.client.post(BACKUP_URL, post)
+
+        self.assertNoFormErrors(res)
+        self.assertRedirectsNoFollow(res, INDEX_URL)
+
+    @test.create_stubs({api.trove: ('instance_index',)})
     def test_launch_backup_exception(self):
-        api.trove.instance_list(IsA(http.HttpRequest))\
+        api.trove.instance_index(IsA(http.HttpRequest))\
             .AndRaise(self.exceptions.trove)
-        api.trove.backup_list(IsA(http.HttpRequest)) \
-            .AndReturn(self.database_backups.list())
 
         self.mox.ReplayAll()
 
-        res = self.client.get(BACKUP_URL)
-        self.assertMessageCount(res, error=1)
+        post = {
+            'name': "NewBackup",
+            'instance': self.databases.first().id,
+            'description': "",
+            'parent': ""
+        }
+        res = self.client.post(BACKUP_URL, post)
         self.assertTemplateUsed(res,
                                 'project/database_backups/backup.html')
+        self.assertContains(res,
+                            "Unable to list database instances to backup.")
 
-    @test.create_stubs({api.trove: ('instance_list',
-                                    'backup_list',
+    @test.create_stubs({api.trove: ('instance_index',
+                                    'backup_index',
                                     'backup_create')})
     def test_launch_backup_incr(self):
-        api.trove.instance_list(IsA(http.HttpRequest)) \
-            .AndReturn(self.databases.list())
-        api.trove.backup_list(IsA(http.HttpRequest)) \
-            .AndReturn(self.database_backups.list())
-
         database = self.databases.first()
         backupName = "NewBackup"
         backupDesc = "Backup Description"
         backupParent = self.database_backups.first()
 
+        api.trove.instance_index(IsA(http.HttpRequest))\
+            .AndReturn(self._instance_index(self.databases.list()))
+        api.trove.backup_index(IsA(http.HttpRequest))\
+            .AndReturn(self._backup_index(self.database_backups.list()))
         api.trove.backup_create(
             IsA(http.HttpRequest),
             backupName,
@@ -146,6 +264,75 @@ class DatabasesBackupsTests(test.TestCase):
         self.assertNoFormErrors(res)
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
+    @test.create_stubs({api.trove: ('instance_index',
+                                    'backup_index',
+                                    'backup_get',
+                                    'backup_create')})
+    def test_launch_backup_incr_stale_index(self):
+        database = self.databases.first()
+        backupParent = self.database_backups.first()
+        index = self._backup_index(self.database_backups.list())
+        index[backupParent.id].status = 'NEW'
+
+        # the parent is checked again before it is rejected
+        api.trove.instance_index(IsA(http.HttpRequest))\
+            .AndReturn(self._instance_index(self.databases.list()))
+        api.trove.backup_index(IsA(http.HttpRequest))\
+            .AndReturn(index)
+        api.trove.backup_get(IsA(http.HttpRequest), backupParent.id)\
+            .AndReturn(backupParent)
+        api.trove.backup_create(
+            IsA(http.HttpRequest),
+            "NewBackup",
+            database.id,
+            "",
+            backupParent.id)
+
+        self.mox.ReplayAll()
+
+        post = {
+            'name': "NewBackup",
+            'instance': database.id,
+            'description': "",
+            'parent': backupParent.id,
+        }
+        res = self.client.post(BACKUP_URL, post)
+
+        self.assertNoFormErrors(res)
+        self.assertRedirectsNoFollow(res, INDEX_URL)
+
+    @test.create_stubs({api.trove: ('backup_index',)})
+    def test_search_backups(self):
+        backups = self.database_backups.list()
+        api.trove.backup_index(IsA(http.HttpRequest))\
+            .MultipleTimes().AndReturn(self._backup_index(backups))
+        self.mox.stubs.Set(utils, 'SEARCH_LIMIT', 1)
+
+        self.mox.ReplayAll()
+
+        url = reverse('horizon:project:database_backups:search')
+        params = {'q': 'backup2', 'instance': backups[1].instance_id,
+                  'status': 'COMPLETED'}
+        res = self.client.get(url, params)
+        self.assertEqual(res.status_code, 200)
+        data = json.loads(res.content)
+        self.assertEqual([backups[1].id],
+                         [result['id'] for result in data['results']])
+        self.assertNotIn('next', data)
+
+    @test.create_stubs({api.trove: ('backup_index',)})
+    def test_search_backups_exception(self):
+        api.trove.backup_index(IsA(http.HttpRequest))\
+            .AndRaise(self.exceptions.trove)
+
+        self.mox.ReplayAll()
+
+        url = reverse('horizon:project:database_backups:search')
+        res = self.client.get(url, {'q': 'backup'})
+        self.assertEqual(res.status_code, 500)
+        self.assertEqual('Unable to retrieve database backups.',
+                         json.loads(res.content)['error'])
+
     @test.create_stubs({api.trove: ('backup_get', 'instance_get')})
     def test_detail_backup(self):
         api.trove.backup_get(IsA(http.HttpRequest),
@@ -192,35 +379,21 @@ class DatabasesBackupsTests(test.TestCase):
         self.assertTemplateUsed(res, 'project/database_backups/details.html')
 
     @test.create_stubs({
-        api.trove: ('backup_get', 'backup_list', 'configuration_list',
-                    'datastore_flavors', 'datastore_list',
-                    'datastore_version_list', 'datastore_volume_types',
-                    'instance_list', 'region_list'),
+        api.trove: ('backup_get', 'configuration_list', 'datastore_list',
+                    'datastore_version_list', 'region_list'),
         dash_api.nova: ('availability_zone_list',),
     })
     def test_restore_backup(self):
         backup = self.database_backups.first()
         api.trove.backup_get(IsA(http.HttpRequest), IsA(six.text_type)) \
-            .AndReturn(self.database_backups.first())
-        api.trove.backup_list(IsA(http.HttpRequest)).AndReturn(
-            self.database_backups.list())
+            .MultipleTimes().AndReturn(self.database_backups.first())
         api.trove.configuration_list(IsA(http.HttpRequest)) \
             .AndReturn(self.database_configurations.list())
-        api.trove.datastore_flavors(IsA(http.HttpRequest),
-                                    IsA(six.string_types),
-                                    IsA(six.string_types)) \
-            .AndReturn(self.flavors.list())
         api.trove.datastore_list(IsA(http.HttpRequest)) \
             .AndReturn(self.datastores.list())
         api.trove.datastore_version_list(IsA(http.HttpRequest),
                                          backup.datastore['type']) \
             .AndReturn(self.datastore_versions.list())
-        api.trove.datastore_volume_types(IsA(http.HttpRequest),
-                                         IsA(six.string_types),
-                                         IsA(six.string_types)) \
-            .AndReturn(self.database_volume_types.list())
-        api.trove.instance_list(IsA(http.HttpRequest), marker=None) \
-            .AndReturn(common.Paginated(self.databases.list()))
         api.trove.region_list(IsA(http.HttpRequest))\
             .AndReturn([])
         dash_api.nova.availability_zone_list(IsA(http.HttpRequest)) \
@@ -21,6 +21,7 @@ urlpatterns = patterns(
     '',
     url(r'^$', views.IndexView.as_view(), name='index'),
     url(r'^create$', views.BackupView.as_view(), name='create'),
+    url(r'^search$', views.search_backups, name='search'),
     url(r'^(?P<backup_id>[^/]+)/$', views.DetailView.as_view(),
         name='detail'),
 )
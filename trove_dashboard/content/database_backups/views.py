@@ -15,12 +15,19 @@
 """
 Views for displaying database backups.
 """
+import logging
+
 from django.core.urlresolvers import reverse
+from django import http
 from django.utils.translation import ugettext_lazy as _
 
+import six
+
 from horizon import exceptions
 from horizon import tables as horizon_tables
 from horizon.utils import filters
+from horizon.utils import functions as horizon_utils
+from horizon.utils import memoized
 from horizon import views as horizon_views
 from horizon import workflows as horizon_workflows
 
@@ -28,6 +35,10 @@ from trove_dashboard import api
 from trove_dashboard.content.database_backups import tables
 from trove_dashboard.content.database_backups \
     import workflows
+from trove_dashboard.content.databases import db_capability
+from trove_dashboard.content import utils
+
+LOG = logging.getLogger(__name__)
 
 
 class IndexView(horizon_tables.DataTableView):
@@ -35,29 +46,77 @@ class IndexView(horizon_tables.DataTableView):
     template_name = 'project/database_backups/index.html'
     page_title = _("Backups")
 
+    @memoized.memoized_method
+    def _get_instances(self):
+        try:
+            return api.trove.instance_index(self.request)
+        except Exception:
+            LOG.exception("Unable to retrieve database instances.")
+            return None
+
     def _get_extra_data(self, backup):
         """Apply extra info to the backup."""
-        instance_id = backup.instance_id
-        # TODO(rdopieralski) It's not clear where this attribute is supposed
-        # to come from. At first glance it looks like it will always be {}.
-        if not hasattr(self, '_instances'):
-            self._instances = {}
-        instance = self._instances.get(instance_id)
-        if instance is None:
-            try:
-                instance = api.trove.instance_get(self.request, instance_id)
-            except Exception:
-                instance = _('Not Found')
-        backup.instance = instance
+        instances = self._get_instances()
+        if instances is not None:
+            backup.instance = instances.get(backup.instance_id,
+                                            _('Not Found'))
         return backup
 
+    def has_more_data(self, table):
+        return self._more
+
+    def _get_filters(self):
+        filter_field = self.table.get_filter_field()
+        filter_string = self.table.get_filter_string()
+        if filter_field and filter_string:
+            return {filter_field: filter_string.strip()}
+        return {}
+
+    def _list_backups(self, marker, filters):
+        return api.trove.backup_list(
+            self.request, marker=marker, paginate=True,
+            instance_id=filters.get('instance'),
+            datastore=filters.get('datastore'))
+
+    def _get_backups_with_status(self, marker, filters, status):
+        """Returns a full page of the backups with the given status.
+
+        Trove cannot filter backups by status, so pages of backup_list are
+        read until enough backups match or there are no more pages. The
+        next page starts after the last backup shown, as usual.
+        """
+        page_size = horizon_utils.get_page_size(self.request)
+        matches = []
+        self._more = False
+        while True:
+            backups = self._list_backups(marker, filters)
+            for position, backup in enumerate(backups):
+                if backup.status.lower() != status.lower():
+                    continue
+                matches.append(backup)
+                if len(matches) == page_size:
+                    self._more = bool(position + 1 < len(backups) or
+                                      backups.next)
+                    return matches
+            marker = backups.next
+            if not marker:
+                return matches
+
     def get_data(self):
-        # TODO(rmyers) Add pagination support after it is available
-        # https://blueprints.launchpad.net/trove/+spec/paginate-backup-list
+        marker = self.request.GET.get(
+            tables.BackupsTable._meta.pagination_param)
+        filters = self._get_filters()
         try:
-            backups = api.trove.backup_list(self.request)
+            status = filters.get('status')
+            if status:
+                backups = self._get_backups_with_status(marker, filters,
+                                                        status)
+            else:
+                backups = self._list_backups(marker, filters)
+                self._more = backups.next or False
             backups = map(self._get_extra_data, backups)
         except Exception:
+            self._more = False
             backups = []
             msg = _('Error getting database backup list.')
             exceptions.handle(self.request, msg)
@@ -108,3 +167,55 @@ class DetailView(horizon_views.APIView):
         context['backup'] = backup
         context['instance'] = instance
         return context
+
+
+def search_backups(request):
+    """Returns the backups matching a typeahead search as JSON.
+
+    The text in q is matched against backup names and ids. The matches can
+    be restricted to an instance (instance), a datastore type (datastore),
+    some statuses (status, repeatable) and to datastores that support
+    backups (capability=backup). Matches come from the cached backup index,
+    only the first SEARCH_LIMIT of them are returned.
+    """
+    query = request.GET.get('q', '').strip().lower()
+    instance_id = request.GET.get('instance')
+    datastore = request.GET.get('datastore')
+    statuses = request.GET.getlist('status')
+    backup_capable = request.GET.get('capability') == 'backup'
+
+    try:
+        backups = api.trove.backup_index(request).values()
+    except Exception:
+        LOG.exception("Unable to search database backups.")
+        return http.JsonResponse(
+            {'error': six.text_type(
+                _('Unable to retrieve database backups.'))},
+            status=500)
+
+    matches = []
+    for backup in backups:
+        datastore_type = backup.datastore.get('type')
+        if instance_id and backup.instance_id != instance_id:
+            continue
+        if datastore and datastore_type != datastore:
+            continue
+        if statuses and backup.status not in statuses:
+            continue
+        if backup_capable and not db_capability.can_backup(datastore_type):
+            continue
+        if (query and query not in (backup.name or '').lower() and
+                not backup.id.startswith(query)):
+            continue
+        matches.append(backup)
+    matches.sort(key=lambda backup: ((backup.name or '').lower(), backup.id))
+
+    results = [{'id': backup.id,
+                'name': backup.name,
+                'label': '%s (%s %s, %s)' % (
+                    backup.name,
+                    backup.datastore.get('type'),
+                    backup.datastore.get('version'),
+                    backup.status)}
+               for backup in matches[:utils.SEARCH_LIMIT]]
+    return http.JsonResponse({'results': results})
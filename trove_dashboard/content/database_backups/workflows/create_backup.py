@@ -23,6 +23,7 @@ from horizon import workflows
 from trove_dashboard import api
 from trove_dashboard.content.databases import db_capability
 from trove_dashboard.content.databases import tables as project_tables
+from trove_dashboard.content import widgets
 
 
 LOG = logging.getLogger(__name__)
@@ -30,48 +31,87 @@ LOG = logging.getLogger(__name__)
 
 class BackupDetailsAction(workflows.Action):
     name = forms.CharField(max_length=80, label=_("Name"))
-    instance = forms.ChoiceField(label=_("Database Instance"))
+    instance = forms.CharField(
+        label=_("Database Instance"),
+        help_text=_("Type part of the name of the instance and select it"),
+        widget=widgets.TypeaheadInput(
+            'horizon:project:databases:search_instances',
+            params={'status': project_tables.ACTIVE_STATES,
+                    'capability': 'backup'}))
     description = forms.CharField(max_length=512, label=_("Description"),
                                   widget=forms.TextInput(),
                                   required=False,
                                   help_text=_("Optional Backup Description"))
-    parent = forms.ChoiceField(label=_("Parent Backup"),
-                               required=False,
-                               help_text=_("Optional parent backup"))
+    parent = forms.CharField(
+        label=_("Parent Backup"),
+        required=False,
+        help_text=_("Optional parent backup"),
+        widget=widgets.TypeaheadInput(
+            'horizon:project:database_backups:search',
+            params={'status': 'COMPLETED', 'capability': 'backup'}))
 
     class Meta(object):
         name = _("Details")
         help_text_template = \
             "project/database_backups/_backup_details_help.html"
 
-    def populate_instance_choices(self, request, context):
-        LOG.info("Obtaining list of instances.")
+    def __init__(self, request, context, *args, **kwargs):
+        super(BackupDetailsAction, self).__init__(request, context,
+                                                  *args, **kwargs)
+        # Show the name of an instance given in the request, not its id
+        instance_id = context.get('instance')
+        if instance_id:
+            try:
+                instance = api.trove.instance_index(request).get(instance_id)
+            except Exception:
+                instance = None
+            if instance is not None:
+                self.fields['instance'].widget.search_text = instance.name
+
+    def clean_instance(self):
+        instance_id = self.cleaned_data['instance']
         try:
-            instances = api.trove.instance_list(request)
+            instance = api.trove.instance_index(self.request).get(instance_id)
         except Exception:
-            instances = []
-            msg = _("Unable to list database instances to backup.")
-            exceptions.handle(request, msg)
-        return [(i.id, i.name) for i in instances
-                if (i.status in project_tables.ACTIVE_STATES) and
-                   (db_capability.can_backup(i.datastore['type']))]
-
-    def populate_parent_choices(self, request, context):
+            LOG.exception("Unable to retrieve database instances.")
+            raise forms.ValidationError(
+                _("Unable to list database instances to backup."))
+        if (instance is None or
+                instance.status not in project_tables.ACTIVE_STATES):
+            # the index may be out of date, the instance may have just
+            # been created or become active
+            try:
+                instance = api.trove.instance_get(self.request, instance_id)
+            except Exception:
+                LOG.exception("Unable to retrieve database instance.")
+        if (instance is None or
+                instance.status not in project_tables.ACTIVE_STATES or
+                not db_capability.can_backup(instance.datastore.get('type'))):
+            raise forms.ValidationError(
+                _("Select an active instance that can be backed up."))
+        return instance_id
+
+    def clean_parent(self):
+        parent_id = self.cleaned_data['parent']
+        if not parent_id:
+            return parent_id
         try:
-            backups = api.trove.backup_list(request)
-            choices = [(b.id, b.name) for b in backups
-                       if (b.status == 'COMPLETED') and
-                          (db_capability.can_backup(b.datastore['type']))]
+            parent = api.trove.backup_index(self.request).get(parent_id)
         except Exception:
-            choices = []
-            msg = _("Unable to list database backups for parent.")
-            exceptions.handle(request, msg)
-
-        if choices:
-            choices.insert(0, ("", _("Select parent backup")))
-        else:
-            choices.insert(0, ("", _("No backups available")))
-        return choices
+            LOG.exception("Unable to retrieve database backups.")
+            raise forms.ValidationError(
+                _("Unable to list database backups for parent."))
+        if parent is None or parent.status != 'COMPLETED':
+            # the index may be out of date, the backup may have just
+            # completed
+            try:
+                parent = api.trove.backup_get(self.request, parent_id)
+            except Exception:
+                LOG.exception("Unable to retrieve database backup.")
+        if parent is None or parent.status != 'COMPLETED':
+            raise forms.ValidationError(
+                _("Select a completed backup as parent."))
+        return parent_id
 
 
 class SetBackupDetails(workflows.Step):
@@ -13,39 +13,44 @@
 #    under the License.
 
 
-from django.core import cache
+from trove_dashboard.content import drafts
 
+DRAFT_KIND = 'cluster-grow'
 
-def get(cluster_id):
-    if not has_cluster(cluster_id):
-        manager = ClusterInstanceManager(cluster_id)
-        cache.cache.set(cluster_id, manager)
 
-    return cache.cache.get(cluster_id)
+def get(request, cluster_id):
+    data, version = drafts.load(request, DRAFT_KIND, cluster_id)
+    manager = ClusterInstanceManager(cluster_id)
+    manager.version = version
+    if data is not None:
+        manager.load_draft(data)
+    return manager
 
 
-def delete(cluster_id):
-    manager = get(cluster_id)
-    manager.clear_instances()
-    cache.cache.delete(cluster_id)
+def delete(request, cluster_id):
+    drafts.delete(request, DRAFT_KIND, cluster_id)
 
 
-def update(cluster_id, manager):
-    cache.cache.set(cluster_id, manager)
-
-
-def has_cluster(cluster_id):
-    if cache.cache.get(cluster_id):
-        return True
-    else:
-        return False
+def update(request, cluster_id, manager):
+    manager.version = drafts.save(request, DRAFT_KIND, cluster_id,
+                                  manager.to_draft(), manager.version)
 
 
 class ClusterInstanceManager(object):
+    version = 0
+
     def __init__(self, cluster_id):
         self.cluster_id = cluster_id
         self.instances = []
 
+    def to_draft(self):
+        return {'instances': [vars(instance)
+                              for instance in self.get_instances()]}
+
+    def load_draft(self, data):
+        self.instances = [ClusterInstance(**instance)
+                          for instance in data['instances']]
+
     def get_instances(self):
         if not hasattr(self, 'instances'):
             self.instances = []
@@ -57,25 +62,25 @@ class ClusterInstanceManager(object):
                 return instance
         return None
 
-    def add_instance(self, id, name, flavor_id,
+    def add_instance(self, request, id, name, flavor_id,
                      flavor, volume, type, related_to, nics,
                      availability_zone, region):
         instance = ClusterInstance(id, name, flavor_id, flavor,
                                    volume, type, related_to, nics,
                                    availability_zone, region)
         self.instances.append(instance)
-        update(self.cluster_id, self)
+        update(request, self.cluster_id, self)
         return self.get_instances()
 
-    def delete_instance(self, id):
+    def delete_instance(self, request, id):
         instance = self.get_instance(id)
         if instance:
             self.instances.remove(instance)
-            update(self.cluster_id, self)
+            update(request, self.cluster_id, self)
 
-    def clear_instances(self):
+    def clear_instances(self, request):
         self.instances = []
-        update(self.cluster_id, self)
+        update(request, self.cluster_id, self)
 
 
 class ClusterInstance(object):
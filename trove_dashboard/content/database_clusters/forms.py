@@ -36,6 +36,7 @@ from trove_dashboard.content.database_clusters \
 from trove_dashboard.content.databases import db_capability
 from trove_dashboard.content.databases.workflows \
     import create_instance
+from trove_dashboard.content import widgets
 
 LOG = logging.getLogger(__name__)
 
@@ -317,11 +318,20 @@ class LaunchForm(forms.SelfHandlingForm):
             label=_("Flavor"),
             help_text=_("Size of image to launch."),
             required=False,
-            widget=forms.Select(attrs={
-                'class': 'switched',
-                'data-switch-on': 'datastore',
-                attr_key: _("Flavor")
-            }))
+            widget=widgets.LazySelect(
+                'horizon:project:databases:datastore_choices',
+                params={'datastore': datastore,
+                        'datastore_version': datastore_version,
+                        'kind': 'flavor'},
+                attrs={
+                    'class': 'switched',
+                    'data-switch-on': 'datastore',
+                    attr_key: _("Flavor")
+                }))
+        # The flavors of the other versions are loaded by the browser when
+        # their version is selected.
+        if self.data.get('datastore') != name:
+            return name, field
         valid_flavors = self.datastore_flavors(request,
                                                datastore,
                                                datastore_version)
@@ -562,8 +572,9 @@ class ClusterAddInstanceForm(forms.SelfHandlingForm):
     def handle(self, request, data):
         try:
             flavor = trove_api.trove.flavor_get(request, data['flavor'])
-            manager = cluster_manager.get(data['cluster_id'])
-            manager.add_instance(str(uuid.uuid4()),
+            manager = cluster_manager.get(request, data['cluster_id'])
+            manager.add_instance(request,
+                                 str(uuid.uuid4()),
                                  data.get('name', None),
                                  data['flavor'],
                                  flavor.name,
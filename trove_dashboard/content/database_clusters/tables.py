@@ -118,7 +118,7 @@ class UpdateRow(tables.Row):
 
     @memoized.memoized_method
     def get_data(self, request, cluster_id):
-        cluster = api.trove.cluster_get(request, cluster_id)
+        cluster = api.trove.cluster_get_polled(request, cluster_id)
         try:
             # TODO(michayu): assumption that cluster is homogeneous
             flavor_id = cluster.instances[0]['flavor']['id']
@@ -323,8 +323,8 @@ class ClusterGrowRemoveInstance(tables.BatchAction):
         )
 
     def action(self, request, datum_id):
-        manager = cluster_manager.get(self.table.kwargs['cluster_id'])
-        manager.delete_instance(datum_id)
+        manager = cluster_manager.get(request, self.table.kwargs['cluster_id'])
+        manager.delete_instance(request, datum_id)
 
     def handle(self, table, request, obj_ids):
         action_success = []
@@ -412,7 +412,7 @@ class ClusterGrowAction(tables.Action):
             msg = _('Unable to grow cluster: %s')
             messages.error(request, msg % ex.message)
         finally:
-            cluster_manager.delete(cluster_id)
+            cluster_manager.delete(request, cluster_id)
 
         return shortcuts.redirect(urlresolvers.reverse(
             "horizon:project:database_clusters:index"))
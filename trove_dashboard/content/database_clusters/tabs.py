@@ -23,6 +23,7 @@ from horizon import tabs
 from trove_dashboard import api
 from trove_dashboard.content.database_clusters import tables
 from trove_dashboard.content.databases import db_capability
+from trove_dashboard.content import utils
 
 
 class OverviewTab(tabs.Tab):
@@ -67,12 +68,23 @@ class InstancesTab(tabs.TableTab):
         try:
             instances = api.trove.cluster_get(self.request,
                                               cluster.id).instances
-            for instance in instances:
+            flavors = dict((flavor.id, flavor) for flavor
+                           in api.trove.flavor_list(self.request))
+
+            def get_instance(instance):
                 instance_info = api.trove.instance_get(self.request,
                                                        instance['id'])
                 flavor_id = instance_info.flavor['id']
-                instance_info.full_flavor = api.trove.flavor_get(self.request,
-                                                                 flavor_id)
+                instance_info.full_flavor = flavors.get(flavor_id)
+                if instance_info.full_flavor is None:
+                    instance_info.full_flavor = api.trove.flavor_get(
+                        self.request, flavor_id)
+                return instance_info
+
+            results = utils.call_parallel(get_instance, instances)
+            for instance, (instance_info, error) in zip(instances, results):
+                if error is not None:
+                    raise error
                 if "type" in instance:
                     instance_info.type = instance["type"]
                 if "ip" in instance:
@@ -18,6 +18,7 @@ import binascii
 import logging
 import six
 
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django import http
 
@@ -110,8 +111,8 @@ class ClustersTests(test.TestCase):
         self.assertMessageCount(res, error=1)
 
     @test.create_stubs({
-        trove_api.trove: ('datastore_flavors', 'datastore_list',
-                          'datastore_version_list', 'region_list',),
+        trove_api.trove: ('datastore_list', 'datastore_version_list',
+                          'region_list',),
         api.base: ('is_service_enabled',),
         api.nova: ('availability_zone_list',)
     })
@@ -121,9 +122,6 @@ class ClustersTests(test.TestCase):
         api.nova.availability_zone_list(IsA(http.HttpRequest)) \
             .AndReturn(self.availability_zones.list())
         filtered_datastores = self._get_filtered_datastores('mongodb')
-        trove_api.trove.datastore_flavors(IsA(http.HttpRequest),
-                                          'mongodb', '2.6')\
-            .AndReturn(self.flavors.list())
         trove_api.trove.datastore_list(IsA(http.HttpRequest))\
             .AndReturn(filtered_datastores)
         trove_api.trove.datastore_version_list(IsA(http.HttpRequest),
@@ -135,6 +133,8 @@ class ClustersTests(test.TestCase):
         self.mox.ReplayAll()
         res = self.client.get(LAUNCH_URL)
         self.assertTemplateUsed(res, 'project/database_clusters/launch.html')
+        self.assertContains(
+            res, reverse('horizon:project:databases:datastore_choices'))
 
     def test_launch_cluster_mongo_fields(self):
         datastore = 'mongodb'
@@ -194,8 +194,8 @@ class ClustersTests(test.TestCase):
             fields['num_instances_vertica'], field_name))
 
     @test.create_stubs({
-        trove_api.trove: ('datastore_flavors', 'datastore_list',
-                          'datastore_version_list', 'region_list',),
+        trove_api.trove: ('datastore_list', 'datastore_version_list',
+                          'region_list',),
         api.base: ('is_service_enabled',),
         api.nova: ('availability_zone_list',)
     })
@@ -205,9 +205,6 @@ class ClustersTests(test.TestCase):
         api.nova.availability_zone_list(IsA(http.HttpRequest)) \
             .AndReturn(self.availability_zones.list())
         filtered_datastores = self._get_filtered_datastores(datastore)
-        trove_api.trove.datastore_flavors(IsA(http.HttpRequest),
-                                          datastore, datastore_version)\
-            .AndReturn(self.flavors.list())
         trove_api.trove.datastore_list(IsA(http.HttpRequest))\
             .AndReturn(filtered_datastores)
         trove_api.trove.datastore_version_list(IsA(http.HttpRequest),
@@ -413,7 +410,8 @@ class ClustersTests(test.TestCase):
 
     @test.create_stubs({trove_api.trove: ('cluster_get',
                                           'instance_get',
-                                          'flavor_get',)})
+                                          'flavor_get',
+                                          'flavor_list',)})
     def test_details(self):
         cluster = self.trove_clusters.first()
         trove_api.trove.cluster_get(IsA(http.HttpRequest), cluster.id)\
@@ -422,6 +420,8 @@ class ClustersTests(test.TestCase):
             .MultipleTimes().AndReturn(self.databases.first())
         trove_api.trove.flavor_get(IsA(http.HttpRequest), IsA(str))\
             .MultipleTimes().AndReturn(self.flavors.first())
+        trove_api.trove.flavor_list(IsA(http.HttpRequest))\
+            .MultipleTimes().AndReturn(self.flavors.list())
         self.mox.ReplayAll()
 
         details_url = reverse('horizon:project:database_clusters:detail',
@@ -432,7 +432,8 @@ class ClustersTests(test.TestCase):
 
     @test.create_stubs({trove_api.trove: ('cluster_get',
                                           'instance_get',
-                                          'flavor_get',)})
+                                          'flavor_get',
+                                          'flavor_list',)})
     def test_details_without_locality(self):
         cluster = self.trove_clusters.list()[1]
         trove_api.trove.cluster_get(IsA(http.HttpRequest), cluster.id)\
@@ -441,6 +442,8 @@ class ClustersTests(test.TestCase):
             .MultipleTimes().AndReturn(self.databases.first())
         trove_api.trove.flavor_get(IsA(http.HttpRequest), IsA(str))\
             .MultipleTimes().AndReturn(self.flavors.first())
+        trove_api.trove.flavor_list(IsA(http.HttpRequest))\
+            .MultipleTimes().AndReturn(self.flavors.list())
         self.mox.ReplayAll()
 
         details_url = reverse('horizon:project:database_clusters:detail',
@@ -451,7 +454,8 @@ class ClustersTests(test.TestCase):
 
     @test.create_stubs({trove_api.trove: ('cluster_get',
                                           'instance_get',
-                                          'flavor_get',)})
+                                          'flavor_get',
+                                          'flavor_list',)})
     def test_details_with_locality(self):
         cluster = self.trove_clusters.first()
         trove_api.trove.cluster_get(IsA(http.HttpRequest), cluster.id)\
@@ -460,6 +464,8 @@ class ClustersTests(test.TestCase):
             .MultipleTimes().AndReturn(self.databases.first())
         trove_api.trove.flavor_get(IsA(http.HttpRequest), IsA(str))\
             .MultipleTimes().AndReturn(self.flavors.first())
+        trove_api.trove.flavor_list(IsA(http.HttpRequest))\
+            .MultipleTimes().AndReturn(self.flavors.list())
         self.mox.ReplayAll()
 
         details_url = reverse('horizon:project:database_clusters:detail',
@@ -498,7 +504,8 @@ class ClustersTests(test.TestCase):
 
         manager = cluster_manager.ClusterInstanceManager(cluster.id)
         manager.instances = instances
-        cluster_manager.get(cluster.id).MultipleTimes().AndReturn(manager)
+        cluster_manager.get(IsA(http.HttpRequest), cluster.id)\
+            .MultipleTimes().AndReturn(manager)
         trove_api.trove.cluster_grow(IsA(http.HttpRequest),
                                      cluster.id,
                                      instances)
@@ -573,7 +580,8 @@ class ClustersTests(test.TestCase):
 
         manager = cluster_manager.ClusterInstanceManager(cluster.id)
         manager.instances = instances
-        cluster_manager.get(cluster.id).MultipleTimes().AndReturn(manager)
+        cluster_manager.get(IsA(http.HttpRequest), cluster.id)\
+            .MultipleTimes().AndReturn(manager)
         trove_api.trove.cluster_grow(IsA(http.HttpRequest),
                                      cluster.id,
                                      instances).AndRaise(self.exceptions.trove)
@@ -677,6 +685,32 @@ class ClustersTests(test.TestCase):
             for (log, level) in loggers:
                 log.setLevel(level)
 
+    @test.create_stubs({trove_api.trove: ('troveclient', 'cluster_list',
+                                          'cluster_get')})
+    def test_cluster_get_polled(self):
+        cache.clear()
+        clusters = self.trove_clusters.list()
+        trove_client = self.mox.CreateMockAnything()
+        trove_client.clusters = clusters[0].manager
+        trove_api.trove.troveclient(IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(trove_client)
+        trove_api.trove.cluster_list(IsA(http.HttpRequest)) \
+            .AndReturn(common.Paginated(clusters[:1]))
+        trove_api.trove.cluster_get(IsA(http.HttpRequest), clusters[1].id) \
+            .AndReturn(clusters[1])
+        self.mox.ReplayAll()
+
+        # the first cluster is taken from the cluster_list snapshot
+        for i in range(2):
+            cluster = trove_api.trove.cluster_get_polled(self.request,
+                                                         clusters[0].id)
+            self.assertEqual(clusters[0]._info, cluster._info)
+
+        # the other one is not on it and is fetched with cluster_get
+        cluster = trove_api.trove.cluster_get_polled(self.request,
+                                                     clusters[1].id)
+        self.assertEqual(clusters[1].id, cluster.id)
+
     def _get_filtered_datastores(self, datastore):
         filtered_datastore = []
         for ds in self.datastores.list():
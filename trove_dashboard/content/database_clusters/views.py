@@ -150,7 +150,7 @@ class ClusterGrowView(horizon_tables.DataTableView):
     page_title = _("Grow Cluster: {{cluster_name}}")
 
     def get_data(self):
-        manager = cluster_manager.get(self.kwargs['cluster_id'])
+        manager = cluster_manager.get(self.request, self.kwargs['cluster_id'])
         return manager.get_instances()
 
     def get_context_data(self, **kwargs):
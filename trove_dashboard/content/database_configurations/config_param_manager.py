@@ -13,36 +13,43 @@
 #    under the License.
 
 
-from django.core import cache
 from django.utils.translation import ugettext_lazy as _
 
+import six
+from six.moves import configparser
+
 from trove_dashboard import api
+from trove_dashboard.content.databases import db_capability
+from trove_dashboard.content import drafts
 
 from oslo_serialization import jsonutils
 
+DRAFT_KIND = 'configuration'
+
 
 def get(request, configuration_group_id):
-    if not has_config(configuration_group_id):
-        manager = ConfigParamManager(configuration_group_id)
+    data, version = drafts.load(request, DRAFT_KIND, configuration_group_id)
+    manager = ConfigParamManager(configuration_group_id)
+    manager.version = version
+    if data is None:
         manager.configuration_get(request)
-        cache.cache.set(configuration_group_id, manager)
-
-    return cache.cache.get(configuration_group_id)
-
-
-def delete(configuration_group_id):
-    cache.cache.delete(configuration_group_id)
+        try:
+            update(request, configuration_group_id, manager)
+        except drafts.DraftConflict:
+            # another request of the user started the draft first
+            return get(request, configuration_group_id)
+    else:
+        manager.load_draft(data)
+    return manager
 
 
-def update(configuration_group_id, manager):
-    cache.cache.set(configuration_group_id, manager)
+def delete(request, configuration_group_id):
+    drafts.delete(request, DRAFT_KIND, configuration_group_id)
 
 
-def has_config(configuration_group_id):
-    if cache.cache.get(configuration_group_id):
-        return True
-    else:
-        return False
+def update(request, configuration_group_id, manager):
+    manager.version = drafts.save(request, DRAFT_KIND, configuration_group_id,
+                                  manager.to_draft(), manager.version)
 
 
 def dict_has_changes(original, other):
@@ -60,10 +67,28 @@ def dict_has_changes(original, other):
     return False
 
 
+def dict_diff(original, other):
+    """Returns the keys added, changed and removed in other.
+
+    The added and changed keys are returned as dicts of their new values,
+    the removed keys as a sorted list.
+    """
+    added = {}
+    changed = {}
+    for key, value in other.items():
+        if key not in original:
+            added[key] = value
+        elif original[key] != value:
+            changed[key] = value
+    removed = sorted(key for key in original if key not in other)
+    return added, changed, removed
+
+
 class ConfigParamManager(object):
 
     original_configuration_values = None
     configuration = None
+    version = 0
 
     def __init__(self, configuration_id):
         self.configuration_id = configuration_id
@@ -90,6 +115,31 @@ class ConfigParamManager(object):
     def get_configuration(self):
         return self.configuration
 
+    def to_draft(self):
+        configuration = self.configuration
+        return {
+            'name': configuration.name,
+            'description': configuration.description,
+            'datastore_name': configuration.datastore_name,
+            'datastore_version_name': configuration.datastore_version_name,
+            'created': configuration.created,
+            'updated': configuration.updated,
+            'values': configuration.values,
+            'original_values': self.original_configuration_values,
+        }
+
+    def load_draft(self, data):
+        self.configuration = Configuration(
+            self.configuration_id,
+            data['name'],
+            data['description'],
+            data['datastore_name'],
+            data['datastore_version_name'],
+            data['created'],
+            data['updated'])
+        self.configuration.values = data['values']
+        self.original_configuration_values = data['original_values']
+
     def create_config_value(self, name, value):
         return ConfigParam(self.configuration_id, name, value)
 
@@ -100,24 +150,54 @@ class ConfigParamManager(object):
                     key_name, self.configuration.values[key_name])
         return None
 
-    def update_param(self, name, value):
+    def update_param(self, request, name, value):
         self.configuration.values[name] = value
-        update(self.configuration_id, self)
+        update(request, self.configuration_id, self)
 
-    def delete_param(self, name):
+    def delete_param(self, request, name):
         del self.configuration.values[name]
-        update(self.configuration_id, self)
+        update(request, self.configuration_id, self)
 
-    def add_param(self, name, value):
-        self.update_param(name, value)
+    def add_param(self, request, name, value):
+        self.update_param(request, name, value)
 
     def to_json(self):
         return jsonutils.dumps(self.configuration.values)
 
+    def get_changes(self):
+        return dict_diff(self.original_configuration_values,
+                         self.configuration.values)
+
     def has_changes(self):
         return dict_has_changes(self.original_configuration_values,
                                 self.configuration.values)
 
+    def changes_require_restart(self, request):
+        """Returns whether applying the changes needs a restart.
+
+        Parameters missing from the catalog are taken to need one.
+        """
+        catalog = get_parameter_catalog(
+            request, self.configuration.datastore_name,
+            self.configuration.datastore_version_name)
+        added, changed, removed = self.get_changes()
+        for name in list(added) + list(changed) + removed:
+            param = catalog.get(name)
+            if param is None or getattr(param, 'restart_required', True):
+                return True
+        return False
+
+    def apply_changes(self, request):
+        added, changed, removed = self.get_changes()
+        if removed:
+            # only a full update of the values removes parameters
+            return api.trove.configuration_update(
+                request, self.configuration_id, self.to_json())
+        values = dict(added)
+        values.update(changed)
+        return api.trove.configuration_edit(
+            request, self.configuration_id, jsonutils.dumps(values))
+
 
 class ConfigParam(object):
     def __init__(self, configuration_id, name, value):
@@ -138,56 +218,204 @@ class Configuration(object):
         self.updated = updated
 
 
-def validate_config_param_value(config_param, value):
-    if (config_param.type in (u"boolean", u"float", u"integer", u"long")):
-        if config_param.type == u"boolean":
-            if (value.lower() not in ("true", "false")):
-                return _('Value must be "true" or "false".')
-        else:
-            try:
-                float(value)
-            except ValueError:
-                return _('Value must be a number.')
-
-            min = getattr(config_param, "min", None)
-            max = getattr(config_param, "max", None)
-            try:
-                val = adjust_type(config_param.type, value)
-            except ValueError:
-                return (_('Value must be of type %s.') % config_param.type)
-
-            if min is not None and max is not None:
-                if val < min or val > max:
-                    return (_('Value must be a number '
-                              'between %(min)s and %(max)s.') %
-                            {"min": min, "max": max})
-            elif min is not None:
-                if val < min:
-                    return _('Value must be a number greater '
-                             'than or equal to %s.') % min
-            elif max is not None:
-                if val > max:
-                    return _('Value must be a number '
-                             'less than or equal to %s.') % max
-    return None
-
-
-def find_parameter(name, config_params):
-    for param in config_params:
-        if param.name == name:
-            return param
-    return None
-
-
-def adjust_type(data_type, value):
-    if not value:
-        return value
-    if data_type == "float":
-        new_value = float(value)
-    elif data_type == "long":
-        new_value = long(value)
-    elif data_type == "integer":
-        new_value = int(value)
+NUMBER_TYPES = {u"float": float, u"integer": int, u"long": long}
+
+
+def compile_validator(config_param):
+    """Returns a validator for the values of a configuration parameter.
+
+    The validator takes the value as entered and returns the value adjusted
+    to the type of the parameter, together with an error message, or None
+    if the value is valid.
+    """
+    data_type = config_param.type
+    if data_type == u"boolean":
+        def validate_boolean(value):
+            if value.lower() not in ("true", "false"):
+                return value, _('Value must be "true" or "false".')
+            return value, None
+        return validate_boolean
+
+    if data_type not in NUMBER_TYPES:
+        return lambda value: (value, None)
+
+    convert = NUMBER_TYPES[data_type]
+    min = getattr(config_param, "min", None)
+    max = getattr(config_param, "max", None)
+    if min is not None and max is not None:
+        def out_of_range(val):
+            if val < min or val > max:
+                return (_('Value must be a number '
+                          'between %(min)s and %(max)s.') %
+                        {"min": min, "max": max})
+    elif min is not None:
+        def out_of_range(val):
+            if val < min:
+                return _('Value must be a number greater '
+                         'than or equal to %s.') % min
+    elif max is not None:
+        def out_of_range(val):
+            if val > max:
+                return _('Value must be a number '
+                         'less than or equal to %s.') % max
     else:
-        new_value = value
-    return new_value
+        def out_of_range(val):
+            return None
+
+    def validate_number(value):
+        try:
+            float(value)
+        except ValueError:
+            return value, _('Value must be a number.')
+        try:
+            val = convert(value)
+        except ValueError:
+            return value, _('Value must be of type %s.') % data_type
+        return val, out_of_range(val)
+    return validate_number
+
+
+class ParameterCatalog(object):
+    """The configuration parameters of a datastore version, by name."""
+
+    def __init__(self, parameters):
+        self._parameters = dict((param.name, param) for param in parameters)
+        self._validators = dict((param.name, compile_validator(param))
+                                for param in parameters)
+
+    def names(self):
+        return sorted(self._parameters)
+
+    def get(self, name):
+        return self._parameters.get(name)
+
+    def validate(self, name, value):
+        """Returns the adjusted value and an error message, or None.
+
+        Values of unknown parameters are returned as they are.
+        """
+        validator = self._validators.get(name)
+        if validator is None:
+            return value, None
+        return validator(value)
+
+
+def get_parameter_catalog(request, datastore, datastore_version):
+    return ParameterCatalog(api.trove.configuration_parameters_list(
+        request, datastore, datastore_version))
+
+
+def ini_section(datastore):
+    """Returns the INI file section holding the datastore parameters."""
+    if db_capability.is_mysql_compatible(datastore):
+        return 'mysqld'
+    return datastore
+
+
+def parse_values(content, file_format, section=None):
+    """Returns the parameter values in a JSON or my.cnf style INI file.
+
+    The values are returned as text, ready to be validated against the
+    parameter catalog, along with the names of the flags given without
+    a value, which are left out. Only the given section of an INI file
+    is read, unless the file has a single section. Raises ValueError if
+    the file cannot be parsed.
+    """
+    try:
+        content = content.decode('utf-8')
+    except UnicodeDecodeError:
+        raise ValueError(_('The file must be UTF-8 encoded.'))
+
+    if file_format == 'json':
+        try:
+            values = jsonutils.loads(content)
+        except ValueError:
+            raise ValueError(_('The file is not valid JSON.'))
+        # files exported from a configuration group keep the values in
+        # a "values" object
+        if isinstance(values, dict) and isinstance(values.get('values'),
+                                                   dict):
+            values = values['values']
+        if not isinstance(values, dict):
+            raise ValueError(_('The file must hold a JSON object of '
+                               'parameter names and values.'))
+        return dict((name, _value_text(value))
+                    for name, value in values.items()), []
+
+    # my.cnf style files may include other files, which cannot be followed
+    lines = [line for line in content.splitlines()
+             if not line.strip().startswith('!')]
+    parser = configparser.RawConfigParser(allow_no_value=True)
+    try:
+        parser.readfp(six.StringIO(u'\n'.join(lines)))
+    except configparser.Error as e:
+        raise ValueError(_('The file is not a valid INI file: %s') % e)
+
+    # the other sections, such as [client] or [mysqldump], configure
+    # other programs
+    sections = parser.sections()
+    if section not in sections:
+        if len(sections) != 1:
+            raise ValueError(_('The file has no [%s] section.') % section)
+        section = sections[0]
+
+    values = {}
+    flags = []
+    for name, value in parser.items(section):
+        name = name.replace('-', '_')
+        if value is None:
+            flags.append(name)
+        else:
+            values[name] = value.strip().strip('"\'')
+    return values, sorted(flags)
+
+
+def _value_text(value):
+    if isinstance(value, bool):
+        return u'true' if value else u'false'
+    if value is None:
+        return None
+    return six.text_type(value)
+
+
+def validate_values(catalog, values):
+    """Validates parameter values against the catalog all at once.
+
+    Returns the values adjusted to the parameter types and the list of
+    all the errors found.
+    """
+    adjusted = {}
+    errors = []
+    for name in sorted(values):
+        value = values[name]
+        if catalog.get(name) is None:
+            errors.append(_('%s: Unknown parameter.') % name)
+            continue
+        if value is None:
+            errors.append(_('%s: A value must be given.') % name)
+            continue
+        value, error_msg = catalog.validate(name, value)
+        if error_msg:
+            errors.append(u'%s: %s' % (name, error_msg))
+        else:
+            adjusted[name] = value
+    return adjusted, errors
+
+
+def export_values(values, file_format, section=None):
+    """Yields the lines of a JSON or INI file holding the values."""
+    names = sorted(values)
+    if file_format == 'json':
+        yield u'{\n    "values": {\n'
+        for index, name in enumerate(names):
+            separator = u',' if index < len(names) - 1 else u''
+            yield u'        %s: %s%s\n' % (
+                jsonutils.dumps(name), jsonutils.dumps(values[name]),
+                separator)
+        yield u'    }\n}\n'
+        return
+
+    if section:
+        yield u'[%s]\n' % section
+    for name in names:
+        yield u'%s = %s\n' % (name, _value_text(values[name]))
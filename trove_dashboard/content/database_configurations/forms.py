@@ -21,6 +21,7 @@ from horizon import exceptions
 from horizon import forms
 from horizon import messages
 from horizon.utils import memoized
+from oslo_serialization import jsonutils
 
 from trove_dashboard import api
 from trove_dashboard.content.database_configurations \
@@ -127,12 +128,10 @@ class AddParameterForm(forms.SelfHandlingForm):
             request, configuration.datastore_name,
             configuration.datastore_version_name)
 
-        self.fields['value'].parameters = self.parameters
-
     @memoized.memoized_method
-    def parameters(self, request, datastore, datastore_version):
+    def parameter_catalog(self, request, datastore, datastore_version):
         try:
-            return api.trove.configuration_parameters_list(
+            return config_param_manager.get_parameter_catalog(
                 request, datastore, datastore_version)
         except Exception:
             LOG.exception(
@@ -144,14 +143,9 @@ class AddParameterForm(forms.SelfHandlingForm):
 
     def get_parameters(self, request, datastore, datastore_version):
         try:
-            choices = []
-
-            self.parameters = self.parameters(
+            self.catalog = self.parameter_catalog(
                 request, datastore, datastore_version)
-            for parameter in self.parameters:
-                choices.append((parameter.name, parameter.name))
-
-            return sorted(choices)
+            return [(name, name) for name in self.catalog.names()]
         except Exception:
             LOG.exception(
                 "Exception while obtaining configuration parameters list")
@@ -163,28 +157,114 @@ class AddParameterForm(forms.SelfHandlingForm):
     def clean(self):
         cleaned_data = super(AddParameterForm, self).clean()
 
-        if "value" in cleaned_data:
-            config_param = config_param_manager.find_parameter(
-                cleaned_data["name"], self.parameters)
-            if config_param:
-                error_msg = config_param_manager.validate_config_param_value(
-                    config_param, cleaned_data["value"])
-                if error_msg:
-                    self._errors['value'] = self.error_class([error_msg])
+        if "name" in cleaned_data and "value" in cleaned_data:
+            value, error_msg = self.catalog.validate(cleaned_data["name"],
+                                                     cleaned_data["value"])
+            if error_msg:
+                self._errors['value'] = self.error_class([error_msg])
+            else:
+                cleaned_data["value"] = value
         return cleaned_data
 
     def handle(self, request, data):
         try:
             (config_param_manager
                 .get(request, self.initial["configuration_id"])
-                .add_param(data["name"],
-                           config_param_manager.adjust_type(
-                               config_param_manager.find_parameter(
-                                   data["name"], self.parameters).type,
-                               data["value"])))
+                .add_param(request, data["name"], data["value"]))
             messages.success(request, _('Successfully added parameter'))
         except Exception as e:
             redirect = reverse("horizon:project:database_configurations:index")
             exceptions.handle(request, _('Unable to add new parameter: %s')
                               % e.message, redirect=redirect)
         return True
+
+
+class ImportParametersForm(forms.SelfHandlingForm):
+    values_file = forms.FileField(
+        label=_("File"),
+        help_text=_("A my.cnf style INI file or a JSON file of parameter "
+                    "names and values."))
+    file_format = forms.ChoiceField(
+        label=_("Format"),
+        choices=[("ini", _("INI (my.cnf)")),
+                 ("json", _("JSON"))])
+    replace = forms.BooleanField(
+        label=_("Replace All Values"),
+        required=False,
+        help_text=_("Remove the parameters that are not in the file. "
+                    "Otherwise the file values are merged into the "
+                    "current values."))
+
+    def __init__(self, request, *args, **kwargs):
+        super(ImportParametersForm, self).__init__(request, *args, **kwargs)
+
+        configuration = (config_param_manager
+                         .get(request, kwargs["initial"]["configuration_id"])
+                         .get_configuration())
+        self.catalog = self.parameter_catalog(
+            request, configuration.datastore_name,
+            configuration.datastore_version_name)
+        self.section = config_param_manager.ini_section(
+            configuration.datastore_name)
+
+    @memoized.memoized_method
+    def parameter_catalog(self, request, datastore, datastore_version):
+        try:
+            return config_param_manager.get_parameter_catalog(
+                request, datastore, datastore_version)
+        except Exception:
+            LOG.exception(
+                "Exception while obtaining configuration parameter list")
+            redirect = reverse('horizon:project:database_configurations:index')
+            exceptions.handle(request,
+                              _('Unable to obtain list of parameters.'),
+                              redirect=redirect)
+
+    def clean(self):
+        cleaned_data = super(ImportParametersForm, self).clean()
+
+        if "values_file" in cleaned_data and "file_format" in cleaned_data:
+            try:
+                values, flags = config_param_manager.parse_values(
+                    cleaned_data["values_file"].read(),
+                    cleaned_data["file_format"], self.section)
+            except ValueError as e:
+                self._errors['values_file'] = self.error_class([e.message])
+                return cleaned_data
+
+            values, errors = config_param_manager.validate_values(
+                self.catalog, values)
+            if errors:
+                self._errors['values_file'] = self.error_class(errors)
+            elif not values:
+                self._errors['values_file'] = self.error_class(
+                    [_("The file holds no parameters.")])
+            cleaned_data["values"] = values
+            cleaned_data["flags"] = flags
+        return cleaned_data
+
+    def handle(self, request, data):
+        configuration_id = self.initial["configuration_id"]
+        try:
+            values = jsonutils.dumps(data["values"])
+            if data["replace"]:
+                api.trove.configuration_update(request, configuration_id,
+                                               values)
+            else:
+                # the file only adds or changes values, which a patch of
+                # the group merges into the current ones
+                api.trove.configuration_edit(request, configuration_id,
+                                             values)
+            config_param_manager.delete(request, configuration_id)
+            messages.success(request,
+                             _('Imported %d parameters.') %
+                             len(data["values"]))
+            if data["flags"]:
+                messages.warning(request,
+                                 _('Ignored the parameters without a '
+                                   'value: %s') % ', '.join(data["flags"]))
+        except Exception as e:
+            redirect = reverse("horizon:project:database_configurations:index")
+            exceptions.handle(request, _('Unable to import parameters: %s')
+                              % e.message, redirect=redirect)
+        return True
@@ -0,0 +1,208 @@
+# Copyright 2016 Tesora Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Restarts the instances of a configuration group in waves.
+
+At most TROVE_RESTART_WAVE_SIZE instances are restarted at a time, and the
+next wave is only started once every instance of the current one is back
+to ACTIVE, or has failed. The rollout is kept as a draft of the user and
+only moves on when advance() is called, which the progress page does with
+a POST while it is open. Nothing progresses once the page is closed.
+"""
+
+import time
+
+from django.conf import settings
+from troveclient import exceptions as trove_exceptions
+
+from trove_dashboard import api
+from trove_dashboard.content import drafts
+from trove_dashboard.content import utils
+
+RESTART_WAVE_SIZE = getattr(settings, 'TROVE_RESTART_WAVE_SIZE', 5)
+
+# An instance that is not back to ACTIVE within this many seconds of the
+# start of its wave is counted as failed, so a stuck instance cannot hold
+# the rollout back.
+RESTART_WAVE_TIMEOUT = getattr(settings, 'TROVE_RESTART_WAVE_TIMEOUT', 1800)
+
+DRAFT_KIND = 'configuration-restart'
+
+PENDING = 'pending'
+RESTARTING = 'restarting'
+DONE = 'done'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+
+FAILED_STATES = ('ERROR', 'FAILED', 'SHUTDOWN')
+
+
+def _update(request, configuration_id, change):
+    """Applies change to the rollout and saves it, retrying on conflicts.
+
+    Returns the saved rollout and the result of change.
+    """
+    while True:
+        rollout, version = drafts.load(request, DRAFT_KIND, configuration_id)
+        if rollout is None:
+            return None, None
+        result = change(rollout)
+        try:
+            drafts.save(request, DRAFT_KIND, configuration_id, rollout,
+                        version)
+            return rollout, result
+        except drafts.DraftConflict:
+            continue
+
+
+def start(request, configuration_id, wave_size=None, restart_active=False):
+    """Starts a rollout over the instances attached to the group.
+
+    Instances in RESTART_REQUIRED are restarted, and so are ACTIVE ones
+    when restart_active is set, as Trove may not have flagged them yet
+    right after a change that needs a restart. Any other instance, e.g.
+    one that is building or failed, is skipped but still listed.
+    """
+    instances = []
+    marker = None
+    while True:
+        page = api.trove.configuration_instances(request, configuration_id,
+                                                 marker=marker)
+        instances.extend(page)
+        marker = page.next
+        if not marker:
+            break
+
+    # the instances of a configuration group only carry their id and name
+    results = utils.call_parallel(
+        lambda instance: api.trove.instance_get(request, instance.id),
+        instances)
+    restart_statuses = ['RESTART_REQUIRED']
+    if restart_active:
+        restart_statuses.append('ACTIVE')
+
+    rollout_instances = []
+    for instance, (result, error) in zip(instances, results):
+        status = getattr(result, 'status', None)
+        rollout_instances.append({
+            'id': instance.id,
+            'name': instance.name,
+            'state': PENDING if status in restart_statuses else SKIPPED,
+            'status': status,
+        })
+    rollout = {
+        'wave_size': wave_size or RESTART_WAVE_SIZE,
+        'wave_started': None,
+        'instances': rollout_instances,
+    }
+    version = drafts.load(request, DRAFT_KIND, configuration_id)[1]
+    drafts.save(request, DRAFT_KIND, configuration_id, rollout, version)
+    return rollout
+
+
+def get(request, configuration_id):
+    return drafts.load(request, DRAFT_KIND, configuration_id)[0]
+
+
+def is_finished(rollout):
+    return all(instance['state'] in (DONE, FAILED, SKIPPED)
+               for instance in rollout['instances'])
+
+
+def _in_state(rollout, state):
+    return [instance for instance in rollout['instances']
+            if instance['state'] == state]
+
+
+def advance(request, configuration_id):
+    """Moves the rollout on and returns it.
+
+    Checks the instances of the current wave and, once they are all done,
+    restarts the next wave. The rollout is discarded once it is finished.
+    """
+    rollout = _advance(request, configuration_id)
+    if rollout is not None and is_finished(rollout):
+        discard(request, configuration_id)
+    return rollout
+
+
+def _advance(request, configuration_id):
+    rollout = get(request, configuration_id)
+    if rollout is None:
+        return None
+
+    restarting = _in_state(rollout, RESTARTING)
+    if restarting:
+        results = utils.call_parallel(
+            lambda instance: api.trove.instance_get(request, instance['id']),
+            restarting)
+        statuses = dict((instance['id'], result.status)
+                        for instance, (result, error)
+                        in zip(restarting, results) if error is None)
+        # instances deleted during the rollout will never be back
+        missing = set(instance['id'] for instance, (result, error)
+                      in zip(restarting, results)
+                      if isinstance(error, trove_exceptions.NotFound))
+
+        def check_wave(rollout):
+            timed_out = (rollout['wave_started'] and
+                         time.time() - rollout['wave_started'] >
+                         RESTART_WAVE_TIMEOUT)
+            for instance in _in_state(rollout, RESTARTING):
+                if instance['id'] in missing:
+                    instance['state'] = FAILED
+                    continue
+                status = statuses.get(instance['id'], instance['status'])
+                instance['status'] = status
+                if status == 'ACTIVE':
+                    instance['state'] = DONE
+                elif status in FAILED_STATES or timed_out:
+                    instance['state'] = FAILED
+
+        rollout = _update(request, configuration_id, check_wave)[0]
+        if rollout is None or _in_state(rollout, RESTARTING):
+            return rollout
+
+    def start_wave(rollout):
+        # another request may have started the wave in the meantime
+        if _in_state(rollout, RESTARTING):
+            return []
+        wave = _in_state(rollout, PENDING)[:rollout['wave_size']]
+        for instance in wave:
+            instance['state'] = RESTARTING
+        rollout['wave_started'] = time.time()
+        return [instance['id'] for instance in wave]
+
+    rollout, wave = _update(request, configuration_id, start_wave)
+    if not wave:
+        return rollout
+
+    results = utils.call_parallel(
+        lambda instance_id: api.trove.instance_restart(request, instance_id),
+        wave)
+    failed = set(instance_id for instance_id, (result, error)
+                 in zip(wave, results) if error is not None)
+    if not failed:
+        return rollout
+
+    def mark_failed(rollout):
+        for instance in rollout['instances']:
+            if instance['id'] in failed:
+                instance['state'] = FAILED
+
+    return _update(request, configuration_id, mark_failed)[0]
+
+
+def discard(request, configuration_id):
+    drafts.delete(request, DRAFT_KIND, configuration_id)
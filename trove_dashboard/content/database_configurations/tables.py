@@ -18,9 +18,11 @@ import types
 from django.core import exceptions as core_exceptions
 from django.core import urlresolvers
 from django import shortcuts
+from django.utils import http
 from django.utils.translation import ugettext_lazy as _
 from django.utils.translation import ungettext_lazy
 
+from horizon import exceptions
 from horizon import forms
 from horizon import messages
 from horizon import tables
@@ -29,6 +31,9 @@ from horizon.utils import memoized
 from trove_dashboard import api
 from trove_dashboard.content.database_configurations \
     import config_param_manager
+from trove_dashboard.content.database_configurations \
+    import rolling_restart
+from trove_dashboard.content import drafts
 
 LOG = logging.getLogger(__name__)
 
@@ -45,10 +50,39 @@ class DeleteConfiguration(tables.DeleteAction):
     data_type_singular = _("Configuration Group")
     data_type_plural = _("Configuration Groups")
 
+    def allowed(self, request, configuration=None):
+        # groups attached to instances cannot be deleted
+        if configuration:
+            return not getattr(configuration, 'instances_in_use', None)
+        return True
+
     def delete(self, request, obj_id):
         api.trove.configuration_delete(request, obj_id)
 
 
+class ExportConfiguration(tables.LinkAction):
+    name = "export_json"
+    verbose_name = _("Export as JSON")
+    url = "horizon:project:database_configurations:export"
+    icon = "download"
+    export_format = "json"
+
+    def get_link_url(self, datum=None):
+        if datum:
+            configuration_id = datum.id
+        else:
+            configuration_id = self.table.kwargs['configuration_id']
+        return "%s?%s" % (
+            urlresolvers.reverse(self.url, args=[configuration_id]),
+            http.urlencode({'format': self.export_format}))
+
+
+class ExportConfigurationINI(ExportConfiguration):
+    name = "export_ini"
+    verbose_name = _("Export as INI")
+    export_format = "ini"
+
+
 class ConfigurationsTable(tables.DataTable):
     name = tables.Column(
         'name',
@@ -63,12 +97,17 @@ class ConfigurationsTable(tables.DataTable):
     datastore_version = tables.Column(
         'datastore_version_name',
         verbose_name=_('Datastore Version'))
+    instances_in_use = tables.Column(
+        lambda obj: getattr(obj, 'instances_in_use', None),
+        verbose_name=_('Instances'),
+        empty_value="-")
 
     class Meta(object):
         name = "configurations"
         verbose_name = _("Configuration Groups")
         table_actions = [CreateConfiguration, DeleteConfiguration]
-        row_actions = [DeleteConfiguration]
+        row_actions = [ExportConfiguration, ExportConfigurationINI,
+                       DeleteConfiguration]
 
 
 class AddParameter(tables.LinkAction):
@@ -83,6 +122,18 @@ class AddParameter(tables.LinkAction):
         return urlresolvers.reverse(self.url, args=[configuration_id])
 
 
+class ImportParameters(tables.LinkAction):
+    name = "import_parameters"
+    verbose_name = _("Import Parameters")
+    url = "horizon:project:database_configurations:import"
+    classes = ('ajax-modal', )
+    icon = "upload"
+
+    def get_link_url(self, datum=None):
+        configuration_id = self.table.kwargs['configuration_id']
+        return urlresolvers.reverse(self.url, args=[configuration_id])
+
+
 class ApplyChanges(tables.Action):
     name = "apply_changes"
     verbose_name = _("Apply Changes")
@@ -95,21 +146,64 @@ class ApplyChanges(tables.Action):
 
     def handle(self, table, request, obj_ids):
         configuration_id = table.kwargs['configuration_id']
-        if config_param_manager.get(request, configuration_id).has_changes():
+        manager = config_param_manager.get(request, configuration_id)
+        if manager.has_changes():
             try:
-                api.trove.configuration_update(
-                    request, configuration_id,
-                    config_param_manager.get(
-                        request, configuration_id).to_json())
+                manager.apply_changes(request)
                 messages.success(request, _('Applied changes to server'))
             except Exception:
                 messages.error(request, _('Error applying changes'))
             finally:
-                config_param_manager.delete(configuration_id)
+                config_param_manager.delete(request, configuration_id)
 
         return shortcuts.redirect(request.build_absolute_uri())
 
 
+class ApplyAndRestart(tables.Action):
+    name = "apply_and_restart"
+    verbose_name = _("Apply and Restart Instances")
+    verbose_name_plural = _("Apply and Restart Instances")
+    help_text = _("The instances attached to the configuration group that "
+                  "need a restart are restarted a few at a time from the "
+                  "restart progress "
+                  "page. The restarts only move on while that page is "
+                  "open, nothing progresses once it is closed.")
+    classes = ('btn-danger',)
+    icon = "refresh"
+
+    def __init__(self, **kwargs):
+        super(ApplyAndRestart, self).__init__(**kwargs)
+        self.requires_input = False
+
+    def handle(self, table, request, obj_ids):
+        configuration_id = table.kwargs['configuration_id']
+        redirect = request.build_absolute_uri()
+        manager = config_param_manager.get(request, configuration_id)
+        restart_active = False
+        if manager.has_changes():
+            try:
+                restart_active = manager.changes_require_restart(request)
+                manager.apply_changes(request)
+            except Exception:
+                exceptions.handle(request, _('Error applying changes'),
+                                  redirect=redirect)
+            config_param_manager.delete(request, configuration_id)
+            messages.success(request, _('Applied changes to server'))
+
+        try:
+            rolling_restart.start(request, configuration_id,
+                                  restart_active=restart_active)
+        except Exception:
+            exceptions.handle(request,
+                              _('Unable to restart the instances of the '
+                                'configuration group.'),
+                              redirect=redirect)
+
+        return shortcuts.redirect(urlresolvers.reverse(
+            "horizon:project:database_configurations:restart",
+            args=[configuration_id]))
+
+
 class DiscardChanges(tables.Action):
     name = "discard_changes"
     verbose_name = _("Discard Changes")
@@ -123,7 +217,7 @@ class DiscardChanges(tables.Action):
         configuration_id = table.kwargs['configuration_id']
         if config_param_manager.get(request, configuration_id).has_changes():
             try:
-                config_param_manager.delete(configuration_id)
+                config_param_manager.delete(request, configuration_id)
                 messages.success(request, _('Reset Parameters'))
             except Exception as ex:
                 messages.error(
@@ -141,7 +235,7 @@ class DeleteParameter(tables.DeleteAction):
         configuration_id = self.table.kwargs['configuration_id']
         (config_param_manager
             .get(request, configuration_id)
-            .delete_param(obj_ids))
+            .delete_param(request, obj_ids))
 
 
 class UpdateRow(tables.Row):
@@ -157,18 +251,15 @@ class UpdateCell(tables.UpdateAction):
 
         config = config_param_manager.get(request,
                                           config_param.configuration_id)
-        validation_param = config_param_manager.find_parameter(
-            name,
-            self.parameters(request,
-                            config.configuration.datastore_name,
-                            config.configuration.datastore_version_name))
-        if validation_param:
-            error_msg = config_param_manager.validate_config_param_value(
-                validation_param, new_cell_value)
+        catalog = self.parameter_catalog(
+            request,
+            config.configuration.datastore_name,
+            config.configuration.datastore_version_name)
+        if catalog.get(name):
+            value, error_msg = catalog.validate(name, new_cell_value)
             if error_msg:
                 raise core_exceptions.ValidationError(error_msg)
-
-        if isinstance(config_param.value, types.IntType):
+        elif isinstance(config_param.value, types.IntType):
             value = int(new_cell_value)
         elif isinstance(config_param.value, types.LongType):
             value = long(new_cell_value)
@@ -177,30 +268,22 @@ class UpdateCell(tables.UpdateAction):
 
         setattr(datum, cell_name, value)
 
-        (config_param_manager
-            .get(request, config_param.configuration_id)
-            .update_param(name, value))
+        try:
+            (config_param_manager
+                .get(request, config_param.configuration_id)
+                .update_param(request, name, value))
+        except drafts.DraftConflict:
+            raise core_exceptions.ValidationError(
+                _('The parameters were changed in another window. Reload '
+                  'the page and try again.'))
 
         return True
 
     @memoized.memoized_method
-    def parameters(self, request, datastore, datastore_version):
-        return api.trove.configuration_parameters_list(
+    def parameter_catalog(self, request, datastore, datastore_version):
+        return config_param_manager.get_parameter_catalog(
             request, datastore, datastore_version)
 
-    def _adjust_type(self, data_type, value):
-        if not value:
-            return value
-        if data_type == "float":
-            new_value = float(value)
-        elif data_type == "long":
-            new_value = long(value)
-        elif data_type == "integer":
-            new_value = int(value)
-        else:
-            new_value = value
-        return new_value
-
 
 class ValuesTable(tables.DataTable):
     name = tables.Column("name", verbose_name=_("Name"))
@@ -211,8 +294,10 @@ class ValuesTable(tables.DataTable):
     class Meta(object):
         name = "values"
         verbose_name = _("Configuration Group Values")
-        table_actions = [ApplyChanges, DiscardChanges,
-                         AddParameter, DeleteParameter]
+        table_actions = [ApplyChanges, ApplyAndRestart, DiscardChanges,
+                         AddParameter, ImportParameters,
+                         ExportConfiguration, ExportConfigurationINI,
+                         DeleteParameter]
         row_class = UpdateRow
         row_actions = [DeleteParameter]
 
@@ -254,3 +339,32 @@ class InstancesTable(tables.DataTable):
         verbose_name = _("Configuration Group Instances")
         multi_select = False
         row_actions = [DetachConfiguration]
+
+
+def get_restart_state(instance):
+    return {
+        rolling_restart.PENDING: _("Waiting"),
+        rolling_restart.RESTARTING: _("Restarting"),
+        rolling_restart.DONE: _("Restarted"),
+        rolling_restart.FAILED: _("Failed"),
+        rolling_restart.SKIPPED: _("Skipped"),
+    }.get(instance['state'], instance['state'])
+
+
+class RestartProgressTable(tables.DataTable):
+    name = tables.Column("name",
+                         link="horizon:project:databases:detail",
+                         verbose_name=_("Name"))
+    state = tables.Column(get_restart_state,
+                          verbose_name=_("Restart"))
+    status = tables.Column("status",
+                           verbose_name=_("Status"),
+                           empty_value="-")
+
+    class Meta(object):
+        name = "restart_progress"
+        verbose_name = _("Instance Restarts")
+        multi_select = False
+
+    def get_object_id(self, datum):
+        return datum['id']
@@ -44,10 +44,27 @@ class ValuesTab(tabs.TableTab):
         manager = config_param_manager.get(
             self.request, self.tab_group.kwargs['configuration_id'])
         for k, v in manager.get_configuration().values.items():
-            manager.add_param(k, v)
             values_data.append(manager.create_config_value(k, v))
         return values_data
 
+    def get_context_data(self, request, **kwargs):
+        context = super(ValuesTab, self).get_context_data(request, **kwargs)
+        manager = config_param_manager.get(
+            request, self.tab_group.kwargs['configuration_id'])
+        original = manager.original_configuration_values
+        added, changed, removed = manager.get_changes()
+        changes = []
+        for name, value in added.items():
+            changes.append({'name': name, 'new': value})
+        for name, value in changed.items():
+            changes.append({'name': name, 'old': original[name],
+                            'new': value})
+        for name in removed:
+            changes.append({'name': name, 'old': original[name],
+                            'removed': True})
+        context['changes'] = sorted(changes, key=lambda c: c['name'])
+        return context
+
 
 class InstancesTab(tabs.TableTab):
     table_classes = [tables.InstancesTable]
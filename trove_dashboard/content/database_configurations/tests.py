@@ -15,13 +15,21 @@
 import copy
 import logging
 
+from django.core.files import uploadedfile
 from django.core.urlresolvers import reverse
 from django import http
+from mox3 import mox
 from mox3.mox import IsA  # noqa
+from oslo_serialization import jsonutils
+from troveclient import common
+from troveclient import exceptions as trove_exceptions
 
 from trove_dashboard import api
 from trove_dashboard.content.database_configurations \
     import config_param_manager
+from trove_dashboard.content.database_configurations \
+    import rolling_restart
+from trove_dashboard.content import drafts
 from trove_dashboard.test import helpers as test
 
 
@@ -29,18 +37,50 @@ INDEX_URL = reverse('horizon:project:database_configurations:index')
 CREATE_URL = reverse('horizon:project:database_configurations:create')
 DETAIL_URL = 'horizon:project:database_configurations:detail'
 ADD_URL = 'horizon:project:database_configurations:add'
+IMPORT_URL = 'horizon:project:database_configurations:import'
+EXPORT_URL = 'horizon:project:database_configurations:export'
+RESTART_URL = 'horizon:project:database_configurations:restart'
+ADVANCE_RESTART_URL = \
+    'horizon:project:database_configurations:advance_restart'
 
 
 class DatabaseConfigurationsTests(test.TestCase):
-    @test.create_stubs({api.trove: ('configuration_list',)})
+    @test.create_stubs({api.trove: ('configuration_list',
+                                    'configuration_usage')})
     def test_index(self):
+        config = self.database_configurations.first()
         api.trove.configuration_list(IsA(http.HttpRequest)) \
             .AndReturn(self.database_configurations.list())
+        api.trove.configuration_usage(IsA(http.HttpRequest)) \
+            .AndReturn({config.id: [self.databases.first().id]})
         self.mox.ReplayAll()
         res = self.client.get(INDEX_URL)
         self.assertTemplateUsed(res,
                                 'project/database_configurations/index.html')
 
+        table = res.context['table']
+        self.assertEqual([1, 0], [configuration.instances_in_use
+                                  for configuration in table.data])
+        # only the unused group can be deleted
+        delete = table.base_actions['delete']
+        self.assertEqual([False, True],
+                         [delete.allowed(res.wsgi_request, configuration)
+                          for configuration in table.data])
+
+    @test.create_stubs({api.trove: ('instance_list',)})
+    def test_configuration_usage(self):
+        instances = common.Paginated(self.databases.list())
+        api.trove.instance_list(IsA(http.HttpRequest), marker=None) \
+            .AndReturn(instances)
+        self.mox.ReplayAll()
+
+        api.trove.instance_index_invalidate(self.request)
+        usage = api.trove.configuration_usage(self.request)
+        self.assertEqual(
+            sorted(instance.id for instance in self.databases.list()
+                   if getattr(instance, 'configuration', None)),
+            sorted(sum(usage.values(), [])))
+
     @test.create_stubs({api.trove: ('configuration_list',)})
     def test_index_exception(self):
         api.trove.configuration_list(IsA(http.HttpRequest)) \
@@ -192,16 +232,17 @@ class DatabaseConfigurationsTests(test.TestCase):
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
     @test.create_stubs({
-        api.trove: ('configuration_get', 'configuration_parameters_list',),
-        config_param_manager.ConfigParamManager:
-            ('get_configuration', 'configuration_get',)})
+        api.trove: ('configuration_parameters_list',),
+        config_param_manager: ('get',)})
     def test_add_parameter(self):
-        config = config_param_manager.ConfigParamManager.get_configuration() \
-            .AndReturn(self.database_configurations.first())
+        config = self.database_configurations.first()
+        config_param_mgr = config_param_manager.ConfigParamManager(config.id)
+        config_param_mgr.configuration = config
+        config_param_mgr.original_configuration_values = \
+            dict.copy(config.values)
 
-        config_param_manager.ConfigParamManager \
-            .configuration_get(IsA(http.HttpRequest)) \
-            .AndReturn(config)
+        config_param_manager.get(IsA(http.HttpRequest), 'id') \
+            .AndReturn(config_param_mgr)
         ds = self._get_test_datastore('mysql')
         dsv = self._get_test_datastore_version(ds.id, '5.5')
         api.trove.configuration_parameters_list(
@@ -215,18 +256,19 @@ class DatabaseConfigurationsTests(test.TestCase):
             res, 'project/database_configurations/add_parameter.html')
 
     @test.create_stubs({
-        api.trove: ('configuration_get', 'configuration_parameters_list',),
-        config_param_manager.ConfigParamManager:
-            ('get_configuration', 'configuration_get',)})
+        api.trove: ('configuration_parameters_list',),
+        config_param_manager: ('get',)})
     def test_add_parameter_exception_on_parameters(self):
         try:
-            config = (config_param_manager.ConfigParamManager
-                      .get_configuration()
-                      .AndReturn(self.database_configurations.first()))
+            config = self.database_configurations.first()
+            config_param_mgr = config_param_manager.ConfigParamManager(
+                config.id)
+            config_param_mgr.configuration = config
+            config_param_mgr.original_configuration_values = \
+                dict.copy(config.values)
 
-            config_param_manager.ConfigParamManager \
-                .configuration_get(IsA(http.HttpRequest)) \
-                .AndReturn(config)
+            config_param_manager.get(IsA(http.HttpRequest), config.id) \
+                .AndReturn(config_param_mgr)
 
             ds = self._get_test_datastore('mysql')
             dsv = self._get_test_datastore_version(ds.id, '5.5')
@@ -256,20 +298,23 @@ class DatabaseConfigurationsTests(test.TestCase):
                 for (log, level) in loggers:
                     log.setLevel(level)
         finally:
-            config_param_manager.delete(config.id)
+            config_param_manager.delete(self.request, config.id)
 
     @test.create_stubs({
-        api.trove: ('configuration_get', 'configuration_parameters_list',),
-        config_param_manager.ConfigParamManager:
-            ('get_configuration', 'add_param', 'configuration_get',)})
+        api.trove: ('configuration_parameters_list',),
+        config_param_manager: ('get',),
+        config_param_manager.ConfigParamManager: ('add_param',)})
     def test_add_new_parameter(self):
-        config = (config_param_manager.ConfigParamManager
-                  .get_configuration()
-                  .AndReturn(self.database_configurations.first()))
+        config = self.database_configurations.first()
         try:
-            config_param_manager.ConfigParamManager \
-                .configuration_get(IsA(http.HttpRequest)) \
-                .AndReturn(config)
+            config_param_mgr = config_param_manager.ConfigParamManager(
+                config.id)
+            config_param_mgr.configuration = config
+            config_param_mgr.original_configuration_values = \
+                dict.copy(config.values)
+
+            config_param_manager.get(IsA(http.HttpRequest), config.id) \
+                .MultipleTimes().AndReturn(config_param_mgr)
 
             ds = self._get_test_datastore('mysql')
             dsv = self._get_test_datastore_version(ds.id, '5.5')
@@ -282,8 +327,8 @@ class DatabaseConfigurationsTests(test.TestCase):
             name = self.configuration_parameters.first().name
             value = 1
 
-            config_param_manager.ConfigParamManager.add_param(name, value) \
-                .AndReturn(value)
+            config_param_manager.ConfigParamManager.add_param(
+                IsA(http.HttpRequest), name, value).AndReturn(value)
 
             self.mox.ReplayAll()
             post = {
@@ -296,7 +341,7 @@ class DatabaseConfigurationsTests(test.TestCase):
             self.assertNoFormErrors(res)
             self.assertMessageCount(success=1)
         finally:
-            config_param_manager.delete(config.id)
+            config_param_manager.delete(self.request, config.id)
 
     @test.create_stubs({
         api.trove: ('configuration_get', 'configuration_parameters_list',),
@@ -337,7 +382,7 @@ class DatabaseConfigurationsTests(test.TestCase):
             self.assertFormError(res, "form", 'value',
                                  ['Value must be a number.'])
         finally:
-            config_param_manager.delete(config.id)
+            config_param_manager.delete(self.request, config.id)
 
     @test.create_stubs({api.trove: ('configuration_get',)})
     def test_values_tab_discard_action(self):
@@ -399,6 +444,253 @@ class DatabaseConfigurationsTests(test.TestCase):
         res = self.client.post(url, {'action': u"values__apply_changes"})
         self.assertRedirectsNoFollow(res, url)
 
+    @test.create_stubs({api.trove: ('configuration_edit',),
+                        config_param_manager: ('get',)})
+    def test_values_tab_apply_action_edit(self):
+        config = copy.deepcopy(self.database_configurations.first())
+
+        # setup the configuration parameter manager
+        config_param_mgr = config_param_manager.ConfigParamManager(
+            config.id)
+        config_param_mgr.configuration = config
+        config_param_mgr.original_configuration_values = \
+            dict.copy(config.values)
+
+        # change one parameter and add another
+        name = sorted(config.values)[0]
+        config.values[name] = 'changed'
+        config.values['new_param'] = 1
+
+        config_param_manager.get(IsA(http.HttpRequest), config.id) \
+            .MultipleTimes().AndReturn(config_param_mgr)
+
+        # only the changed keys are sent, without replacing the group values
+        api.trove.configuration_edit(
+            IsA(http.HttpRequest),
+            config.id,
+            mox.Func(lambda values: jsonutils.loads(values) ==
+                     {name: 'changed', 'new_param': 1})) \
+            .AndReturn(None)
+        self.mox.ReplayAll()
+
+        details_url = self._get_url_with_arg(DETAIL_URL, config.id)
+        url = details_url + '?tab=configuration_details__value'
+
+        res = self.client.get(url)
+        self.assertContains(res, 'Add new_param = 1')
+
+        res = self.client.post(url, {'action': u"values__apply_changes"})
+        self.assertRedirectsNoFollow(res, url)
+
+    @test.create_stubs({
+        api.trove: ('configuration_parameters_list', 'configuration_edit'),
+        config_param_manager: ('get',)})
+    def test_import_parameters(self):
+        config = self.database_configurations.first()
+        config_param_mgr = config_param_manager.ConfigParamManager(config.id)
+        config_param_mgr.configuration = config
+        config_param_mgr.original_configuration_values = \
+            dict.copy(config.values)
+
+        config_param_manager.get(IsA(http.HttpRequest), config.id) \
+            .MultipleTimes().AndReturn(config_param_mgr)
+        api.trove.configuration_parameters_list(
+            IsA(http.HttpRequest), 'mysql', '5.5') \
+            .AndReturn(self.configuration_parameters.list())
+
+        # the file values are merged into the group in a single patch
+        values = {'connect_timeout': 20, 'autocommit': 0,
+                  'character_set_client': 'utf8'}
+        api.trove.configuration_edit(
+            IsA(http.HttpRequest), config.id,
+            mox.Func(lambda json: jsonutils.loads(json) == values))
+        self.mox.ReplayAll()
+
+        values_file = uploadedfile.SimpleUploadedFile(
+            'my.cnf',
+            b'!includedir /etc/mysql/conf.d/\n'
+            b'[client]\n'
+            b'port = 3307\n'
+            b'[mysqld]\n'
+            b'connect-timeout = 20\n'
+            b'autocommit = 0\n'
+            b'character_set_client = "utf8"\n'
+            b'skip-name-resolve\n')
+        post = {
+            'method': 'ImportParametersForm',
+            'values_file': values_file,
+            'file_format': 'ini'}
+        res = self.client.post(
+            self._get_url_with_arg(IMPORT_URL, config.id), post)
+        self.assertNoFormErrors(res)
+        # the flag without a value is reported as ignored
+        self.assertMessageCount(success=1, warning=1)
+
+    @test.create_stubs({
+        api.trove: ('configuration_parameters_list', 'configuration_update'),
+        config_param_manager: ('get',)})
+    def test_import_parameters_replace(self):
+        config = self.database_configurations.first()
+        config_param_mgr = config_param_manager.ConfigParamManager(config.id)
+        config_param_mgr.configuration = config
+        config_param_mgr.original_configuration_values = \
+            dict.copy(config.values)
+
+        config_param_manager.get(IsA(http.HttpRequest), config.id) \
+            .MultipleTimes().AndReturn(config_param_mgr)
+        api.trove.configuration_parameters_list(
+            IsA(http.HttpRequest), 'mysql', '5.5') \
+            .AndReturn(self.configuration_parameters.list())
+
+        # the file values replace all the values of the group
+        api.trove.configuration_update(
+            IsA(http.HttpRequest), config.id,
+            mox.Func(lambda json: jsonutils.loads(json) ==
+                     {'connect_timeout': 20}))
+        self.mox.ReplayAll()
+
+        values_file = uploadedfile.SimpleUploadedFile(
+            'values.json', b'{"connect_timeout": 20}')
+        post = {
+            'method': 'ImportParametersForm',
+            'values_file': values_file,
+            'file_format': 'json',
+            'replace': True}
+        res = self.client.post(
+            self._get_url_with_arg(IMPORT_URL, config.id), post)
+        self.assertNoFormErrors(res)
+        self.assertMessageCount(success=1)
+
+    @test.create_stubs({
+        api.trove: ('configuration_parameters_list',),
+        config_param_manager: ('get',)})
+    def test_import_parameters_invalid(self):
+        config = self.database_configurations.first()
+        config_param_mgr = config_param_manager.ConfigParamManager(config.id)
+        config_param_mgr.configuration = config
+        config_param_mgr.original_configuration_values = \
+            dict.copy(config.values)
+
+        config_param_manager.get(IsA(http.HttpRequest), config.id) \
+            .MultipleTimes().AndReturn(config_param_mgr)
+        api.trove.configuration_parameters_list(
+            IsA(http.HttpRequest), 'mysql', '5.5') \
+            .AndReturn(self.configuration_parameters.list())
+        self.mox.ReplayAll()
+
+        values_file = uploadedfile.SimpleUploadedFile(
+            'values.json',
+            b'{"connect_timeout": 0, "autocommit": "yes", "unknown": 1}')
+        post = {
+            'method': 'ImportParametersForm',
+            'values_file': values_file,
+            'file_format': 'json'}
+        res = self.client.post(
+            self._get_url_with_arg(IMPORT_URL, config.id), post)
+
+        # all the errors are reported at once
+        self.assertFormError(
+            res, "form", 'values_file',
+            ['autocommit: Value must be a number.',
+             'connect_timeout: Value must be a number between 1 and 65535.',
+             'unknown: Unknown parameter.'])
+
+    @test.create_stubs({api.trove: ('configuration_get',)})
+    def test_export_configuration(self):
+        config = self.database_configurations.first()
+        api.trove.configuration_get(IsA(http.HttpRequest), config.id) \
+            .MultipleTimes().AndReturn(config)
+        self.mox.ReplayAll()
+
+        url = self._get_url_with_arg(EXPORT_URL, config.id)
+
+        res = self.client.get(url, {'format': 'json'})
+        self.assertEqual(
+            {'values': config.values},
+            jsonutils.loads(b''.join(res.streaming_content)))
+
+        res = self.client.get(url, {'format': 'ini'})
+        self.assertEqual(
+            b'[mysqld]\n'
+            b'collation_server = latin1_swedish_ci\n'
+            b'max_connections = 6000\n',
+            b''.join(res.streaming_content))
+
+    def test_parameter_catalog(self):
+        catalog = config_param_manager.ParameterCatalog(
+            self.configuration_parameters.list())
+
+        self.assertEqual(
+            sorted(param.name
+                   for param in self.configuration_parameters.list()),
+            catalog.names())
+        self.assertEqual('connect_timeout',
+                         catalog.get('connect_timeout').name)
+        self.assertIsNone(catalog.get('no_such_parameter'))
+
+        self.assertEqual((10, None),
+                         catalog.validate('connect_timeout', '10'))
+        self.assertEqual('Value must be a number.',
+                         catalog.validate('connect_timeout', 'ten')[1])
+        self.assertEqual('Value must be a number between 1 and 65535.',
+                         catalog.validate('connect_timeout', '0')[1])
+        self.assertEqual(('ten', None),
+                         catalog.validate('no_such_parameter', 'ten'))
+
+    def test_parse_values(self):
+        content = (b'[client]\n'
+                   b'port = 3307\n'
+                   b'[mysqld]\n'
+                   b'max-connections = 100\n'
+                   b'skip-name-resolve\n'
+                   b'[mysqldump]\n'
+                   b'max_allowed_packet = 16M\n')
+
+        # only the datastore section is read, flags without a value are
+        # left out
+        self.assertEqual(
+            ({'max_connections': '100'}, ['skip_name_resolve']),
+            config_param_manager.parse_values(content, 'ini', 'mysqld'))
+        self.assertRaises(ValueError, config_param_manager.parse_values,
+                          content, 'ini', 'redis')
+
+        # a file with a single section is read whatever its name
+        self.assertEqual(
+            ({'port': '3307'}, []),
+            config_param_manager.parse_values(
+                b'[client]\nport = 3307\n', 'ini', 'mysqld'))
+
+    @test.create_stubs({api.trove: ('configuration_parameters_list',)})
+    def test_changes_require_restart(self):
+        config = copy.deepcopy(self.database_configurations.first())
+        api.trove.configuration_parameters_list(
+            IsA(http.HttpRequest), config.datastore_name,
+            config.datastore_version_name) \
+            .MultipleTimes() \
+            .AndReturn(self.configuration_parameters.list())
+        self.mox.ReplayAll()
+
+        manager = config_param_manager.ConfigParamManager(config.id)
+        manager.configuration = config
+        config.values = {}
+        manager.original_configuration_values = {}
+
+        # none of the known parameters needs a restart
+        manager.configuration.values['connect_timeout'] = 10
+        self.assertFalse(manager.changes_require_restart(self.request))
+
+        # unknown ones are taken to need one
+        manager.configuration.values['no_such_parameter'] = 1
+        self.assertTrue(manager.changes_require_restart(self.request))
+
+    def test_dict_diff(self):
+        original = {'a': 1, 'b': 2, 'c': 3}
+        other = {'a': 1, 'b': 4, 'd': 5}
+        self.assertEqual(({'d': 5}, {'b': 4}, ['c']),
+                         config_param_manager.dict_diff(original, other))
+        self.assertEqual(({}, {}, []),
+                         config_param_manager.dict_diff(original, original))
+
     @test.create_stubs({api.trove: ('configuration_update',),
                         config_param_manager: ('get',)})
     def test_values_tab_apply_action_exception(self):
@@ -431,6 +723,219 @@ class DatabaseConfigurationsTests(test.TestCase):
         self.assertRedirectsNoFollow(res, url)
         self.assertEqual(res.status_code, 302)
 
+    @test.create_stubs({api.trove: ('configuration_get',)})
+    def test_config_param_manager_draft(self):
+        config = self.database_configurations.first()
+
+        # the draft is only fetched from trove when it is started
+        api.trove.configuration_get(IsA(http.HttpRequest), config.id) \
+            .AndReturn(config)
+        self.mox.ReplayAll()
+
+        try:
+            manager = config_param_manager.get(self.request, config.id)
+            stale_manager = config_param_manager.get(self.request, config.id)
+            self.assertEqual(manager.version, stale_manager.version)
+
+            name = sorted(config.values)[0]
+            manager.delete_param(self.request, name)
+            draft = config_param_manager.get(self.request, config.id)
+            self.assertTrue(draft.has_changes())
+            self.assertNotIn(name, draft.get_configuration().values)
+
+            with self.assertRaises(drafts.DraftConflict):
+                stale_manager.update_param(self.request, name, 1)
+        finally:
+            config_param_manager.delete(self.request, config.id)
+
+    def _with_status(self, instance, status):
+        instance = copy.deepcopy(instance)
+        instance.status = status
+        return instance
+
+    @test.create_stubs({api.trove: ('configuration_instances',
+                                    'instance_get',
+                                    'instance_restart')})
+    def test_rolling_restart(self):
+        config = self.database_configurations.first()
+        first, second, third = self.databases.list()[:3]
+
+        # the attached instances are listed over two pages
+        api.trove.configuration_instances(IsA(http.HttpRequest), config.id,
+                                          marker=None) \
+            .AndReturn(common.Paginated([first], next_marker=first.id))
+        api.trove.configuration_instances(IsA(http.HttpRequest), config.id,
+                                          marker=first.id) \
+            .AndReturn(common.Paginated([second, third]))
+        api.trove.instance_get(IsA(http.HttpRequest), first.id) \
+            .AndReturn(self._with_status(first, 'RESTART_REQUIRED'))
+        api.trove.instance_get(IsA(http.HttpRequest), second.id) \
+            .AndReturn(self._with_status(second, 'ACTIVE'))
+        api.trove.instance_get(IsA(http.HttpRequest), third.id) \
+            .AndReturn(self._with_status(third, 'BUILD'))
+
+        api.trove.instance_restart(IsA(http.HttpRequest), first.id)
+        api.trove.instance_get(IsA(http.HttpRequest), first.id) \
+            .AndReturn(self._with_status(first, 'REBOOT'))
+        api.trove.instance_get(IsA(http.HttpRequest), first.id) \
+            .AndReturn(self._with_status(first, 'ACTIVE'))
+        api.trove.instance_restart(IsA(http.HttpRequest), second.id) \
+            .AndRaise(self.exceptions.trove)
+        self.mox.ReplayAll()
+
+        def states(rollout):
+            return [instance['state'] for instance in rollout['instances']]
+
+        try:
+            # ACTIVE instances are restarted as the change needs it, the
+            # building one cannot be
+            rollout = rolling_restart.start(self.request, config.id,
+                                            wave_size=1, restart_active=True)
+            self.assertEqual([first.id, second.id, third.id],
+                             [instance['id']
+                              for instance in rollout['instances']])
+            self.assertEqual([rolling_restart.PENDING,
+                              rolling_restart.PENDING,
+                              rolling_restart.SKIPPED], states(rollout))
+
+            rollout = rolling_restart.advance(self.request, config.id)
+            self.assertEqual([rolling_restart.RESTARTING,
+                              rolling_restart.PENDING,
+                              rolling_restart.SKIPPED], states(rollout))
+
+            # the next wave waits for the first instance to be active
+            rollout = rolling_restart.advance(self.request, config.id)
+            self.assertEqual([rolling_restart.RESTARTING,
+                              rolling_restart.PENDING,
+                              rolling_restart.SKIPPED], states(rollout))
+            self.assertFalse(rolling_restart.is_finished(rollout))
+
+            rollout = rolling_restart.advance(self.request, config.id)
+            self.assertEqual([rolling_restart.DONE,
+                              rolling_restart.FAILED,
+                              rolling_restart.SKIPPED], states(rollout))
+            self.assertTrue(rolling_restart.is_finished(rollout))
+            # a finished rollout is discarded
+            self.assertIsNone(rolling_restart.get(self.request, config.id))
+        finally:
+            rolling_restart.discard(self.request, config.id)
+
+    @test.create_stubs({api.trove: ('configuration_instances',
+                                    'instance_get',
+                                    'instance_restart')})
+    def test_rolling_restart_deleted_instance(self):
+        config = self.database_configurations.first()
+        first, second = self.databases.list()[:2]
+
+        api.trove.configuration_instances(IsA(http.HttpRequest), config.id,
+                                          marker=None) \
+            .AndReturn(common.Paginated([first, second]))
+        # only the instances flagged by Trove need a restart
+        api.trove.instance_get(IsA(http.HttpRequest), first.id) \
+            .AndReturn(self._with_status(first, 'RESTART_REQUIRED'))
+        api.trove.instance_get(IsA(http.HttpRequest), second.id) \
+            .AndReturn(self._with_status(second, 'ACTIVE'))
+        api.trove.instance_restart(IsA(http.HttpRequest), first.id)
+        # the instance is deleted while it restarts
+        api.trove.instance_get(IsA(http.HttpRequest), first.id) \
+            .AndRaise(trove_exceptions.NotFound(404))
+        self.mox.ReplayAll()
+
+        try:
+            rolling_restart.start(self.request, config.id)
+            rolling_restart.advance(self.request, config.id)
+            rollout = rolling_restart.advance(self.request, config.id)
+            self.assertEqual([rolling_restart.FAILED,
+                              rolling_restart.SKIPPED],
+                             [instance['state']
+                              for instance in rollout['instances']])
+            self.assertTrue(rolling_restart.is_finished(rollout))
+        finally:
+            rolling_restart.discard(self.request, config.id)
+
+    @test.create_stubs({api.trove: ('configuration_get',),
+                        rolling_restart: ('get',)})
+    def test_restart_progress(self):
+        config = self.database_configurations.first()
+        instance = self.configuration_instances.first()
+        rollout = {
+            'wave_size': 1,
+            'wave_started': None,
+            'instances': [{'id': instance.id,
+                           'name': instance.name,
+                           'state': rolling_restart.RESTARTING,
+                           'status': 'REBOOT'}],
+        }
+
+        # showing the page does not move the rollout on
+        rolling_restart.get(IsA(http.HttpRequest), config.id) \
+            .AndReturn(rollout)
+        api.trove.configuration_get(IsA(http.HttpRequest), config.id) \
+            .AndReturn(config)
+        self.mox.ReplayAll()
+
+        res = self.client.get(self._get_url_with_arg(RESTART_URL, config.id))
+        self.assertTemplateUsed(
+            res, 'project/database_configurations/restart_progress.html')
+        self.assertEqual(rollout['instances'], res.context['table'].data)
+        self.assertTrue(res.context['has_rollout'])
+        self.assertEqual(1, res.context['total'])
+        self.assertEqual(0, res.context['done'])
+
+    @test.create_stubs({rolling_restart: ('advance',)})
+    def test_advance_restart(self):
+        config = self.database_configurations.first()
+        instance = self.configuration_instances.first()
+        rollout = {
+            'wave_size': 1,
+            'wave_started': None,
+            'instances': [{'id': instance.id,
+                           'name': instance.name,
+                           'state': rolling_restart.DONE,
+                           'status': 'ACTIVE'}],
+        }
+
+        rolling_restart.advance(IsA(http.HttpRequest), config.id) \
+            .AndReturn(rollout)
+        rolling_restart.advance(IsA(http.HttpRequest), config.id) \
+            .AndRaise(self.exceptions.trove)
+        self.mox.ReplayAll()
+
+        url = self._get_url_with_arg(ADVANCE_RESTART_URL, config.id)
+        self.assertEqual(405, self.client.get(url).status_code)
+
+        res = self.client.post(url)
+        self.assertEqual({'finished': True}, jsonutils.loads(res.content))
+
+        res = self.client.post(url)
+        self.assertEqual(500, res.status_code)
+        self.assertIn('error', jsonutils.loads(res.content))
+
+    @test.create_stubs({config_param_manager: ('get',),
+                        rolling_restart: ('start',)})
+    def test_values_tab_apply_and_restart_start_error(self):
+        config = copy.deepcopy(self.database_configurations.first())
+        config_param_mgr = config_param_manager.ConfigParamManager(
+            config.id)
+        config_param_mgr.configuration = config
+        config_param_mgr.original_configuration_values = \
+            dict.copy(config.values)
+
+        config_param_manager.get(IsA(http.HttpRequest), config.id) \
+            .MultipleTimes().AndReturn(config_param_mgr)
+        rolling_restart.start(IsA(http.HttpRequest), config.id,
+                              restart_active=False) \
+            .AndRaise(self.exceptions.trove)
+        self.mox.ReplayAll()
+
+        details_url = self._get_url_with_arg(DETAIL_URL, config.id)
+        url = details_url + '?tab=configuration_details__value'
+
+        res = self.client.post(url,
+                               {'action': u"values__apply_and_restart"})
+        self.assertRedirectsNoFollow(res, url)
+        self.assertMessageCount(res, error=1)
+
     def _test_create_altered_config_params(self, config, url):
         # determine the number of configuration group parameters in the list
         res = self.client.get(url)
@@ -483,7 +988,7 @@ class DatabaseConfigurationsTests(test.TestCase):
             self.assertTemplateUsed(
                 res, 'project/database_configurations/details.html')
         finally:
-            config_param_manager.delete(config.id)
+            config_param_manager.delete(self.request, config.id)
 
     @test.create_stubs({api.trove: ('configuration_instances',),
                         config_param_manager: ('get',)})
@@ -516,7 +1021,7 @@ class DatabaseConfigurationsTests(test.TestCase):
             self.assertTemplateUsed(
                 res, 'project/database_configurations/details.html')
         finally:
-            config_param_manager.delete(config.id)
+            config_param_manager.delete(self.request, config.id)
 
     def _get_url_with_arg(self, url, arg):
         return reverse(url, args=[arg])
@@ -35,5 +35,17 @@ urlpatterns = patterns(
         name='detail'),
     url(CONFIGS % 'add',
         views.AddParameterView.as_view(),
-        name='add')
+        name='add'),
+    url(CONFIGS % 'import',
+        views.ImportParametersView.as_view(),
+        name='import'),
+    url(CONFIGS % 'export',
+        views.export_configuration,
+        name='export'),
+    url(CONFIGS % 'restart',
+        views.RestartProgressView.as_view(),
+        name='restart'),
+    url(CONFIGS % 'restart/advance',
+        views.advance_restart,
+        name='advance_restart')
 )
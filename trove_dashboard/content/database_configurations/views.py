@@ -12,12 +12,19 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import logging
+
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
+from django import http
 from django.utils.translation import ugettext_lazy as _
+from django.views.decorators.http import require_POST
+
+import six
 
 from horizon import exceptions
 from horizon import forms as horizon_forms
+from horizon import messages
 from horizon import tables as horizon_tables
 from horizon import tabs as horizon_tabs
 from horizon.utils import memoized
@@ -27,11 +34,15 @@ from trove_dashboard.content.database_configurations \
     import config_param_manager
 from trove_dashboard.content.database_configurations \
     import forms
+from trove_dashboard.content.database_configurations \
+    import rolling_restart
 from trove_dashboard.content.database_configurations \
     import tables
 from trove_dashboard.content.database_configurations \
     import tabs
 
+LOG = logging.getLogger(__name__)
+
 
 class IndexView(horizon_tables.DataTableView):
     table_class = tables.ConfigurationsTable
@@ -45,6 +56,17 @@ class IndexView(horizon_tables.DataTableView):
             configurations = []
             msg = _('Error getting configuration group list.')
             exceptions.handle(self.request, msg)
+            return configurations
+
+        try:
+            usage = api.trove.configuration_usage(self.request)
+        except Exception:
+            msg = _('Unable to retrieve configuration group usage.')
+            exceptions.handle(self.request, msg)
+            return configurations
+        for configuration in configurations:
+            configuration.instances_in_use = len(
+                usage.get(configuration.id, []))
         return configurations
 
 
@@ -119,3 +141,144 @@ class AddParameterView(horizon_forms.ModalFormView):
     def get_initial(self):
         configuration_id = self.kwargs['configuration_id']
         return {'configuration_id': configuration_id}
+
+
+class ImportParametersView(horizon_forms.ModalFormView):
+    form_class = forms.ImportParametersForm
+    form_id = "import_parameters_form"
+    modal_header = _("Import Parameters")
+    modal_id = "import_parameters_modal"
+    template_name = 'project/database_configurations/import_parameters.html'
+    submit_label = "Import Parameters"
+    submit_url = 'horizon:project:database_configurations:import'
+    success_url = 'horizon:project:database_configurations:detail'
+
+    def get_success_url(self):
+        return reverse(self.success_url,
+                       args=(self.kwargs['configuration_id'],))
+
+    def get_context_data(self, **kwargs):
+        context = super(ImportParametersView, self).get_context_data(
+            **kwargs)
+        context["configuration_id"] = self.kwargs['configuration_id']
+        args = (self.kwargs['configuration_id'],)
+        context['submit_url'] = reverse(self.submit_url, args=args)
+        return context
+
+    def get_initial(self):
+        configuration_id = self.kwargs['configuration_id']
+        return {'configuration_id': configuration_id}
+
+
+class RestartProgressView(horizon_tables.DataTableView):
+    table_class = tables.RestartProgressTable
+    template_name = 'project/database_configurations/restart_progress.html'
+    page_title = _("Restart Instances: {{configuration.name}}")
+
+    # seconds between two steps of the rollout while the page is open
+    refresh_interval = 10
+
+    @memoized.memoized_method
+    def get_rollout(self):
+        # Only shows the rollout, it is moved on by advance_restart.
+        return rolling_restart.get(self.request,
+                                   self.kwargs['configuration_id'])
+
+    def get_data(self):
+        rollout = self.get_rollout()
+        if rollout is None:
+            return []
+        return rollout['instances']
+
+    def get_context_data(self, **kwargs):
+        context = super(RestartProgressView, self).get_context_data(**kwargs)
+        configuration_id = self.kwargs['configuration_id']
+        try:
+            context['configuration'] = api.trove.configuration_get(
+                self.request, configuration_id)
+        except Exception:
+            redirect = reverse('horizon:project:database_configurations:index')
+            msg = _('Unable to retrieve details for configuration '
+                    'group: %s') % configuration_id
+            exceptions.handle(self.request, msg, redirect=redirect)
+
+        rollout = self.get_rollout()
+        context['has_rollout'] = rollout is not None
+        if rollout is not None:
+            instances = rollout['instances']
+            context['total'] = len(instances)
+            context['done'] = len([i for i in instances
+                                   if i['state'] == rolling_restart.DONE])
+            context['failed'] = len([i for i in instances
+                                     if i['state'] == rolling_restart.FAILED])
+            context['skipped'] = len(
+                [i for i in instances
+                 if i['state'] == rolling_restart.SKIPPED])
+            context['refresh_interval'] = self.refresh_interval
+        return context
+
+
+@require_POST
+def advance_restart(request, configuration_id):
+    """Moves the rolling restart of a configuration group on.
+
+    Posted by the restart progress page while it is open. Once the rollout
+    is finished, its outcome is left as a message for the next page.
+    """
+    try:
+        rollout = rolling_restart.advance(request, configuration_id)
+    except Exception:
+        LOG.exception('Unable to restart the instances of configuration '
+                      'group %s', configuration_id)
+        msg = _('Unable to restart the configuration group instances.')
+        return http.JsonResponse({'error': six.text_type(msg)}, status=500)
+
+    if rollout is None:
+        return http.JsonResponse({'finished': True})
+    finished = rolling_restart.is_finished(rollout)
+    if finished:
+        instances = rollout['instances']
+        failed = [instance['name'] for instance in instances
+                  if instance['state'] == rolling_restart.FAILED]
+        if failed:
+            messages.warning(request,
+                             _('Unable to restart instances: %s')
+                             % ', '.join(failed))
+        else:
+            done = [instance for instance in instances
+                    if instance['state'] == rolling_restart.DONE]
+            messages.success(request,
+                             _('Restarted %d instances.') % len(done))
+    return http.JsonResponse({'finished': finished})
+
+
+def export_configuration(request, configuration_id):
+    """Streams the values of a configuration group as a JSON or INI file."""
+    file_format = request.GET.get('format', 'json')
+    try:
+        configuration = api.trove.configuration_get(request,
+                                                    configuration_id)
+    except Exception:
+        redirect = reverse('horizon:project:database_configurations:index')
+        msg = _('Unable to retrieve details for configuration '
+                'group: %s') % configuration_id
+        exceptions.handle(request, msg, redirect=redirect)
+
+    if file_format == 'json':
+        content_type = 'application/json'
+        extension = 'json'
+        section = None
+    else:
+        content_type = 'text/plain'
+        extension = 'cnf'
+        section = config_param_manager.ini_section(
+            configuration.datastore_name)
+
+    response = http.StreamingHttpResponse(
+        config_param_manager.export_values(configuration.values,
+                                           file_format, section),
+        content_type=content_type)
+    response['Content-Disposition'] = (
+        'attachment; filename="%s.%s"' % (
+            configuration.name.encode('utf-8'), extension))
+    return response
@@ -13,11 +13,15 @@
 #    under the License.
 
 from django.core import urlresolvers
+from django import shortcuts
 # from django.template import defaultfilters as filters
 from django.utils.translation import ugettext_lazy as _
 
+from horizon import messages
 from horizon import tables
 
+from trove_dashboard import api
+
 
 def get_version_name(datastore):
     try:
@@ -31,6 +35,18 @@ def get_version_name(datastore):
     return _("Not available")
 
 
+class RefreshCatalog(tables.Action):
+    name = "refresh_catalog"
+    verbose_name = _("Refresh")
+    requires_input = False
+    icon = "refresh"
+
+    def handle(self, table, request, obj_ids):
+        api.trove.catalog_cache_invalidate(request)
+        messages.success(request, _("Refreshed datastore and flavor data."))
+        return shortcuts.redirect(request.build_absolute_uri())
+
+
 class DatastoresTable(tables.DataTable):
     name = tables.Column("name",
                          link="horizon:project:database_datastores:detail",
@@ -42,6 +58,7 @@ class DatastoresTable(tables.DataTable):
     class Meta(object):
         name = "datastores"
         verbose_name = _("Datastores")
+        table_actions = (RefreshCatalog,)
 
 
 def get_image_url(version):
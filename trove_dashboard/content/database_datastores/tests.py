@@ -12,8 +12,26 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from django.core.urlresolvers import reverse
+from django import http
+from mox3.mox import IsA  # noqa
+
+from trove_dashboard import api
 from trove_dashboard.test import helpers as test
 
+INDEX_URL = reverse('horizon:project:database_datastores:index')
+
 
 class DatastoresTests(test.TestCase):
-    pass
+    @test.create_stubs({api.trove: ('catalog_cache_invalidate',
+                                    'datastore_list')})
+    def test_refresh_catalog(self):
+        api.trove.catalog_cache_invalidate(IsA(http.HttpRequest))
+        api.trove.datastore_list(IsA(http.HttpRequest))\
+            .AndReturn(self.datastores.list())
+
+        self.mox.ReplayAll()
+
+        res = self.client.post(INDEX_URL,
+                               {'action': 'datastores__refresh_catalog'})
+        self.assertRedirectsNoFollow(res, INDEX_URL)
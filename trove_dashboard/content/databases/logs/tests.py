@@ -12,8 +12,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
 import logging
 
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django import http
 
@@ -361,3 +363,256 @@ class LogsTests(test.TestCase):
         res = self.client.get(url)
 
         self.assertContains(res, "Unable to load")
+
+    @test.create_stubs({api.trove: ('log_tail',)})
+    def test_full_log(self):
+        CONSOLE_OUTPUT = 'superspecialuniquetext'
+        (api.trove.log_tail(IsA(http.HttpRequest),
+                            IsA(six.string_types),
+                            'guest.log',
+                            False,
+                            0,
+                            self.stub_swiftclient())
+         .AndReturn(lambda: [CONSOLE_OUTPUT[:7], CONSOLE_OUTPUT[7:]]))
+
+        self.mox.ReplayAll()
+
+        url = reverse('horizon:project:databases:logs:full_log',
+                      args=('id', 'guest.log'))
+        res = self.client.get(url)
+
+        self.assertIsInstance(res, http.StreamingHttpResponse)
+        self.assertEqual(CONSOLE_OUTPUT, b''.join(res.streaming_content))
+
+    @test.create_stubs({api.trove: ('log_tail',)})
+    def test_download_log(self):
+        CONSOLE_OUTPUT = 'superspecialuniquetext'
+        (api.trove.log_tail(IsA(http.HttpRequest),
+                            IsA(six.string_types),
+                            'guest.log',
+                            False,
+                            0,
+                            self.stub_swiftclient())
+         .AndReturn(lambda: [CONSOLE_OUTPUT[:7], CONSOLE_OUTPUT[7:]]))
+
+        self.mox.ReplayAll()
+
+        url = reverse('horizon:project:databases:logs:download_log',
+                      args=('id', 'guest.log'))
+        res = self.client.get(url)
+
+        self.assertIsInstance(res, http.StreamingHttpResponse)
+        self.assertEqual('attachment; filename="guest.log.log"',
+                         res['Content-Disposition'])
+        self.assertEqual(CONSOLE_OUTPUT, b''.join(res.streaming_content))
+
+    @test.create_stubs({api.trove: ('log_follow',)})
+    def test_follow_log(self):
+        CONSOLE_OUTPUT = 'superspecialuniquetext'
+        (api.trove.log_follow(IsA(http.HttpRequest),
+                              IsA(six.string_types),
+                              'guest.log',
+                              self.stub_swiftclient(),
+                              offset=10,
+                              etag=None,
+                              publish=False)
+         .AndReturn((CONSOLE_OUTPUT, 32, '"etag"')))
+
+        self.mox.ReplayAll()
+
+        url = reverse('horizon:project:databases:logs:follow_log',
+                      args=('id', 'guest.log'))
+        res = self.client.get(url, {'offset': 10})
+
+        self.assertContains(res, CONSOLE_OUTPUT)
+        self.assertEqual('32', res['X-Log-Offset'])
+        self.assertEqual('"etag"', res['ETag'])
+
+    @test.create_stubs({api.trove: ('log_follow',)})
+    def test_follow_log_not_modified(self):
+        (api.trove.log_follow(IsA(http.HttpRequest),
+                              IsA(six.string_types),
+                              'guest.log',
+                              self.stub_swiftclient(),
+                              offset=32,
+                              etag='"etag"',
+                              publish=False)
+         .AndReturn(('', 32, '"etag"')))
+
+        self.mox.ReplayAll()
+
+        url = reverse('horizon:project:databases:logs:follow_log',
+                      args=('id', 'guest.log'))
+        res = self.client.get(url, {'offset': 32},
+                              HTTP_IF_NONE_MATCH='"etag"')
+
+        self.assertEqual(304, res.status_code)
+        self.assertEqual('32', res['X-Log-Offset'])
+
+    @test.create_stubs({api.trove: ('log_lines',)})
+    def test_log_range_lines(self):
+        (api.trove.log_lines(IsA(http.HttpRequest),
+                             IsA(six.string_types),
+                             'guest.log',
+                             self.stub_swiftclient(),
+                             5000000,
+                             2)
+         .AndReturn((['line one', 'line two'], 9000000)))
+
+        self.mox.ReplayAll()
+
+        url = reverse('horizon:project:databases:logs:log_range',
+                      args=('id', 'guest.log'))
+        res = self.client.get(url, {'start_line': 5000000, 'lines': 2})
+
+        self.assertEqual('line one\nline two\n', res.content)
+        self.assertEqual('9000000', res['X-Log-Total-Lines'])
+
+    @test.create_stubs({api.trove: ('log_bytes',)})
+    def test_log_range_bytes(self):
+        (api.trove.log_bytes(IsA(http.HttpRequest),
+                             IsA(six.string_types),
+                             'guest.log',
+                             self.stub_swiftclient(),
+                             100,
+                             8)
+         .AndReturn(('log text', 4096)))
+
+        self.mox.ReplayAll()
+
+        url = reverse('horizon:project:databases:logs:log_range',
+                      args=('id', 'guest.log'))
+        res = self.client.get(url, {'start_byte': 100, 'length': 8})
+
+        self.assertEqual('log text', res.content)
+        self.assertEqual('4096', res['X-Log-Total-Bytes'])
+
+    def _published_log(self, *contents):
+        """Returns a published log made of the given parts.
+
+        The Swift listing of the parts is expected on self.swiftclient.
+        """
+        cache.clear()
+        log = copy.deepcopy(self.logs.first())
+        log.prefix = 'guest/log-'
+        parts = [{'name': 'guest/log-%d' % i,
+                  'bytes': len(content),
+                  'hash': 'hash-%s' % content,
+                  'last_modified': '2016-01-01T00:00:%02d' % i}
+                 for i, content in enumerate(contents)]
+        self.swiftclient = self.mox.CreateMock(swift_client.Connection)
+        self.swiftclient.get_container(
+            log.container, prefix=log.prefix, full_listing=True) \
+            .AndReturn(({}, parts))
+        return log, parts
+
+    @test.create_stubs({api.trove: ('log_show',)})
+    def test_log_bytes_across_parts(self):
+        log, parts = self._published_log('line1\n', 'line2\n')
+        api.trove.log_show(IsA(http.HttpRequest), 'id', 'guest') \
+            .AndReturn(log)
+        self.swiftclient.get_object(
+            log.container, parts[0]['name'],
+            headers={'Range': 'bytes=4-5'}) \
+            .AndReturn(({'content-range': 'bytes 4-5/6'}, '1\n'))
+        # a part sent whole, without honouring the Range, is cut here
+        self.swiftclient.get_object(
+            log.container, parts[1]['name'],
+            headers={'Range': 'bytes=0-1'}) \
+            .AndReturn(({}, 'line2\n'))
+
+        self.mox.ReplayAll()
+
+        self.assertEqual(('1\nli', 12),
+                         api.trove.log_bytes(self.request, 'id', 'guest',
+                                             self.swiftclient, 4, 4))
+
+    @test.create_stubs({api.trove: ('log_show',)})
+    def test_log_lines_across_parts(self):
+        log, parts = self._published_log('one\ntw', 'o\nthree\n')
+        api.trove.log_show(IsA(http.HttpRequest), 'id', 'guest') \
+            .MultipleTimes().AndReturn(log)
+        # the first part has no line count and is counted in chunks
+        self.swiftclient.head_object(log.container, parts[0]['name']) \
+            .AndReturn({})
+        self.swiftclient.get_object(
+            log.container, parts[0]['name'],
+            resp_chunk_size=api.trove.LOG_CHUNK_SIZE) \
+            .AndReturn(({}, iter(['one\n', 'tw'])))
+        self.swiftclient.head_object(log.container, parts[1]['name']) \
+            .AndReturn({'x-object-meta-lines': '2'})
+        self.swiftclient.get_object(log.container, parts[0]['name']) \
+            .AndReturn(({}, 'one\ntw'))
+        self.swiftclient.get_object(log.container, parts[1]['name']) \
+            .AndReturn(({}, 'o\nthree\n'))
+        # the line counts are cached, only the window is read again
+        self.swiftclient.get_container(
+            log.container, prefix=log.prefix, full_listing=True) \
+            .AndReturn(({}, parts))
+        self.swiftclient.get_object(log.container, parts[1]['name']) \
+            .AndReturn(({}, 'o\nthree\n'))
+
+        self.mox.ReplayAll()
+
+        self.assertEqual((['two'], 3),
+                         api.trove.log_lines(self.request, 'id', 'guest',
+                                             self.swiftclient, 1, 1))
+        self.assertEqual((['three'], 3),
+                         api.trove.log_lines(self.request, 'id', 'guest',
+                                             self.swiftclient, 2, 5))
+
+    @test.create_stubs({api.trove: ('log_show',)})
+    def test_log_follow_from_offset(self):
+        log, parts = self._published_log('line1\n', 'line2\n')
+        api.trove.log_show(IsA(http.HttpRequest), 'id', 'guest') \
+            .AndReturn(log)
+        # only the rest of the part holding the offset is requested
+        self.swiftclient.get_object(
+            log.container, parts[1]['name'],
+            headers={'Range': 'bytes=2-5'}) \
+            .AndReturn(({'content-range': 'bytes 2-5/6'}, 'ne2\n'))
+
+        self.mox.ReplayAll()
+
+        data, end_offset, etag = api.trove.log_follow(
+            self.request, 'id', 'guest', self.swiftclient, offset=8)
+        self.assertEqual('ne2\n', data)
+        self.assertEqual(12, end_offset)
+
+    @test.create_stubs({api.trove: ('log_show',)})
+    def test_log_follow_no_new_data(self):
+        log, parts = self._published_log('line1\n', 'line2\n')
+        api.trove.log_show(IsA(http.HttpRequest), 'id', 'guest') \
+            .MultipleTimes().AndReturn(log)
+        self.swiftclient.get_container(
+            log.container, prefix=log.prefix, full_listing=True) \
+            .AndReturn(({}, parts))
+
+        self.mox.ReplayAll()
+
+        # an offset at the end of the last part reads nothing
+        data, end_offset, etag = api.trove.log_follow(
+            self.request, 'id', 'guest', self.swiftclient, offset=12)
+        self.assertEqual(('', 12), (data, end_offset))
+
+        # and neither does an unchanged log
+        self.assertEqual(('', 12, etag), api.trove.log_follow(
+            self.request, 'id', 'guest', self.swiftclient, offset=6,
+            etag=etag))
+
+    @test.create_stubs({api.trove: ('log_show',)})
+    def test_log_follow_truncated(self):
+        # the log was discarded and is shorter than the offset followed
+        log, parts = self._published_log('new\n')
+        api.trove.log_show(IsA(http.HttpRequest), 'id', 'guest') \
+            .AndReturn(log)
+        self.swiftclient.get_object(log.container, parts[0]['name'],
+                                    headers=None) \
+            .AndReturn(({}, 'new\n'))
+
+        self.mox.ReplayAll()
+
+        data, end_offset, etag = api.trove.log_follow(
+            self.request, 'id', 'guest', self.swiftclient, offset=12,
+            etag='"old"')
+        self.assertEqual(('new\n', 4), (data, end_offset))
@@ -27,6 +27,8 @@ urlpatterns = patterns(
     url(LOGS % 'console', 'console', name='console'),
     url(LOGS % 'download_log', 'download_log', name='download_log'),
     url(LOGS % 'full_log', 'full_log', name='full_log'),
+    url(LOGS % 'follow_log', 'follow_log', name='follow_log'),
+    url(LOGS % 'log_range', 'log_range', name='log_range'),
     url(LOGS % 'log_contents',
         views.LogContentsView.as_view(), name='log_contents'),
 )
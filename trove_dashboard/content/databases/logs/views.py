@@ -12,6 +12,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import itertools
+
 from django import http
 from django import shortcuts
 from django.utils.translation import ugettext_lazy as _
@@ -25,6 +27,7 @@ from trove_dashboard import api
 
 FULL_LOG_VALUE = 0
 DEFAULT_LINES = 50
+DEFAULT_BYTES = 65536
 
 
 class LogContentsView(generic.TemplateView):
@@ -59,14 +62,27 @@ def get_contents(request, instance_id, filename, publish, lines):
                                            publish,
                                            lines,
                                            dash_api.swift.swift_api(request))
-        data = ""
-        for log_part in log_generator():
-            data += log_part
+        data = "".join(log_generator())
     except Exception as e:
         data = _('Unable to load {0} log\n{1}').format(filename, e.message)
     return data
 
 
+def stream_contents(request, instance_id, filename, publish, lines):
+    """Yields the log chunk by chunk as it is read from Swift."""
+    try:
+        log_generator = api.trove.log_tail(request,
+                                           instance_id,
+                                           filename,
+                                           publish,
+                                           lines,
+                                           dash_api.swift.swift_api(request))
+        for log_part in log_generator():
+            yield log_part
+    except Exception as e:
+        yield _('Unable to load {0} log\n{1}').format(filename, e.message)
+
+
 def build_response(request, instance_id, filename, tail):
     data = (_('Unable to load {0} log for instance "{1}".')
             .format(filename, instance_id))
@@ -101,7 +117,98 @@ def console(request, instance_id, filename):
 
 
 def full_log(request, instance_id, filename):
-    return build_response(request, instance_id, filename, FULL_LOG_VALUE)
+    if request.GET.get('publish'):
+        publish = True
+    else:
+        publish = False
+
+    return http.StreamingHttpResponse(stream_contents(request,
+                                                      instance_id,
+                                                      filename,
+                                                      publish,
+                                                      FULL_LOG_VALUE),
+                                      content_type='text/plain')
+
+
+def follow_log(request, instance_id, filename):
+    """Returns the log bytes written after the offset given by the client.
+
+    The new end offset is sent back in the X-Log-Offset header. A client
+    that sends back the ETag of its previous poll gets a 304 when the
+    published log has not changed.
+    """
+    offset = request.GET.get('offset')
+    if offset is not None and not offset.isdigit():
+        return http.HttpResponseBadRequest(
+            _('Log offset must be a nonnegative integer.'))
+
+    if request.GET.get('publish'):
+        publish = True
+    else:
+        publish = False
+
+    etag = request.META.get('HTTP_IF_NONE_MATCH')
+    try:
+        data, end_offset, current_etag = api.trove.log_follow(
+            request,
+            instance_id,
+            filename,
+            dash_api.swift.swift_api(request),
+            offset=int(offset) if offset is not None else None,
+            etag=etag,
+            publish=publish)
+    except Exception as e:
+        data = _('Unable to load {0} log\n{1}').format(filename, e.message)
+        return http.HttpResponseServerError(data.encode('utf-8'),
+                                            content_type='text/plain')
+
+    if etag is not None and etag == current_etag:
+        response = http.HttpResponseNotModified()
+    else:
+        response = http.HttpResponse(data, content_type='text/plain')
+    response['ETag'] = current_etag
+    response['X-Log-Offset'] = str(end_offset)
+    return response
+
+
+def log_range(request, instance_id, filename):
+    """Returns a window of a published log.
+
+    The window is given either as start_line and lines or as start_byte
+    and length. The size of the whole log is sent back in the
+    X-Log-Total-Lines or X-Log-Total-Bytes header.
+    """
+    params = {}
+    for name in ('start_line', 'lines', 'start_byte', 'length'):
+        value = request.GET.get(name)
+        if value is not None:
+            if not value.isdigit():
+                return http.HttpResponseBadRequest(
+                    _('Log ranges must be nonnegative integers.'))
+            params[name] = int(value)
+
+    swift = dash_api.swift.swift_api(request)
+    try:
+        if 'start_byte' in params:
+            data, total = api.trove.log_bytes(
+                request, instance_id, filename, swift,
+                params['start_byte'], params.get('length', DEFAULT_BYTES))
+            total_header = 'X-Log-Total-Bytes'
+        else:
+            lines, total = api.trove.log_lines(
+                request, instance_id, filename, swift,
+                params.get('start_line', 0),
+                params.get('lines', DEFAULT_LINES))
+            data = "".join(line + "\n" for line in lines)
+            total_header = 'X-Log-Total-Lines'
+    except Exception as e:
+        data = _('Unable to load {0} log\n{1}').format(filename, e.message)
+        return http.HttpResponseServerError(data.encode('utf-8'),
+                                            content_type='text/plain')
+
+    response = http.HttpResponse(data, content_type='text/plain')
+    response[total_header] = str(total)
+    return response
 
 
 def download_log(request, instance_id, filename):
@@ -112,16 +219,21 @@ def download_log(request, instance_id, filename):
         else:
             publish = False
 
-        data = get_contents(request,
-                            instance_id,
-                            filename,
-                            publish,
-                            FULL_LOG_VALUE)
-        response = http.HttpResponse()
-        response.write(data)
+        log_generator = api.trove.log_tail(request,
+                                           instance_id,
+                                           filename,
+                                           publish,
+                                           FULL_LOG_VALUE,
+                                           dash_api.swift.swift_api(request))
+        # Read the first chunk up front so that a missing log is still
+        # reported before the download starts.
+        log_parts = iter(log_generator())
+        first_part = next(log_parts, '')
+        response = http.StreamingHttpResponse(
+            itertools.chain([first_part], log_parts),
+            content_type='text/plain')
         response['Content-Disposition'] = ('attachment; '
                                            'filename="%s.log"' % filename)
-        response['Content-Length'] = str(len(response.content))
         return response
 
     except Exception as e:
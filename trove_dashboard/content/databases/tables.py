@@ -15,6 +15,7 @@
 from django.conf import settings
 from django.core import urlresolvers
 from django.template import defaultfilters as d_filters
+from django.utils.http import urlencode
 from django.utils.translation import pgettext_lazy
 from django.utils.translation import ugettext_lazy as _
 from django.utils.translation import ungettext_lazy
@@ -244,6 +245,7 @@ class AccessTable(tables.DataTable):
         name = "access"
         verbose_name = _("Database Access")
         row_actions = (GrantAccess, RevokeAccess)
+        pagination_param = "databases_marker"
 
     def get_object_id(self, datum):
         return datum.name
@@ -493,8 +495,11 @@ class DisableRootAction(tables.Action):
     verbose_name = _("Disable Root")
 
     def allowed(self, request, instance):
-        enabled = api.trove.root_show(request, instance.id)
-        return enabled.rootEnabled
+        # Rows of the Manage Root table already carry the root status
+        enabled = getattr(instance, 'enabled', None)
+        if enabled is None:
+            enabled = api.trove.root_show(request, instance.id).rootEnabled
+        return enabled
 
     def single(self, table, request, object_id):
         try:
@@ -541,7 +546,7 @@ class UpdateRow(tables.Row):
     ajax = True
 
     def get_data(self, request, instance_id):
-        instance = api.trove.instance_get(request, instance_id)
+        instance = api.trove.instance_get_polled(request, instance_id)
         try:
             flavor_id = instance.flavor['id']
             instance.full_flavor = api.trove.flavor_get(request, flavor_id)
@@ -670,7 +675,20 @@ class InstancesTable(tables.DataTable):
                        DeleteInstance)
 
 
-class UsersTable(tables.DataTable):
+class TabPaginationMixin(object):
+    """Pages a table shown in a tab with the marker returned by Trove.
+
+    The "More" link keeps the tab of the table selected.
+    """
+    def get_pagination_string(self):
+        params = [(self._meta.pagination_param, self.data.next)]
+        tab = self.request.GET.get('tab')
+        if tab:
+            params.insert(0, ('tab', tab))
+        return urlencode(params)
+
+
+class UsersTable(TabPaginationMixin, tables.DataTable):
     name = tables.Column("name", verbose_name=_("User Name"))
     host = tables.Column("host", verbose_name=_("Allowed Host"))
     databases = tables.Column(get_databases, verbose_name=_("Databases"))
@@ -680,12 +698,13 @@ class UsersTable(tables.DataTable):
         verbose_name = _("Users")
         table_actions = [CreateUser, DeleteUser]
         row_actions = [EditUser, ManageAccess, DeleteUser]
+        pagination_param = "users_marker"
 
     def get_object_id(self, datum):
         return datum.name
 
 
-class DatabaseTable(tables.DataTable):
+class DatabaseTable(TabPaginationMixin, tables.DataTable):
     name = tables.Column("name", verbose_name=_("Database Name"))
 
     class Meta(object):
@@ -693,6 +712,7 @@ class DatabaseTable(tables.DataTable):
         verbose_name = _("Databases")
         table_actions = [CreateDatabase, DeleteDatabase]
         row_actions = [DeleteDatabase]
+        pagination_param = "databases_marker"
 
     def get_object_id(self, datum):
         return datum.name
@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from collections import OrderedDict
 import logging
 
 from django import template
@@ -25,6 +26,7 @@ from trove_dashboard.content.database_configurations \
 from trove_dashboard.content.databases import db_capability
 from trove_dashboard.content.databases.logs import tables as log_tables
 from trove_dashboard.content.databases import tables
+from trove_dashboard.content import utils
 from troveclient import exceptions as trove_exceptions
 
 
@@ -35,11 +37,16 @@ class OverviewTab(tabs.Tab):
     name = _("Overview")
     slug = "overview"
 
+    def get_prefetch_calls(self):
+        instance = self.tab_group.kwargs['instance']
+        return {'root_show': lambda: api.trove.root_show(self.request,
+                                                         instance.id)}
+
     def get_context_data(self, request):
         instance = self.tab_group.kwargs['instance']
         context = {"instance": instance}
         try:
-            root_show = api.trove.root_show(request, instance.id)
+            root_show = self.tab_group.get_prefetched(self, 'root_show')
             context["root_enabled"] = template.defaultfilters.yesno(
                 root_show.rootEnabled)
         except Exception:
@@ -78,34 +85,85 @@ class UserTab(tabs.TableTab):
     template_name = "horizon/common/_detail_table.html"
     preload = False
 
+    def get_prefetch_calls(self):
+        instance = self.tab_group.kwargs['instance']
+        marker = self.request.GET.get(
+            tables.UsersTable._meta.pagination_param)
+        return {'users_list': lambda: api.trove.users_list(
+            self.request, instance.id, marker=marker, paginate=True)}
+
     def get_users_data(self):
         instance = self.tab_group.kwargs['instance']
         try:
-            data = api.trove.users_list(self.request, instance.id)
+            data = self.tab_group.get_prefetched(self, 'users_list')
             for user in data:
                 user.instance = instance
-                try:
-                    user.access = api.trove.user_list_access(self.request,
-                                                             instance.id,
-                                                             user.name,
-                                                             host=user.host)
-                except exceptions.NOT_FOUND:
-                    pass
-                except trove_exceptions.BadRequest as e:
-                    if not ("The 'list_access' operation "
-                            "is not supported") in e.message:
-                        raise
-                    LOG.info("List user access is not available.  "
-                             "Reason: %s", e.message)
-                except Exception:
-                    msg = _('Unable to get user access data.')
-                    exceptions.handle(self.request, msg)
+            self._load_user_access(instance, data)
         except Exception:
             msg = _('Unable to get user data.')
             exceptions.handle(self.request, msg)
             data = []
         return data
 
+    def _load_user_access(self, instance, users):
+        supported = api.trove.operation_support_get(self.request,
+                                                    instance.datastore,
+                                                    'list_access')
+        if supported is False:
+            return
+
+        def list_access(user):
+            return api.trove.user_list_access(self.request,
+                                              instance.id,
+                                              user.name,
+                                              host=user.host)
+
+        if supported is None and users:
+            # Ask for a single user first, so that a datastore which does
+            # not support the operation costs one call instead of one per
+            # user.
+            probe, users = users[:1], users[1:]
+            results = utils.call_parallel(list_access, probe)
+            if not self._set_user_access(instance, probe, results):
+                return
+            if hasattr(probe[0], 'access'):
+                api.trove.operation_support_set(self.request,
+                                                instance.datastore,
+                                                'list_access', True)
+
+        results = utils.call_parallel(list_access, users)
+        self._set_user_access(instance, users, results)
+
+    def _set_user_access(self, instance, users, results):
+        """Sets the access of each user from the list_access results.
+
+        Returns False if the datastore does not support listing access.
+        """
+        for user, (access, error) in zip(users, results):
+            try:
+                if error is not None:
+                    raise error
+                user.access = access
+            except exceptions.NOT_FOUND:
+                pass
+            except trove_exceptions.BadRequest as e:
+                if not ("The 'list_access' operation "
+                        "is not supported") in e.message:
+                    raise
+                LOG.info("List user access is not available.  "
+                         "Reason: %s", e.message)
+                api.trove.operation_support_set(self.request,
+                                                instance.datastore,
+                                                'list_access', False)
+                return False
+            except Exception:
+                msg = _('Unable to get user access data.')
+                exceptions.handle(self.request, msg)
+        return True
+
+    def has_more_data(self, table):
+        return bool(getattr(table.data, 'next', None))
+
     def allowed(self, request):
         return tables.has_user_add_perm(request)
 
@@ -118,10 +176,17 @@ class DatabaseTab(tabs.TableTab):
     template_name = "horizon/common/_detail_table.html"
     preload = False
 
+    def get_prefetch_calls(self):
+        instance = self.tab_group.kwargs['instance']
+        marker = self.request.GET.get(
+            tables.DatabaseTable._meta.pagination_param)
+        return {'database_list': lambda: api.trove.database_list(
+            self.request, instance.id, marker=marker, paginate=True)}
+
     def get_databases_data(self):
         instance = self.tab_group.kwargs['instance']
         try:
-            data = api.trove.database_list(self.request, instance.id)
+            data = self.tab_group.get_prefetched(self, 'database_list')
             add_instance = lambda d: setattr(d, 'instance', instance)
             map(add_instance, data)
         except trove_exceptions.BadRequest as e:
@@ -137,6 +202,9 @@ class DatabaseTab(tabs.TableTab):
             data = []
         return data
 
+    def has_more_data(self, table):
+        return bool(getattr(table.data, 'next', None))
+
     def allowed(self, request):
         return tables.has_database_add_perm(request)
 
@@ -149,22 +217,15 @@ class ConfigDefaultsTab(tabs.TableTab):
     template_name = "horizon/common/_detail_table.html"
     preload = False
 
-    def get_config_defaults_data(self):
+    def get_prefetch_calls(self):
         instance = self.tab_group.kwargs['instance']
-        values_data = []
-        try:
-            data = api.trove.configuration_default(self.request, instance.id)
-        except trove_exceptions.BadRequest as e:
-            data = None
-            if not ("No configuration parser found") in e.message:
-                raise
-            LOG.info("Configuration defaults are not available.  "
-                     "Reason: %s", e.message)
-        if data is not None:
-            for k, v in data.configuration.items():
-                values_data.append(
-                    config_param_manager.ConfigParam(None, k, v))
-        return sorted(values_data, key=lambda config: config.name)
+        return {'configuration_default': lambda: (
+            api.trove.configuration_default_values(self.request, instance))}
+
+    def get_config_defaults_data(self):
+        values = self.tab_group.get_prefetched(self, 'configuration_default')
+        return [config_param_manager.ConfigParam(None, k, v)
+                for k, v in values or []]
 
 
 class BackupsTab(tabs.TableTab):
@@ -175,10 +236,14 @@ class BackupsTab(tabs.TableTab):
     template_name = "horizon/common/_detail_table.html"
     preload = False
 
-    def get_backups_data(self):
+    def get_prefetch_calls(self):
         instance = self.tab_group.kwargs['instance']
+        return {'instance_backups': lambda: api.trove.instance_backups(
+            self.request, instance.id)}
+
+    def get_backups_data(self):
         try:
-            data = api.trove.instance_backups(self.request, instance.id)
+            data = self.tab_group.get_prefetched(self, 'instance_backups')
         except Exception:
             msg = _('Unable to get database backup data.')
             exceptions.handle(self.request, msg)
@@ -203,10 +268,14 @@ class LogsTab(tabs.TableTab):
     template_name = "horizon/common/_detail_table.html"
     preload = False
 
-    def get_logs_data(self):
+    def get_prefetch_calls(self):
         instance = self.tab_group.kwargs['instance']
+        return {'log_list': lambda: api.trove.log_list(self.request,
+                                                       instance.id)}
+
+    def get_logs_data(self):
         try:
-            logs = api.trove.log_list(self.request, instance.id)
+            logs = self.tab_group.get_prefetched(self, 'log_list')
             return logs
         except Exception as e:
             LOG.exception(
@@ -220,3 +289,49 @@ class InstanceDetailTabs(tabs.TabGroup):
     tabs = (OverviewTab, UserTab, DatabaseTab, BackupsTab, ConfigDefaultsTab,
             LogsTab)
     sticky = True
+
+    def __init__(self, request, **kwargs):
+        super(InstanceDetailTabs, self).__init__(request, **kwargs)
+        self._prefetched = None
+
+    def prefetch(self, *extra_tabs):
+        """Issues the Trove calls needed to render this request at once.
+
+        The instance flavor and the data of every tab that is loaded (plus
+        any extra tabs given) are fetched concurrently, instead of one
+        round-trip after another as each tab renders. This only happens
+        once per tab group.
+        """
+        if self._prefetched is not None:
+            return
+        instance = self.kwargs['instance']
+        calls = OrderedDict()
+        calls['flavor_get'] = lambda: api.trove.flavor_get(
+            self.request, instance.flavor["id"])
+        for tab in self.get_tabs():
+            if tab.load or tab in extra_tabs:
+                calls.update(sorted(tab.get_prefetch_calls().items()))
+
+        results = utils.call_parallel(lambda call: call(), calls.values())
+        self._prefetched = dict(zip(calls.keys(), results))
+
+        flavor, error = self._prefetched['flavor_get']
+        if error is None:
+            instance.full_flavor = flavor
+        else:
+            LOG.error('Unable to retrieve flavor details'
+                      ' for database instance: %s' % instance.id)
+
+    def get_prefetched(self, tab, name):
+        """Returns the prefetched result of a tab's call.
+
+        The exception raised by the call, if any, is raised again here so
+        the tab can handle it as if it had made the call itself.
+        """
+        self.prefetch(tab)
+        if name not in self._prefetched:
+            return tab.get_prefetch_calls()[name]()
+        result, error = self._prefetched[name]
+        if error is not None:
+            raise error
+        return result
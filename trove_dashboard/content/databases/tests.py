@@ -14,9 +14,13 @@
 #    under the License.
 
 import binascii
+import collections
+import json
 import logging
+import time
 
 import django
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django import http
 import unittest
@@ -27,6 +31,10 @@ import six
 from horizon import exceptions
 from openstack_dashboard import api as dash_api
 from troveclient import common
+from troveclient import exceptions as trove_exceptions
+from troveclient.v1 import instances
+from troveclient.v1 import root
+from troveclient.v1 import users
 
 from trove_dashboard import api
 from trove_dashboard.content.databases import forms
@@ -152,26 +160,13 @@ class DatabaseTests(test.TestCase):
         self.assertMessageCount(res, error=1)
 
     @test.create_stubs({
-        api.trove: ('datastore_flavors', 'datastore_volume_types',
-                    'backup_list', 'datastore_list', 'datastore_version_list',
-                    'instance_list', 'region_list'),
+        api.trove: ('datastore_list', 'datastore_version_list',
+                    'region_list'),
         dash_api.cinder: ('volume_type_list',),
         dash_api.neutron: ('network_list',),
         dash_api.nova: ('availability_zone_list',)
     })
     def test_launch_instance(self):
-        api.trove.datastore_flavors(IsA(http.HttpRequest),
-                                    IsA(six.string_types),
-                                    IsA(six.string_types)).\
-            MultipleTimes().AndReturn(self.flavors.list())
-        api.trove.datastore_volume_types(IsA(http.HttpRequest),
-                                         IsA(six.string_types),
-                                         IsA(six.string_types)). \
-            MultipleTimes().AndReturn(self.database_volume_types.list())
-        api.trove.backup_list(IsA(http.HttpRequest)).AndReturn(
-            self.database_backups.list())
-        api.trove.instance_list(IsA(http.HttpRequest)).AndReturn(
-            self.databases.list())
         # Mock datastores
         api.trove.datastore_list(IsA(http.HttpRequest)).AndReturn(
             self.datastores.list())
@@ -196,6 +191,49 @@ class DatabaseTests(test.TestCase):
         res = self.client.get(LAUNCH_URL)
         self.assertTemplateUsed(res, 'project/databases/launch.html')
 
+        # The flavors and volume types are only loaded once a datastore
+        # version is selected.
+        set_instance_detail_step = \
+            [step for step in res.context_data['workflow'].steps
+             if isinstance(step, create_instance.SetInstanceDetails)][0]
+        fields = set_instance_detail_step.action.fields
+        field_name = self._build_flavor_widget_name('mysql', '5.5')
+        self.assertEqual([], list(fields['flavor-' + field_name].choices))
+        self.assertContains(
+            res, reverse('horizon:project:databases:datastore_choices'))
+
+    @test.create_stubs({api.trove: ('datastore_flavors',
+                                    'datastore_volume_types')})
+    def test_datastore_choices(self):
+        api.trove.datastore_flavors(IsA(http.HttpRequest), 'mysql', '5.5') \
+            .AndReturn(self.flavors.list())
+        api.trove.datastore_volume_types(IsA(http.HttpRequest),
+                                         'mysql', '5.5') \
+            .AndRaise(self.exceptions.trove)
+        self.mox.ReplayAll()
+
+        url = reverse('horizon:project:databases:datastore_choices')
+        params = {'datastore': 'mysql', 'datastore_version': '5.5'}
+
+        params['kind'] = 'flavor'
+        res = self.client.get(url, params)
+        self.assertEqual(200, res.status_code)
+        choices = json.loads(res.content)['choices']
+        self.assertEqual(sorted(flavor.id for flavor in self.flavors.list()),
+                         sorted(choice[0] for choice in choices))
+
+        params['kind'] = 'volume_type'
+        res = self.client.get(url, params)
+        self.assertEqual(500, res.status_code)
+        self.assertEqual('Unable to retrieve datastore version choices.',
+                         json.loads(res.content)['error'])
+
+        params['kind'] = 'image'
+        res = self.client.get(url, params)
+        self.assertEqual(400, res.status_code)
+        self.assertEqual('Unknown kind of choices.',
+                         json.loads(res.content)['error'])
+
     # django 1.7 and later does not handle the thrown Http302
     # exception well enough.
     # TODO(mrunge): re-check when django-1.8 is stable
@@ -229,9 +267,9 @@ class DatabaseTests(test.TestCase):
 
     @test.create_stubs({
         api.trove: ('datastore_flavors', 'datastore_volume_types',
-                    'backup_list', 'instance_create',
+                    'instance_create',
                     'datastore_list', 'datastore_version_list',
-                    'instance_list', 'region_list'),
+                    'region_list'),
         dash_api.neutron: ('network_list',),
         dash_api.nova: ('availability_zone_list',)
     })
@@ -245,12 +283,6 @@ class DatabaseTests(test.TestCase):
                                          IsA(six.string_types)). \
             MultipleTimes().AndReturn(self.database_volume_types.list())
 
-        api.trove.backup_list(IsA(http.HttpRequest)).AndReturn(
-            self.database_backups.list())
-
-        api.trove.instance_list(IsA(http.HttpRequest)).AndReturn(
-            self.databases.list())
-
         # Mock datastores
         api.trove.datastore_list(IsA(http.HttpRequest))\
             .AndReturn(self.datastores.list())
@@ -315,9 +347,9 @@ class DatabaseTests(test.TestCase):
 
     @test.create_stubs({
         api.trove: ('datastore_flavors', 'datastore_volume_types',
-                    'backup_list', 'instance_create',
+                    'instance_create',
                     'datastore_list', 'datastore_version_list',
-                    'instance_list', 'region_list'),
+                    'region_list'),
         dash_api.neutron: ('network_list',),
         dash_api.nova: ('availability_zone_list',)
     })
@@ -332,12 +364,6 @@ class DatabaseTests(test.TestCase):
                                          IsA(six.string_types)). \
             MultipleTimes().AndReturn(self.database_volume_types.list())
 
-        api.trove.backup_list(IsA(http.HttpRequest)).AndReturn(
-            self.database_backups.list())
-
-        api.trove.instance_list(IsA(http.HttpRequest)).AndReturn(
-            self.databases.list())
-
         # Mock datastores
         api.trove.datastore_list(IsA(http.HttpRequest))\
             .AndReturn(self.datastores.list())
@@ -400,6 +426,86 @@ class DatabaseTests(test.TestCase):
         res = self.client.post(LAUNCH_URL, post)
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
+    @test.create_stubs({
+        api.trove: ('datastore_flavors', 'datastore_volume_types',
+                    'instance_create',
+                    'datastore_list', 'datastore_version_list',
+                    'region_list'),
+        dash_api.neutron: ('network_list',),
+        dash_api.nova: ('availability_zone_list',)
+    })
+    def test_create_multiple_instances(self):
+        trove_exception = self.exceptions.nova
+        api.trove.datastore_flavors(IsA(http.HttpRequest),
+                                    IsA(six.string_types),
+                                    IsA(six.string_types)).\
+            MultipleTimes().AndReturn(self.flavors.list())
+        api.trove.datastore_volume_types(IsA(http.HttpRequest),
+                                         IsA(six.string_types),
+                                         IsA(six.string_types)). \
+            MultipleTimes().AndReturn(self.database_volume_types.list())
+
+        api.trove.datastore_list(IsA(http.HttpRequest))\
+            .AndReturn(self.datastores.list())
+
+        api.trove.datastore_version_list(IsA(http.HttpRequest), IsA(str))\
+            .MultipleTimes().AndReturn(self.datastore_versions.list())
+
+        api.trove.region_list(IsA(http.HttpRequest)).AndReturn([])
+
+        dash_api.neutron.network_list(IsA(http.HttpRequest),
+                                      tenant_id=self.tenant.id,
+                                      shared=False).AndReturn(
+                                          self.networks.list()[:1])
+
+        dash_api.neutron.network_list(IsA(http.HttpRequest),
+                                      shared=True).AndReturn(
+                                          self.networks.list()[1:])
+
+        nics = [{"net-id": self.networks.first().id, "v4-fixed-ip": ''}]
+
+        dash_api.nova.availability_zone_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.availability_zones.list())
+
+        datastore = 'mysql'
+        datastore_version = '5.5'
+        field_name = self._build_flavor_widget_name(datastore,
+                                                    datastore_version)
+        create_kwargs = dict(databases=[],
+                             datastore=datastore,
+                             datastore_version=datastore_version,
+                             restore_point=None,
+                             replica_of=None,
+                             configuration=None,
+                             users=None,
+                             nics=nics,
+                             replica_count=None,
+                             volume_type=None,
+                             locality=None,
+                             availability_zone=IsA(six.text_type),
+                             region_name=None)
+        # One create call per instance, each with a numbered name
+        api.trove.instance_create(
+            IsA(http.HttpRequest), 'MyDB-1', IsA(int), IsA(six.text_type),
+            **create_kwargs).AndReturn(self.databases.first())
+        api.trove.instance_create(
+            IsA(http.HttpRequest), 'MyDB-2', IsA(int), IsA(six.text_type),
+            **create_kwargs).AndRaise(trove_exception)
+
+        self.mox.ReplayAll()
+        post = {
+            'name': "MyDB",
+            'count': '2',
+            'volume': '1',
+            'flavor': 'aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa',
+            'datastore': field_name,
+            'flavor-' + field_name: 'aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa',
+            'network': self.networks.first().id,
+        }
+
+        res = self.client.post(LAUNCH_URL, post)
+        self.assertRedirectsNoFollow(res, INDEX_URL)
+
     @test.create_stubs(
         {api.trove: ('instance_get', 'flavor_get', 'root_show')})
     def _test_details(self, database, test_text, assert_contains=True):
@@ -449,6 +555,153 @@ class DatabaseTests(test.TestCase):
         database = self.databases.first()
         self._test_details(database, "Locality")
 
+    @test.create_stubs(
+        {api.trove: ('instance_get', 'flavor_get', 'root_show')})
+    def test_details_flavor_exception(self):
+        database = self.databases.first()
+        api.trove.instance_get(IsA(http.HttpRequest), IsA(six.text_type))\
+            .AndReturn(database)
+        # The flavor and the overview data are fetched together
+        api.trove.flavor_get(IsA(http.HttpRequest), IsA(str))\
+            .AndRaise(self.exceptions.trove)
+        api.trove.root_show(IsA(http.HttpRequest), IsA(str)) \
+            .AndReturn(self.database_user_roots.first())
+
+        self.mox.ReplayAll()
+
+        res = self.client.get(DETAILS_URL)
+        self.assertTemplateUsed(res, 'project/databases/'
+                                     '_detail_overview.html')
+        self.assertContains(res, database.ip[0])
+
+    @test.create_stubs({api.trove: ('configuration_default',)})
+    def test_configuration_default_values(self):
+        api.trove.catalog_cache_invalidate(self.request)
+
+        def instance(instance_id, version, flavor_id='1'):
+            return instances.Instance(
+                None, {'id': instance_id,
+                       'datastore': {'type': 'mysql', 'version': version},
+                       'flavor': {'id': flavor_id}}, loaded=True)
+
+        defaults = instances.Instance(
+            None, {'configuration': {'max_connections': 100,
+                                     'connect_timeout': 10}}, loaded=True)
+        api.trove.configuration_default(IsA(http.HttpRequest), 'one') \
+            .AndReturn(defaults)
+        api.trove.configuration_default(IsA(http.HttpRequest), 'three') \
+            .AndRaise(trove_exceptions.BadRequest(
+                400, message="No configuration parser found for mysql"))
+        self.mox.ReplayAll()
+
+        # instances of the same datastore version and flavor share defaults
+        expected = [('connect_timeout', 10), ('max_connections', 100)]
+        for instance_id in ('one', 'two'):
+            self.assertEqual(expected, api.trove.configuration_default_values(
+                self.request, instance(instance_id, '5.6')))
+
+        # and so do those without a configuration parser
+        for instance_id in ('three', 'four'):
+            self.assertIsNone(api.trove.configuration_default_values(
+                self.request, instance(instance_id, '5.7')))
+
+    @test.create_stubs({api.trove: ('_create_client',),
+                        dash_api.base: ('url_for',)})
+    def test_troveclient_pool(self):
+        api.trove._client_pool.clear()
+        self.mox.stubs.Set(api.trove, 'CLIENT_POOL_SIZE', 2)
+        dash_api.base.url_for(IsA(http.HttpRequest), 'database') \
+            .MultipleTimes().AndReturn('http://trove')
+        for client in ('one', 'two', 'three', 'two again'):
+            api.trove._create_client(IsA(http.HttpRequest), 'http://trove') \
+                .AndReturn(client)
+
+        self.mox.ReplayAll()
+
+        def troveclient(region, token='token'):
+            self.request.user.services_region = region
+            self.request.user.token.id = token
+            return api.trove.troveclient(self.request)
+
+        try:
+            # clients are reused by token, endpoint and region
+            self.assertEqual('one', troveclient('RegionOne'))
+            self.assertEqual('one', troveclient('RegionOne'))
+            self.assertEqual('two', troveclient('RegionTwo'))
+            self.assertEqual('one', troveclient('RegionOne'))
+
+            # the least recently used client is dropped from a full pool
+            self.assertEqual('three', troveclient('RegionOne', 'other'))
+            self.assertEqual('one', troveclient('RegionOne'))
+            self.assertEqual('two again', troveclient('RegionTwo'))
+        finally:
+            api.trove._client_pool.clear()
+
+    def test_operation_support_scope(self):
+        cache.clear()
+        datastore = {'type': 'mysql', 'version': '5.6'}
+
+        self.request.user.services_region = 'RegionOne'
+        api.trove.operation_support_set(self.request, datastore,
+                                        'list_access', False)
+        self.assertIs(False, api.trove.operation_support_get(
+            self.request, datastore, 'list_access'))
+
+        # another region may run a Trove that supports the operation
+        self.request.user.services_region = 'RegionTwo'
+        self.assertIsNone(api.trove.operation_support_get(
+            self.request, datastore, 'list_access'))
+
+    def _stub_troveclient(self, **managers):
+        trove_client = self.mox.CreateMockAnything()
+        for name, manager in managers.items():
+            setattr(trove_client, name, manager)
+        api.trove.troveclient(IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(trove_client)
+
+    @test.create_stubs({api.trove: ('troveclient', 'instance_list',
+                                    'instance_get')})
+    def test_instance_get_polled(self):
+        cache.clear()
+        databases = self.databases.list()
+        self._stub_troveclient(instances=databases[0].manager)
+        api.trove.instance_list(IsA(http.HttpRequest)) \
+            .AndReturn(common.Paginated(databases[:2]))
+        api.trove.instance_get(IsA(http.HttpRequest), databases[2].id) \
+            .AndReturn(databases[2])
+        self.mox.ReplayAll()
+
+        # both polls are answered from a single instance_list snapshot
+        for database in databases[:2]:
+            instance = api.trove.instance_get_polled(self.request,
+                                                     database.id)
+            self.assertEqual(database._info, instance._info)
+
+        # instances that are not on it are fetched one by one
+        instance = api.trove.instance_get_polled(self.request,
+                                                 databases[2].id)
+        self.assertEqual(databases[2].id, instance.id)
+
+    @test.create_stubs({api.trove: ('troveclient', 'instance_list')})
+    def test_instance_get_polled_snapshot_expiry(self):
+        cache.clear()
+        database = self.databases.first()
+        self._stub_troveclient(instances=database.manager)
+        api.trove.instance_list(IsA(http.HttpRequest)) \
+            .AndReturn(common.Paginated([database]))
+        api.trove.instance_list(IsA(http.HttpRequest)) \
+            .AndReturn(common.Paginated([database]))
+        self.mox.ReplayAll()
+
+        now = time.time()
+        api.trove.instance_get_polled(self.request, database.id)
+        api.trove.instance_get_polled(self.request, database.id)
+
+        # once the snapshot expires, instance_list is called again
+        self.mox.stubs.Set(
+            time, 'time', lambda: now + api.trove.ROW_SNAPSHOT_TIMEOUT + 1)
+        api.trove.instance_get_polled(self.request, database.id)
+
     def test_create_database(self):
         database = self.databases.first()
 
@@ -650,9 +903,59 @@ class DatabaseTests(test.TestCase):
         self.assertEqual(table.data[0].enabled, True)
         self.assertEqual(table.data[0].password, "password")
 
+    @test.create_stubs({api.trove: ('root_show',)})
+    def test_disable_root_allowed(self):
+        api.trove.root_show(IsA(http.HttpRequest), 'id') \
+            .AndReturn(self.database_user_roots.first())
+
+        self.mox.ReplayAll()
+
+        action = tables.DisableRootAction()
+        # rows of the Manage Root table already carry the root status
+        self.assertTrue(action.allowed(
+            self.request, views.EnableRootInfo('id', 'inst1', True)))
+        self.assertFalse(action.allowed(
+            self.request, views.EnableRootInfo('id', 'inst1', False)))
+        # otherwise it is looked up with root_show
+        self.assertTrue(action.allowed(
+            self.request, views.EnableRootInfo('id', 'inst1', None)))
+
+    @test.create_stubs({api.trove: ('troveclient',)})
+    def test_root_status_cache(self):
+        cache.clear()
+        manager = root.Root(None)
+        self.mox.StubOutWithMock(manager, 'is_root_enabled')
+        self.mox.StubOutWithMock(manager, 'create')
+        self.mox.StubOutWithMock(manager, 'delete')
+        self._stub_troveclient(root=manager)
+
+        disabled = users.User(manager, {'rootEnabled': False}, loaded=True)
+        enabled = users.User(manager, {'rootEnabled': True}, loaded=True)
+        manager.is_root_enabled('id').AndReturn(disabled)
+        manager.create('id').AndReturn(('root', 'password'))
+        manager.is_root_enabled('id').AndReturn(enabled)
+        manager.delete('id')
+        manager.is_root_enabled('id').AndReturn(disabled)
+
+        self.mox.ReplayAll()
+
+        # the status is served from the cache until root is enabled
+        self.assertFalse(api.trove.root_show(self.request, 'id').rootEnabled)
+        self.assertFalse(api.trove.root_show(self.request, 'id').rootEnabled)
+
+        self.assertEqual(('root', 'password'),
+                         api.trove.root_enable(self.request, ['id']))
+        self.assertTrue(api.trove.root_show(self.request, 'id').rootEnabled)
+        self.assertTrue(api.trove.root_show(self.request, 'id').rootEnabled)
+
+        # and until it is disabled
+        api.trove.root_disable(self.request, 'id')
+        self.assertFalse(api.trove.root_show(self.request, 'id').rootEnabled)
+
     @test.create_stubs({
         api.trove: ('instance_get', 'flavor_get', 'user_delete', 'users_list',
-                    'user_list_access')
+                    'user_list_access', 'operation_support_get',
+                    'operation_support_set')
         })
     def test_user_delete(self):
         database = self.databases.first()
@@ -671,11 +974,19 @@ class DatabaseTests(test.TestCase):
 
         # tabs.py: UserTab.get_user_data
         api.trove.users_list(IsA(http.HttpRequest),
-                             IsA(str)).AndReturn([user])
+                             IsA(str),
+                             marker=None,
+                             paginate=True).AndReturn([user])
+        api.trove.operation_support_get(IsA(http.HttpRequest),
+                                        database.datastore, 'list_access')\
+            .AndReturn(None)
         api.trove.user_list_access(IsA(http.HttpRequest),
                                    IsA(str),
                                    IsA(str),
                                    host=IsA(str)).AndReturn([user_db])
+        api.trove.operation_support_set(IsA(http.HttpRequest),
+                                        database.datastore, 'list_access',
+                                        True)
 
         # tables.py: DeleteUser.delete
         api.trove.user_delete(IsA(http.HttpRequest),
@@ -692,6 +1003,85 @@ class DatabaseTests(test.TestCase):
         res = self.client.post(url, form_data)
         self.assertRedirectsNoFollow(res, url)
 
+    @test.create_stubs({
+        api.trove: ('instance_get', 'flavor_get', 'users_list',
+                    'user_list_access', 'operation_support_get',
+                    'operation_support_set')
+        })
+    def test_users_tab_list_access_not_supported(self):
+        database = self.databases.first()
+        user = self.database_users.first()
+        other_user = users.User(users.Users(None),
+                                dict(user._info, name='Test_User2'))
+
+        api.trove.instance_get(IsA(http.HttpRequest), IsA(six.text_type))\
+            .AndReturn(database)
+        api.trove.flavor_get(IsA(http.HttpRequest), IsA(str))\
+            .AndReturn(self.flavors.first())
+        api.trove.users_list(IsA(http.HttpRequest),
+                             IsA(str),
+                             marker=None,
+                             paginate=True).AndReturn([user, other_user])
+
+        # Only the first user is asked for, the rest is skipped once the
+        # datastore is known not to support the operation
+        api.trove.operation_support_get(IsA(http.HttpRequest),
+                                        database.datastore, 'list_access')\
+            .AndReturn(None)
+        api.trove.user_list_access(IsA(http.HttpRequest),
+                                   IsA(str),
+                                   user.name,
+                                   host=IsA(str)).AndRaise(
+            trove_exceptions.BadRequest(
+                "The 'list_access' operation is not supported"))
+        api.trove.operation_support_set(IsA(http.HttpRequest),
+                                        database.datastore, 'list_access',
+                                        False)
+
+        self.mox.ReplayAll()
+
+        details_url = reverse('horizon:project:databases:detail',
+                              args=[database.id])
+        url = details_url + '?tab=instance_details__users_tab'
+        res = self.client.get(url)
+        self.assertTemplateUsed(res, 'horizon/common/_detail_table.html')
+        self.assertContains(res, 'Test_User2')
+
+    @test.create_stubs({
+        api.trove: ('instance_get', 'flavor_get', 'users_list',
+                    'user_list_access', 'operation_support_get')
+        })
+    def test_users_tab_pagination(self):
+        database = self.databases.first()
+        user = self.database_users.first()
+        users = common.Paginated([user], next_marker='Test_User@%')
+
+        api.trove.instance_get(IsA(http.HttpRequest), IsA(six.text_type))\
+            .AndReturn(database)
+        api.trove.flavor_get(IsA(http.HttpRequest), IsA(str))\
+            .AndReturn(self.flavors.first())
+        api.trove.users_list(IsA(http.HttpRequest),
+                             IsA(str),
+                             marker='Test_User@localhost',
+                             paginate=True).AndReturn(users)
+        api.trove.operation_support_get(IsA(http.HttpRequest),
+                                        database.datastore, 'list_access')\
+            .AndReturn(True)
+        api.trove.user_list_access(IsA(http.HttpRequest),
+                                   IsA(str),
+                                   IsA(str),
+                                   host=IsA(str)).AndReturn([])
+
+        self.mox.ReplayAll()
+
+        details_url = reverse('horizon:project:databases:detail',
+                              args=[database.id])
+        url = (details_url + '?tab=instance_details__users_tab'
+               '&users_marker=Test_User%40localhost')
+        res = self.client.get(url)
+        self.assertContains(res, 'tab=instance_details__users_tab&amp;'
+                                 'users_marker=Test_User%40%25')
+
     def test_create_user(self):
         user = self.users.first()
 
@@ -819,7 +1209,8 @@ class DatabaseTests(test.TestCase):
 
     @test.create_stubs({api.trove: ('database_list', 'user_show_access')})
     def test_access_detail_get(self):
-        api.trove.database_list(IsA(http.HttpRequest), IsA(six.text_type)) \
+        api.trove.database_list(IsA(http.HttpRequest), IsA(six.text_type),
+                                marker=None, paginate=True) \
             .AndReturn(self.databases.list())
 
         api.trove.user_show_access(IsA(http.HttpRequest), IsA(six.text_type),
@@ -837,7 +1228,8 @@ class DatabaseTests(test.TestCase):
 
     @test.create_stubs({api.trove: ('database_list', 'user_show_access')})
     def test_access_detail_get_exception(self):
-        api.trove.database_list(IsA(http.HttpRequest), IsA(six.text_type)) \
+        api.trove.database_list(IsA(http.HttpRequest), IsA(six.text_type),
+                                marker=None, paginate=True) \
             .AndReturn(self.databases.list())
 
         api.trove.user_show_access(IsA(http.HttpRequest), IsA(six.text_type),
@@ -852,6 +1244,32 @@ class DatabaseTests(test.TestCase):
         res = self.client.get(url)
         self.assertRedirectsNoFollow(res, DETAILS_URL)
 
+    @test.create_stubs({api.trove: ('database_list', 'user_show_access')})
+    def test_access_detail_get_paged(self):
+        databases = self.databases.list()
+        page = common.Paginated(databases[:2], next_marker=databases[1].name)
+        api.trove.database_list(IsA(http.HttpRequest), IsA(six.text_type),
+                                marker='first', paginate=True) \
+            .AndReturn(page)
+
+        api.trove.user_show_access(IsA(http.HttpRequest), IsA(six.text_type),
+                                   IsA(six.text_type),
+                                   host=IsA(six.text_type)) \
+            .AndReturn(databases[1:])
+
+        self.mox.ReplayAll()
+
+        url = reverse('horizon:project:databases:access_detail',
+                      args=['id', 'name', 'host'])
+        res = self.client.get(url + '?databases_marker=first')
+        self.assertTemplateUsed(
+            res, 'project/databases/access_detail.html')
+        access = dict((row.name, row.access)
+                      for row in res.context['table'].data)
+        self.assertEqual({databases[0].name: False,
+                          databases[1].name: True}, access)
+        self.assertContains(res, 'databases_marker=')
+
     @test.create_stubs({api.trove: ('user_grant_access',)})
     def test_detail_grant_access(self):
         api.trove.user_grant_access(
@@ -1064,9 +1482,9 @@ class DatabaseTests(test.TestCase):
 
     @test.create_stubs({
         api.trove: ('datastore_flavors', 'datastore_volume_types',
-                    'backup_list', 'instance_create',
+                    'instance_create',
                     'datastore_list', 'datastore_version_list',
-                    'instance_list', 'instance_get', 'region_list'),
+                    'instance_get', 'region_list'),
         dash_api.neutron: ('network_list',),
         dash_api.nova: ('availability_zone_list',)
     })
@@ -1080,12 +1498,6 @@ class DatabaseTests(test.TestCase):
                                          IsA(six.string_types)).\
             MultipleTimes().AndReturn(self.database_volume_types.list())
 
-        api.trove.backup_list(IsA(http.HttpRequest)).AndReturn(
-            self.database_backups.list())
-
-        api.trove.instance_list(IsA(http.HttpRequest)).AndReturn(
-            self.databases.list())
-
         api.trove.datastore_list(IsA(http.HttpRequest))\
             .AndReturn(self.datastores.list())
 
@@ -1365,27 +1777,38 @@ class DatabaseTests(test.TestCase):
 
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
-    @test.create_stubs({
-        api.trove: ('instance_list', 'region_list',)
-    })
-    def test_master_list_pagination(self):
-        request = http.HttpRequest()
+    @test.create_stubs({api.trove: ('instance_index',)})
+    def test_search_instances(self):
+        databases = self.databases.list()
+        index = collections.OrderedDict(
+            (db.id, api.trove.InstanceSummary(db.id, db.name, db.status,
+                                              db.datastore))
+            for db in databases)
+        api.trove.instance_index(IsA(http.HttpRequest)).AndReturn(index)
 
-        first_part = common.Paginated(self.databases.list()[:1],
-                                      next_marker='marker')
-        second_part = common.Paginated(self.databases.list()[1:])
+        self.mox.ReplayAll()
 
-        api.trove.instance_list(request).AndReturn(first_part)
-        (api.trove.instance_list(request, marker='marker')
-         .AndReturn(second_part))
-        api.trove.instance_list(request).AndReturn(first_part)
-        api.trove.region_list(request).AndReturn([])
+        url = reverse('horizon:project:databases:search_instances')
+        res = self.client.get(url, {'q': 'dns', 'status': 'ACTIVE',
+                                    'capability': 'replicate'})
+        self.assertEqual(res.status_code, 200)
+        expected = [db.id for db in databases
+                    if 'dns' in db.name.lower() and db.status == 'ACTIVE']
+        self.assertEqual(expected, [result['id'] for result in
+                                    json.loads(res.content)['results']])
+
+    @test.create_stubs({api.trove: ('instance_index',)})
+    def test_search_instances_exception(self):
+        api.trove.instance_index(IsA(http.HttpRequest))\
+            .AndRaise(self.exceptions.trove)
 
         self.mox.ReplayAll()
 
-        advanced_page = create_instance.AdvancedAction(request, None)
-        choices = advanced_page.populate_master_choices(request, None)
-        self.assertTrue(len(choices) == len(self.databases.list()) + 1)
+        url = reverse('horizon:project:databases:search_instances')
+        res = self.client.get(url, {'q': 'db'})
+        self.assertEqual(res.status_code, 500)
+        self.assertEqual('Unable to retrieve database instances.',
+                         json.loads(res.content)['error'])
 
     def _build_datastore_display_text(self, datastore, datastore_version):
         return datastore + ' - ' + datastore_version
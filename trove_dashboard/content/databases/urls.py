@@ -32,6 +32,10 @@ urlpatterns = patterns(
         name='index'),
     url(r'^launch$', views.LaunchInstanceView.as_view(),
         name='launch'),
+    url(r'^search_instances$', views.search_instances,
+        name='search_instances'),
+    url(r'^datastore_choices$', views.datastore_choices,
+        name='datastore_choices'),
     url(INSTANCES % '', views.DetailView.as_view(),
         name='detail'),
     url(INSTANCES % 'create_database', views.CreateDatabaseView.as_view(),
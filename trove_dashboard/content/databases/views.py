@@ -20,6 +20,7 @@ import logging
 
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
+from django import http
 from django.utils.translation import ugettext_lazy as _
 
 import six
@@ -34,14 +35,22 @@ from openstack_dashboard.dashboards.project.instances \
     import utils as instance_utils
 
 from trove_dashboard import api
+from trove_dashboard.content.databases import db_capability
 from trove_dashboard.content.databases import forms
 from trove_dashboard.content.databases import tables
 from trove_dashboard.content.databases import tabs
 from trove_dashboard.content.databases import workflows
+from trove_dashboard.content import utils
 from trove_dashboard.templatetags.tesora import tesora_version
 
 LOG = logging.getLogger(__name__)
 
+# Datastore capabilities an instance search can be restricted to.
+SEARCH_CAPABILITIES = {
+    'backup': db_capability.can_backup,
+    'replicate': db_capability.can_launch_from_master,
+}
+
 
 class IndexView(horizon_tables.DataTableView):
     table_class = tables.InstancesTable
@@ -176,41 +185,52 @@ class AccessDetailView(horizon_tables.DataTableView):
     template_name = 'project/databases/access_detail.html'
     page_title = _("Database Access for: {{ user_name }}")
 
+    def has_more_data(self, table):
+        return self._more
+
     @memoized.memoized_method
     def get_data(self):
         instance_id = self.kwargs['instance_id']
         user_name = self.kwargs['user_name']
         user_host = self.kwargs['user_host']
+        marker = self.request.GET.get(
+            tables.AccessTable._meta.pagination_param)
+        redirect = reverse('horizon:project:databases:detail',
+                           args=[instance_id])
+
+        # One page of databases and the grants of the user are independent,
+        # so both are fetched at the same time.
+        calls = [
+            lambda: api.trove.database_list(self.request, instance_id,
+                                            marker=marker, paginate=True),
+            lambda: api.trove.user_show_access(self.request, instance_id,
+                                               user_name, host=user_host)]
+        results = utils.call_parallel(lambda call: call(), calls)
+        (databases, databases_error), (granted, granted_error) = results
+
         try:
-            databases = api.trove.database_list(self.request, instance_id)
+            if databases_error is not None:
+                raise databases_error
+            self._more = getattr(databases, 'next', None) or False
         except Exception:
             databases = []
-            redirect = reverse('horizon:project:databases:detail',
-                               args=[instance_id])
+            self._more = False
             exceptions.handle(self.request,
                               _('Unable to retrieve databases.'),
                               redirect=redirect)
         try:
-            granted = api.trove.user_show_access(
-                self.request, instance_id, user_name, host=user_host)
+            if granted_error is not None:
+                raise granted_error
         except Exception:
             granted = []
-            redirect = reverse('horizon:project:databases:detail',
-                               args=[instance_id])
             exceptions.handle(self.request,
                               _('Unable to retrieve accessible databases.'),
                               redirect=redirect)
 
-        db_access_list = []
-        for database in databases:
-            if database in granted:
-                access = True
-            else:
-                access = False
-
-            db_access = DBAccess(database.name, access)
-            db_access_list.append(db_access)
-
+        granted_names = set(database.name for database in granted)
+        db_access_list = [DBAccess(database.name,
+                                   database.name in granted_names)
+                          for database in databases]
         return sorted(db_access_list, key=lambda data: (data.name))
 
     def get_context_data(self, **kwargs):
@@ -262,6 +282,9 @@ class DetailView(horizon_tabs.TabbedTableView):
     def get_context_data(self, **kwargs):
         context = super(DetailView, self).get_context_data(**kwargs)
         instance = self.get_data()
+        if "tab_group" in context:
+            # Makes sure the flavor is loaded even if no tab asked for data
+            context["tab_group"].prefetch()
         table = tables.InstancesTable(self.request)
         context["instance"] = instance
         context["url"] = self.get_redirect_url()
@@ -280,12 +303,8 @@ class DetailView(horizon_tabs.TabbedTableView):
                     'for database instance: %s') % instance_id
             exceptions.handle(self.request, msg,
                               redirect=self.get_redirect_url())
-        try:
-            instance.full_flavor = api.trove.flavor_get(
-                self.request, instance.flavor["id"])
-        except Exception:
-            LOG.error('Unable to retrieve flavor details'
-                      ' for database instance: %s' % instance_id)
+        # The flavor is fetched along with the tab data, see
+        # InstanceDetailTabs.prefetch
         return instance
 
     def get_tabs(self, request, *args, **kwargs):
@@ -511,3 +530,85 @@ class ManageRootView(horizon_tables.DataTableView):
         context = super(ManageRootView, self).get_context_data(**kwargs)
         context['instance_id'] = self.kwargs['instance_id']
         return context
+
+
+def search_instances(request):
+    """Returns the instances matching a typeahead search as JSON.
+
+    The text in q is matched against instance names and ids. The matches
+    can be restricted to some statuses (status, repeatable), a datastore
+    type (datastore) and a datastore capability (capability). Matches come
+    from the cached instance index, so a search never lists every instance
+    from Trove.
+    """
+    query = request.GET.get('q', '').strip().lower()
+    statuses = request.GET.getlist('status')
+    datastore = request.GET.get('datastore')
+    capability = SEARCH_CAPABILITIES.get(request.GET.get('capability'))
+
+    try:
+        instances = api.trove.instance_index(request).values()
+    except Exception:
+        LOG.exception("Unable to search database instances.")
+        return http.JsonResponse(
+            {'error': six.text_type(
+                _('Unable to retrieve database instances.'))},
+            status=500)
+
+    matches = []
+    for instance in instances:
+        datastore_type = instance.datastore.get('type')
+        if statuses and instance.status not in statuses:
+            continue
+        if datastore and datastore_type != datastore:
+            continue
+        if capability is not None and not capability(datastore_type):
+            continue
+        if (query and query not in instance.name.lower() and
+                not instance.id.startswith(query)):
+            continue
+        matches.append(instance)
+    matches.sort(key=lambda instance: instance.name.lower())
+
+    results = [{'id': instance.id,
+                'name': instance.name,
+                'label': '%s (%s %s, %s)' % (
+                    instance.name,
+                    instance.datastore.get('type'),
+                    instance.datastore.get('version'),
+                    instance.status)}
+               for instance in matches[:utils.SEARCH_LIMIT]]
+    return http.JsonResponse({'results': results})
+
+
+def datastore_choices(request):
+    """Returns the flavor or volume type choices of a datastore version.
+
+    The launch forms only carry the choices of the selected datastore
+    version, the others are fetched from here when a version is picked.
+    kind is either flavor or volume_type.
+    """
+    datastore = request.GET.get('datastore')
+    datastore_version = request.GET.get('datastore_version')
+    kind = request.GET.get('kind')
+
+    try:
+        if kind == 'flavor':
+            flavors = api.trove.datastore_flavors(request, datastore,
+                                                  datastore_version)
+            choices = instance_utils.sort_flavor_list(request, flavors)
+        elif kind == 'volume_type':
+            volume_types = api.trove.datastore_volume_types(
+                request, datastore, datastore_version)
+            choices = utils.sort_volume_type_list(request, volume_types)
+        else:
+            return http.JsonResponse(
+                {'error': six.text_type(_('Unknown kind of choices.'))},
+                status=400)
+    except Exception:
+        LOG.exception("Unable to list datastore version choices.")
+        return http.JsonResponse(
+            {'error': six.text_type(
+                _('Unable to retrieve datastore version choices.'))},
+            status=500)
+    return http.JsonResponse({'choices': choices})
@@ -21,6 +21,7 @@ from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
 from horizon import forms
+from horizon import messages
 from horizon.utils import memoized
 from horizon import workflows
 from openstack_dashboard import api as dash_api
@@ -33,9 +34,12 @@ from openstack_dashboard.dashboards.project.instances.workflows \
 from trove_dashboard import api
 from trove_dashboard.content.databases import db_capability
 from trove_dashboard.content import utils
+from trove_dashboard.content import widgets
 
 LOG = logging.getLogger(__name__)
 
+TROVE_MAX_LAUNCH_COUNT = getattr(settings, 'TROVE_MAX_LAUNCH_COUNT', 20)
+
 
 def parse_datastore_and_version_text(datastore_and_version):
     if datastore_and_version:
@@ -49,6 +53,15 @@ class SetInstanceDetailsAction(workflows.Action):
         label=_("Availability Zone"),
         required=False)
     name = forms.CharField(max_length=80, label=_("Instance Name"))
+    count = forms.IntegerField(
+        label=_("Instance Count"),
+        min_value=1,
+        max_value=TROVE_MAX_LAUNCH_COUNT,
+        initial=1,
+        required=False,
+        help_text=_("Number of instances to launch. When more than one "
+                    "instance is launched, a sequence number is appended "
+                    "to each instance name."))
     volume = forms.IntegerField(label=_("Volume Size"),
                                 min_value=0,
                                 initial=1,
@@ -224,6 +237,10 @@ class SetInstanceDetailsAction(workflows.Action):
                     choices = choices + version_choices
         return choices
 
+    def _is_selected_datastore(self, datastore, datastore_version):
+        return self.data.get('datastore') == self._build_widget_field_name(
+            datastore, datastore_version)
+
     def _add_datastore_flavor_field(self,
                                     request,
                                     datastore,
@@ -236,11 +253,20 @@ class SetInstanceDetailsAction(workflows.Action):
             label=_("Flavor"),
             help_text=_("Size of image to launch."),
             required=False,
-            widget=forms.Select(attrs={
-                'class': 'switched',
-                'data-switch-on': 'datastore',
-                attr_key: _("Flavor")
-            }))
+            widget=widgets.LazySelect(
+                'horizon:project:databases:datastore_choices',
+                params={'datastore': datastore,
+                        'datastore_version': datastore_version,
+                        'kind': 'flavor'},
+                attrs={
+                    'class': 'switched',
+                    'data-switch-on': 'datastore',
+                    attr_key: _("Flavor")
+                }))
+        # The choices of the other versions are loaded by the browser when
+        # their version is selected.
+        if not self._is_selected_datastore(datastore, datastore_version):
+            return
         valid_flavors = self.datastore_flavors(request,
                                                datastore,
                                                datastore_version)
@@ -260,11 +286,18 @@ class SetInstanceDetailsAction(workflows.Action):
             label=_("Volume Type"),
             help_text=_("Applicable only if the volume size is specified."),
             required=False,
-            widget=forms.Select(attrs={
-                'class': 'switched',
-                'data-switch-on': 'datastore',
-                attr_key: _("Volume Type")
-            }))
+            widget=widgets.LazySelect(
+                'horizon:project:databases:datastore_choices',
+                params={'datastore': datastore,
+                        'datastore_version': datastore_version,
+                        'kind': 'volume_type'},
+                attrs={
+                    'class': 'switched',
+                    'data-switch-on': 'datastore',
+                    attr_key: _("Volume Type")
+                }))
+        if not self._is_selected_datastore(datastore, datastore_version):
+            return
         valid_types = self.datastore_volume_types(request,
                                                   datastore,
                                                   datastore_version)
@@ -300,8 +333,8 @@ TROVE_ADD_PERMS = TROVE_ADD_USER_PERMS + TROVE_ADD_DATABASE_PERMS
 
 class SetInstanceDetails(workflows.Step):
     action_class = SetInstanceDetailsAction
-    contributes = ("name", "volume", "volume_type", "flavor", "datastore",
-                   "availability_zone")
+    contributes = ("name", "count", "volume", "volume_type", "flavor",
+                   "datastore", "availability_zone")
 
 
 class AddDatabasesAction(workflows.Action):
@@ -369,24 +402,32 @@ class AdvancedAction(workflows.Action):
             'class': 'switchable',
             'data-slug': 'initial_state'
         }))
-    backup = forms.ChoiceField(
+    backup = forms.CharField(
         label=_('Backup Name'),
         required=False,
-        help_text=_('Select a backup to restore'),
-        widget=forms.Select(attrs={
-            'class': 'switched',
-            'data-switch-on': 'initial_state',
-            'data-initial_state-backup': _('Backup Name')
-        }))
-    master = forms.ChoiceField(
+        help_text=_('Type part of the name of the backup to restore and '
+                    'select it'),
+        widget=widgets.TypeaheadInput(
+            'horizon:project:database_backups:search',
+            params={'status': 'COMPLETED'},
+            attrs={
+                'class': 'switched',
+                'data-switch-on': 'initial_state',
+                'data-initial_state-backup': _('Backup Name')
+            }))
+    master = forms.CharField(
         label=_('Master Instance Name'),
         required=False,
-        help_text=_('Select a master instance'),
-        widget=forms.Select(attrs={
-            'class': 'switched',
-            'data-switch-on': 'initial_state',
-            'data-initial_state-master': _('Master Instance Name')
-        }))
+        help_text=_('Type part of the name of the master instance and '
+                    'select it'),
+        widget=widgets.TypeaheadInput(
+            'horizon:project:databases:search_instances',
+            params={'status': 'ACTIVE', 'capability': 'replicate'},
+            attrs={
+                'class': 'switched',
+                'data-switch-on': 'initial_state',
+                'data-initial_state-master': _('Master Instance Name')
+            }))
     replica_count = forms.IntegerField(
         label=_('Replica Count'),
         required=False,
@@ -427,6 +468,12 @@ class AdvancedAction(workflows.Action):
         if self.backup_id:
             self.fields['initial_state'].choices = [('backup',
                                                     _('Restore from Backup'))]
+            # Show the name of the backup to restore, not its id
+            try:
+                backup = api.trove.backup_get(request, self.backup_id)
+                self.fields['backup'].widget.search_text = backup.name
+            except Exception:
+                LOG.exception("Exception while obtaining backup information")
 
     class Meta(object):
         name = _("Advanced")
@@ -450,56 +497,6 @@ class AdvancedAction(workflows.Action):
             choices.insert(0, ("", _("No configurations available")))
         return choices
 
-    def populate_backup_choices(self, request, context):
-        try:
-            choices = []
-            backups = api.trove.backup_list(request)
-            for b in backups:
-                if self.backup_id and b.id != self.backup_id:
-                    continue
-                if b.status == 'COMPLETED':
-                    choices.append((b.id, b.name))
-        except Exception:
-            choices = []
-
-        if choices:
-            choices.insert(0, ("", _("Select backup")))
-        else:
-            choices.insert(0, ("", _("No backups available")))
-        return choices
-
-    def _get_instances(self):
-        instances = []
-        try:
-            instances = api.trove.instance_list(self.request)
-            marker = instances.next
-            while marker or False:
-                temp_instances = api.trove.instance_list(self.request,
-                                                         marker=marker)
-                marker = temp_instances.next
-                instances.items += temp_instances.items
-                instances.links = temp_instances.links
-            instances.next = None
-        except Exception:
-            msg = _('Unable to retrieve database instances.')
-            exceptions.handle(self.request, msg)
-        return instances
-
-    def populate_master_choices(self, request, context):
-        try:
-            instances = self._get_instances()
-            choices = sorted([(i.id, i.name) for i in
-                             instances if i.status == 'ACTIVE'],
-                             key=lambda i: i[1])
-        except Exception:
-            choices = []
-
-        if choices:
-            choices.insert(0, ("", _("Select instance")))
-        else:
-            choices.insert(0, ("", _("No instances available")))
-        return choices
-
     @memoized.memoized_method
     def regions(self, request):
         try:
@@ -562,6 +559,9 @@ class AdvancedAction(workflows.Action):
                     except Exception:
                         raise forms.ValidationError(
                             _("Unable to find backup!"))
+                    if bkup.status != 'COMPLETED':
+                        raise forms.ValidationError(
+                            _("Only completed backups can be restored."))
                 else:
                     raise forms.ValidationError(
                         _("A backup must be selected!"))
@@ -623,8 +623,21 @@ class LaunchInstance(workflows.Workflow):
 
     def format_status_message(self, message):
         name = self.context.get('name', 'unknown instance')
+        count = len(self.context.get('launched') or
+                    self._get_names(self.context))
+        if count > 1:
+            return message % {"count": _("%s instances") % count,
+                              "name": name}
         return message % {"count": _("instance"), "name": name}
 
+    def _get_names(self, context):
+        """Returns the names of the instances to launch."""
+        name = context.get('name')
+        count = context.get('count') or 1
+        if count == 1:
+            return [name]
+        return ["%s-%d" % (name, i) for i in range(1, count + 1)]
+
     def _get_databases(self, context):
         """Returns the initial databases for this instance."""
         databases = []
@@ -695,38 +708,64 @@ class LaunchInstance(workflows.Workflow):
             datastore, datastore_version = parse_datastore_and_version_text(
                 binascii.unhexlify(self.context['datastore']))
             LOG.info("Launching database instance with parameters "
-                     "{name=%s, volume=%s, volume_type=%s, flavor=%s, "
-                     "datastore=%s, datastore_version=%s, "
+                     "{name=%s, count=%s, volume=%s, volume_type=%s, "
+                     "flavor=%s, datastore=%s, datastore_version=%s, "
                      "dbs=%s, users=%s, "
                      "backups=%s, nics=%s, replica_of=%s replica_count=%s, "
                      "configuration=%s, locality=%s, availability_zone=%s, "
                      "region=%s}",
-                     context['name'], context['volume'],
-                     self._get_volume_type(context), context['flavor'],
+                     context['name'], context.get('count') or 1,
+                     context['volume'], self._get_volume_type(context),
+                     context['flavor'],
                      datastore, datastore_version,
                      self._get_databases(context), self._get_users(context),
                      self._get_backup(context), self._get_nics(context),
                      context.get('master'), context['replica_count'],
                      self._get_config(context), self._get_locality(context),
                      avail_zone, self._get_region(context))
-            api.trove.instance_create(request,
-                                      context['name'],
-                                      context['volume'],
-                                      context['flavor'],
-                                      datastore=datastore,
-                                      datastore_version=datastore_version,
-                                      databases=self._get_databases(context),
-                                      users=self._get_users(context),
-                                      restore_point=self._get_backup(context),
-                                      nics=self._get_nics(context),
-                                      replica_of=context.get('master'),
-                                      replica_count=context['replica_count'],
-                                      volume_type=self._get_volume_type(
-                                          context),
-                                      configuration=self._get_config(context),
-                                      locality=self._get_locality(context),
-                                      availability_zone=avail_zone,
-                                      region_name=self._get_region(context))
+
+            def create(name):
+                return api.trove.instance_create(
+                    request,
+                    name,
+                    context['volume'],
+                    context['flavor'],
+                    datastore=datastore,
+                    datastore_version=datastore_version,
+                    databases=self._get_databases(context),
+                    users=self._get_users(context),
+                    restore_point=self._get_backup(context),
+                    nics=self._get_nics(context),
+                    replica_of=context.get('master'),
+                    replica_count=context['replica_count'],
+                    volume_type=self._get_volume_type(context),
+                    configuration=self._get_config(context),
+                    locality=self._get_locality(context),
+                    availability_zone=avail_zone,
+                    region_name=self._get_region(context))
+
+            names = self._get_names(context)
+            results = utils.call_parallel(create, names)
+
+            launched = []
+            errors = []
+            for name, (instance, error) in zip(names, results):
+                if error is None:
+                    launched.append(name)
+                    continue
+                errors.append(error)
+                LOG.error("Unable to launch database instance %s: %s",
+                          name, error)
+                if len(names) > 1:
+                    msg = _('Unable to launch instance "%(name)s": '
+                            '%(reason)s')
+                    messages.error(request, msg % {'name': name,
+                                                   'reason': error})
+            if not launched:
+                if len(names) == 1:
+                    raise errors[0]
+                return False
+            self.context['launched'] = launched
             return True
         except Exception:
             exceptions.handle(request)
@@ -0,0 +1,90 @@
+# Copyright 2016 Tesora Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Drafts of objects that a user edits over several requests.
+
+A draft belongs to one user and one object. It is kept in Django's cache
+as JSON together with a version number, so that any worker can pick it up,
+and it expires when it has not been saved for TROVE_DRAFT_TIMEOUT seconds.
+A save must name the version it was loaded at and fails with DraftConflict
+if another request saved the draft in the meantime.
+"""
+
+from django.conf import settings
+from django.core import cache
+
+from oslo_serialization import jsonutils
+
+DRAFT_TIMEOUT = getattr(settings, 'TROVE_DRAFT_TIMEOUT', 3600)
+
+# A version is claimed with cache.add, which is atomic on the memcached,
+# redis and database backends, before the draft is written. The claim only
+# has to outlive the window between the two.
+CLAIM_TIMEOUT = 60
+
+
+class DraftConflict(Exception):
+    """The draft was saved by another request since it was loaded."""
+
+
+def _draft_key(request, kind, object_id):
+    return 'trove-draft:%s:%s:%s' % (kind, request.user.id, object_id)
+
+
+def load(request, kind, object_id):
+    """Returns the draft data and its version.
+
+    The data is None if the user has no draft of the object.
+    """
+    entry = cache.cache.get(_draft_key(request, kind, object_id))
+    if entry is None:
+        return None, 0
+    version, payload = entry
+    if payload is None:
+        return None, version
+    return jsonutils.loads(payload), version
+
+
+def save(request, kind, object_id, data, version):
+    """Saves the draft data over the given version.
+
+    Returns the new version of the draft. Saving None as the data discards
+    the draft.
+    """
+    key = _draft_key(request, kind, object_id)
+    entry = cache.cache.get(key)
+    if (entry[0] if entry else 0) != version:
+        raise DraftConflict()
+
+    new_version = version + 1
+    if not cache.cache.add('%s:%d' % (key, new_version), True,
+                           CLAIM_TIMEOUT):
+        raise DraftConflict()
+
+    payload = None if data is None else jsonutils.dumps(data)
+    cache.cache.set(key, (new_version, payload), DRAFT_TIMEOUT)
+    return new_version
+
+
+def delete(request, kind, object_id):
+    """Discards the draft, whatever its version."""
+    while True:
+        data, version = load(request, kind, object_id)
+        if data is None:
+            return
+        try:
+            save(request, kind, object_id, None, version)
+            return
+        except DraftConflict:
+            continue
@@ -14,7 +14,9 @@
 
 
 import logging
+from multiprocessing import pool
 
+from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
@@ -23,6 +25,9 @@ from openstack_dashboard import api
 
 LOG = logging.getLogger(__name__)
 
+# Maximum number of matches returned by the typeahead search endpoints.
+SEARCH_LIMIT = getattr(settings, 'TROVE_SEARCH_LIMIT', 20)
+
 
 def volume_type_list(request):
     """Utility method to retrieve a list of volume types."""
@@ -68,3 +73,32 @@ def volume_type_field_data(request, include_empty_option=False):
     if include_empty_option:
         return [("", _("No volume types available")), ]
     return []
+
+
+def call_parallel(func, items, max_workers=None):
+    """Calls func once for every item using a bounded pool of threads.
+
+    Returns a list with one (result, exception) tuple per item, in the
+    order of the items. The exception is None when the call succeeded.
+    The number of threads is capped by max_workers, or by the
+    TROVE_PARALLEL_WORKERS setting (default 8).
+    """
+    def call(item):
+        try:
+            return func(item), None
+        except Exception as e:
+            return None, e
+
+    items = list(items)
+    if max_workers is None:
+        max_workers = getattr(settings, 'TROVE_PARALLEL_WORKERS', 8)
+    workers = min(max_workers, len(items))
+    if workers <= 1:
+        return [call(item) for item in items]
+
+    thread_pool = pool.ThreadPool(workers)
+    try:
+        return thread_pool.map(call, items)
+    finally:
+        thread_pool.close()
+        thread_pool.join()
@@ -0,0 +1,90 @@
+# Copyright 2016 Tesora Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from django.core import urlresolvers
+from django.utils.html import format_html
+from django.utils.http import urlencode
+
+from horizon import forms
+
+
+class TypeaheadInput(forms.TextInput):
+    """Text input that looks its choices up on the server as the user types.
+
+    The search is sent to the JSON endpoint named by ``url``, together with
+    ``params`` and the text typed so far as ``q``. The endpoint answers with
+    ``{"results": [{"id": ..., "name": ..., "label": ...}]}``. The id of the
+    picked result is submitted in a hidden input named after the field, see
+    static/dashboard/project/databases/typeahead.js.
+    """
+    def __init__(self, url, params=None, attrs=None):
+        super(TypeaheadInput, self).__init__(attrs)
+        self.url = url
+        self.params = params or {}
+        self.search_text = None
+
+    def get_search_url(self):
+        url = urlresolvers.reverse(self.url)
+        if self.params:
+            url = '%s?%s' % (url, urlencode(self.params, doseq=True))
+        return url
+
+    def value_from_datadict(self, data, files, name):
+        # Keep the text of the visible input, so it is shown again if the
+        # form is redisplayed with errors.
+        self.search_text = data.get(name + '__search')
+        return super(TypeaheadInput, self).value_from_datadict(data, files,
+                                                               name)
+
+    def render(self, name, value, attrs=None):
+        attrs = dict(attrs or {})
+        field_id = attrs.get('id', 'id_%s' % name)
+        hidden = forms.HiddenInput().render(name, value,
+                                            {'id': field_id + '__value'})
+        attrs.update({
+            'autocomplete': 'off',
+            'data-typeahead-url': self.get_search_url(),
+            'data-typeahead-target': field_id + '__value',
+        })
+        search = super(TypeaheadInput, self).render(
+            name + '__search', self.search_text or value, attrs)
+        return format_html('<div class="dropdown">{0}{1}</div>',
+                           hidden, search)
+
+
+class LazySelect(forms.Select):
+    """Select whose choices are fetched from the server when it is shown.
+
+    The choices are requested once from the JSON endpoint named by ``url``,
+    together with ``params``, when the select is switched on by the value
+    of its switchable field. The endpoint answers with
+    ``{"choices": [[value, label], ...]}``. Any choices set on the widget,
+    usually those of a submitted value, are rendered up front, see
+    static/dashboard/project/databases/lazy_select.js.
+    """
+    def __init__(self, url, params=None, attrs=None):
+        super(LazySelect, self).__init__(attrs)
+        self.url = url
+        self.params = params or {}
+
+    def get_choices_url(self):
+        url = urlresolvers.reverse(self.url)
+        if self.params:
+            url = '%s?%s' % (url, urlencode(self.params, doseq=True))
+        return url
+
+    def render(self, name, value, attrs=None, choices=()):
+        attrs = dict(attrs or {})
+        attrs['data-choices-url'] = self.get_choices_url()
+        return super(LazySelect, self).render(name, value, attrs, choices)
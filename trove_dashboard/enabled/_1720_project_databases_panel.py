@@ -24,6 +24,9 @@ ADD_PANEL = ('trove_dashboard.content.databases.panel.Databases')
 
 ADD_INSTALLED_APPS = ["trove_dashboard", ]
 
+ADD_JS_FILES = ['dashboard/project/databases/lazy_select.js',
+                'dashboard/project/databases/typeahead.js']
+
 ADD_EXCEPTIONS = {
     'not_found': exceptions.NOT_FOUND,
     'recoverable': exceptions.RECOVERABLE,
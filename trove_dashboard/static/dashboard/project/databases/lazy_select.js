@@ -0,0 +1,79 @@
+/**
+ * Copyright 2016 Tesora Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may
+ * not use this file except in compliance with the License. You may obtain
+ * a copy of the License at
+ *
+ *      http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations
+ * under the License.
+ */
+
+/**
+ * Selects rendered by trove_dashboard.content.widgets.LazySelect.
+ *
+ * The choices of a select are fetched once from the endpoint in its
+ * data-choices-url attribute, the first time the switchable field it
+ * depends on is set to a value that shows it.
+ */
+(function($) {
+  'use strict';
+
+  function load($select) {
+    if ($select.data('choices-loaded')) {
+      return;
+    }
+    $select.data('choices-loaded', true);
+
+    $.getJSON($select.data('choices-url'))
+      .done(function(data) {
+        var current = $select.val();
+        $select.empty();
+        $.each(data.choices, function(index, choice) {
+          $('<option></option>').val(choice[0]).text(choice[1])
+            .appendTo($select);
+        });
+        if (current) {
+          $select.val(current);
+        }
+        $select.trigger('change');
+      })
+      .fail(function() {
+        // try again the next time the select is shown
+        $select.data('choices-loaded', false);
+      });
+  }
+
+  function update($switchable) {
+    var slug = $switchable.data('slug');
+    var attr = 'data-' + slug + '-' + $switchable.val();
+    $switchable.closest('form').find('select[data-choices-url]')
+      .each(function() {
+        var $select = $(this);
+        var switches = ($select.attr('data-switch-on') || '').split(' ');
+        if ($.inArray(slug, switches) !== -1 &&
+            $select.attr(attr) !== undefined) {
+          load($select);
+        }
+      });
+  }
+
+  function init(container) {
+    $(container).find('select.switchable').each(function() {
+      update($(this));
+    });
+  }
+
+  horizon.addInitFunction(function() {
+    $(document).on('change', 'select.switchable', function() {
+      update($(this));
+    });
+    init(document);
+    horizon.modals.addModalInitFunction(init);
+  });
+})(jQuery);
@@ -0,0 +1,87 @@
+/**
+ * Copyright 2016 Tesora Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may
+ * not use this file except in compliance with the License. You may obtain
+ * a copy of the License at
+ *
+ *      http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations
+ * under the License.
+ */
+
+/**
+ * Typeahead pickers rendered by trove_dashboard.content.widgets.TypeaheadInput.
+ *
+ * The visible input searches the endpoint in its data-typeahead-url
+ * attribute as the user types, and the id of the picked result is stored
+ * in the hidden input named by data-typeahead-target.
+ */
+(function($) {
+  'use strict';
+
+  var SEARCH_DELAY = 250;
+
+  function attach($input) {
+    if ($input.data('typeahead-attached')) {
+      return;
+    }
+    $input.data('typeahead-attached', true);
+
+    var $target = $('#' + $input.data('typeahead-target'));
+    var $menu = $('<ul class="dropdown-menu"></ul>').insertAfter($input);
+    var timer = null;
+    var pending = null;
+
+    function show(results) {
+      $menu.empty();
+      $.each(results, function(index, result) {
+        var $link = $('<a href="#"></a>').text(result.label);
+        // mousedown fires before the input loses focus and hides the menu
+        $link.on('mousedown', function(event) {
+          event.preventDefault();
+          $input.val(result.name);
+          $target.val(result.id).trigger('change');
+          $menu.hide();
+        });
+        $('<li></li>').append($link).appendTo($menu);
+      });
+      $menu.toggle(results.length > 0);
+    }
+
+    function search() {
+      if (pending) {
+        pending.abort();
+      }
+      pending = $.getJSON($input.data('typeahead-url'), {q: $input.val()})
+        .done(function(data) {
+          show(data.results);
+        });
+    }
+
+    $input.on('input', function() {
+      $target.val('');
+      clearTimeout(timer);
+      timer = setTimeout(search, SEARCH_DELAY);
+    });
+    $input.on('focus', search);
+    $input.on('blur', function() {
+      $menu.hide();
+    });
+  }
+
+  function init(container) {
+    $(container).find('input[data-typeahead-url]').each(function() {
+      attach($(this));
+    });
+  }
+
+  horizon.addInitFunction(function() {
+    init(document);
+    horizon.modals.addModalInitFunction(init);
+  });
+})(jQuery);
@@ -185,3 +185,6 @@ POLICY_FILES = {
 
 # The openstack_auth.user.Token object isn't JSON-serializable ATM
 SESSION_SERIALIZER = 'django.contrib.sessions.serializers.PickleSerializer'
+
+# mox stubs are not thread safe, so parallel Trove calls run inline in tests
+TROVE_PARALLEL_WORKERS = 1